@@ -0,0 +1,53 @@
+"""
+Attribution Overhead Benchmark
+Compares plain batched scoring with gradient x input and integrated gradients
+at several batch sizes
+
+Usage:
+    python benchmarks/bench_explain.py
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Time scoring alone: no audit log writes or drift updates unless asked for
+os.environ.setdefault("CHURN_AUDIT__ENABLED", "false")
+os.environ.setdefault("CHURN_DRIFT__ENABLED", "false")
+
+from benchmarks.synthetic import generate_customers
+from src.model_service import ChurnModelService
+from src.explain import GRADIENT_X_INPUT, INTEGRATED_GRADIENTS, attribute
+
+BATCH_SIZES = [1, 100, 1000, 10000]
+IG_STEPS = 32
+REPEATS = 5
+
+
+def best_of(fn) -> float:
+    """Fastest of REPEATS runs in milliseconds"""
+    fn()
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    service = ChurnModelService()
+    print(f"{'rows':>7} {'score ms':>10} {'gxi ms':>10} {'gxi x':>7} {'ig ms':>10} {'ig x':>7}")
+    for n in BATCH_SIZES:
+        encoded = service.encode_batch(generate_customers(n))
+        score = best_of(lambda: service.predict_proba_encoded(service.scale_encoded(encoded)))
+        gxi = best_of(lambda: attribute(service, encoded, GRADIENT_X_INPUT))
+        ig = best_of(lambda: attribute(service, encoded, INTEGRATED_GRADIENTS, steps=IG_STEPS))
+        print(f"{n:>7} {score:>10.2f} {gxi:>10.2f} {gxi / score:>7.1f} {ig:>10.2f} {ig / score:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Batch Response Format Benchmark
+Serialization time and payload size of /batch-predict results in the
+row-oriented JSON format and the compact column-oriented formats
+
+Usage:
+    python benchmarks/bench_response_formats.py
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Time scoring alone: no audit log writes or drift updates unless asked for
+os.environ.setdefault("CHURN_AUDIT__ENABLED", "false")
+os.environ.setdefault("CHURN_DRIFT__ENABLED", "false")
+
+from benchmarks.synthetic import generate_customers
+from src.model_service import ChurnModelService
+from src.recommendations import pack_mask
+from src.response_formats import COLUMNAR_JSON, ARROW, available_formats, render
+
+BATCH_SIZES = [1000, 10000, 100000]
+REPEATS = 3
+
+
+def best_of(fn):
+    """Fastest of REPEATS runs in milliseconds, and the last result"""
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), result
+
+
+def main():
+    service = ChurnModelService()
+    formats = [f for f in available_formats() if f in (COLUMNAR_JSON, ARROW)]
+    print(f"{'rows':>7} {'format':<38} {'ms':>9} {'MB':>8}")
+    for n in BATCH_SIZES:
+        customers = generate_customers(n)
+        encoded = service.encode_batch(customers)
+
+        # Previous path: one dictionary per row, encoded by FastAPI
+        def rows():
+            results = service.predict_encoded(encoded, customers["name"].tolist())
+            return JSONResponse(jsonable_encoder({"total": n, "predictions": results})).body
+
+        # Compact path: columns straight from the batched scores
+        def compact(media_type):
+            scores = service.score_encoded(encoded)
+            columns = {
+                "customer_name": customers["name"].to_numpy(dtype=object),
+                "churn_prediction": scores["churn_prediction"],
+                "churn_probability": np.round(scores["probability"].astype(np.float64) * 100, 2),
+                "risk_level": scores["risk_level"],
+                "recommendations": pack_mask(scores["recommendation_mask"])
+            }
+            return render(media_type, n, columns, {}).body
+
+        # Scoring alone, the part both paths share
+        score_ms, _ = best_of(lambda: service.score_encoded(encoded))
+        print(f"{n:>7} {'(scoring only)':<38} {score_ms:>9.1f} {'':>8}")
+        for name, fn in [("application/json (rows)", rows)] + [
+            (media_type, lambda m=media_type: compact(m)) for media_type in formats
+        ]:
+            ms, body = best_of(fn)
+            print(f"{n:>7} {name:<38} {ms:>9.1f} {len(body) / 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Segment Routing Benchmark
+Compares scoring with the global network alone against per-segment networks
+(grouped by provider, then by province) at several batch sizes
+
+Usage:
+    python benchmarks/bench_segments.py
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Time scoring alone: no audit log writes or drift updates unless asked for
+os.environ.setdefault("CHURN_AUDIT__ENABLED", "false")
+os.environ.setdefault("CHURN_DRIFT__ENABLED", "false")
+
+from benchmarks.synthetic import generate_customers
+from src.config import load_config
+from src.model_service import ChurnModelService
+from src.segments import CATEGORICAL_PREFIXES, SegmentModels, _hidden_units, _section
+
+BATCH_SIZES = [1, 100, 1000, 10000, 100000]
+REPEATS = 5
+
+
+def best_of(fn) -> float:
+    """Fastest of REPEATS runs in milliseconds"""
+    fn()
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def random_segment_models(service, segment_by: str) -> SegmentModels:
+    """Untrained networks of the [segments] hidden_units for every segment value"""
+    rng = np.random.default_rng(0)
+    prefix = CATEGORICAL_PREFIXES[segment_by]
+    segments = [col[len(prefix):] for col in service.train_columns if col.startswith(prefix)]
+    sizes = [len(service.train_columns)] + _hidden_units(_section(load_config())) + [1]
+    kernels = [rng.normal(0, 0.3, (len(segments), n_in, n_out)) for n_in, n_out in zip(sizes, sizes[1:])]
+    biases = [np.zeros((len(segments), n_out)) for n_out in sizes[1:]]
+    return SegmentModels(segment_by, segments, list(service.train_columns), kernels, biases)
+
+
+def main():
+    service = ChurnModelService()
+    by_segment = {name: random_segment_models(service, name) for name in ("provider", "province")}
+    print(f"{'rows':>7} {'global ms':>10} {'provider ms':>12} {'rows/s':>12} {'province ms':>12} {'rows/s':>12}")
+    for n in BATCH_SIZES:
+        scaled = service.scale_encoded(service.encode_batch(generate_customers(n)))
+        service.segments = None
+        timings = [best_of(lambda: service.predict_proba_encoded(scaled))]
+        for models in by_segment.values():
+            service.segments = models
+            timings.append(best_of(lambda: service.predict_proba_encoded(scaled)))
+        service.segments = None
+        global_ms, provider_ms, province_ms = timings
+        print(f"{n:>7} {global_ms:>10.2f} {provider_ms:>12.2f} {n / provider_ms * 1000:>12,.0f} "
+              f"{province_ms:>12.2f} {n / province_ms * 1000:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Streamlit UI Interaction Benchmark
+Times the rerun each typical UI interaction triggers, using Streamlit's
+AppTest harness against a prediction history of synthetic customers. Widgets
+inside an st.fragment rerun only their fragment, as they do in the browser;
+everything else reruns the whole script.
+
+Usage:
+    python benchmarks/bench_ui.py
+    python benchmarks/bench_ui.py --script path/to/ui.py   # time another version of the UI
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import functools
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# AppTest has no public API for fragment reruns. Scoping a rerun to a fragment patches
+# AppTest._fragment_storage and local_script_runner.RerunData, which are private, so the
+# patch is pinned to the Streamlit release it was written against (the version these
+# numbers were taken with). On any other version fragment interactions are timed as
+# full reruns and the report says so; install streamlit==1.66.* for scoped numbers.
+FRAGMENT_RERUN_STREAMLIT = "1.66"
+
+HISTORY_ROWS = 20000
+# History session the scratch rows are written under and the AppTest session reads
+SESSION_ID = "bench_ui"
+REPEATS = 10
+TIMEOUT_S = 120
+
+# Set when a fragment interaction had to be timed as a full rerun
+fragment_fallback = False
+
+
+def _widget(at, kind: str, label: str):
+    """First widget of a kind whose label starts with label"""
+    for widget in getattr(at, kind):
+        if widget.label.startswith(label):
+            return widget
+    raise LookupError(f"No {kind} labelled {label!r}")
+
+
+def _pinned_version(version: str) -> bool:
+    """Whether version is the Streamlit release the fragment patch was written against"""
+    return version.split(".")[:2] == FRAGMENT_RERUN_STREAMLIT.split(".")
+
+
+def _fragment_rerun(at):
+    """Patch making at.run() rerun only the page's fragment, or None when unavailable"""
+    global fragment_fallback
+    import streamlit
+    if not _pinned_version(streamlit.__version__):
+        fragment_fallback = True
+        return None
+    try:
+        from streamlit.testing.v1 import local_script_runner
+        from streamlit.runtime.scriptrunner_utils.script_requests import RerunData
+        fragments = list(at._fragment_storage._fragments)
+        local_script_runner.RerunData
+    except (ImportError, AttributeError):
+        fragment_fallback = True
+        return None
+    if len(fragments) != 1:
+        return None
+    # What the browser sends for a widget inside a fragment: rerun that fragment only
+    scoped = functools.partial(RerunData, fragment_id_queue=fragments)
+    return mock.patch.object(local_script_runner, "RerunData", scoped)
+
+
+def _run(at, fragment_scoped: bool) -> float:
+    """Rerun after a widget change; milliseconds"""
+    patch = _fragment_rerun(at) if fragment_scoped else None
+    start = time.perf_counter()
+    if patch is not None:
+        with patch:
+            at.run(timeout=TIMEOUT_S)
+    else:
+        at.run(timeout=TIMEOUT_S)
+    elapsed = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return elapsed
+
+
+def _go_to(at, page: str) -> None:
+    if not at.sidebar.radio:
+        # A fragment-scoped run only returns the fragment's elements; redraw the page
+        at.run(timeout=TIMEOUT_S)
+    at.sidebar.radio[0].set_value(page)
+    at.run(timeout=TIMEOUT_S)
+
+
+def _alternate(at, kind: str, label: str, values, fragment_scoped: bool, page: str) -> np.ndarray:
+    timings = []
+    for i in range(REPEATS):
+        _widget(at, kind, label).set_value(values[i % len(values)])
+        timings.append(_run(at, fragment_scoped))
+    _go_to(at, page)
+    return np.array(timings)
+
+
+def populate_history(path: Path, rows: int) -> None:
+    from benchmarks.synthetic import generate_customers
+    from src.model_service import ChurnModelService
+    from src.history_store import HistoryDatabase, PredictionHistory
+
+    customers = generate_customers(rows)
+    results = ChurnModelService().predict_batch(customers)
+    history = PredictionHistory(HistoryDatabase(path), SESSION_ID)
+    history.append(results, customers["province"].tolist(), customers["provider"].tolist())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time UI interactions with Streamlit's AppTest")
+    parser.add_argument("--script", default=str(PROJECT_ROOT / "src" / "ui.py"),
+                        help="Streamlit script to time (default: src/ui.py)")
+    parser.add_argument("--history-rows", type=int, default=HISTORY_ROWS)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_ui_"))
+    history_path = workdir / "history.db"
+    # Point the UI at a scratch history before its config is loaded
+    os.environ["CHURN_UI__HISTORY_PATH"] = str(history_path)
+    os.environ["CHURN_UI__INFERENCE_MODE"] = "local"
+    os.environ["CHURN_AUDIT__ENABLED"] = "false"
+    os.environ["CHURN_DRIFT__ENABLED"] = "false"
+    populate_history(history_path, args.history_rows)
+
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(args.script, default_timeout=TIMEOUT_S)
+    at.session_state["history_session_id"] = SESSION_ID
+    start = time.perf_counter()
+    at.run()
+    first_render = (time.perf_counter() - start) * 1000
+
+    results = [("first render", np.array([first_render]))]
+
+    page = "Single Prediction"
+    results.append(("single: edit an input", _alternate(at, "number_input", "Age", [36, 35], False, page)))
+    _widget(at, "toggle", "🧪 What-If").set_value(True)
+    _run(at, True)
+    _go_to(at, page)
+    results.append(("single: what-if axis", _alternate(
+        at, "selectbox", "X axis", ["calls_made", "tenure_months"], True, page)))
+
+    timings = []
+    for i in range(REPEATS):
+        target = ["Analytics Dashboard", "Prediction History", "Batch Prediction", "Single Prediction"][i % 4]
+        at.sidebar.radio[0].set_value(target)
+        timings.append(_run(at, False))
+    results.append(("switch page", np.array(timings)))
+
+    page = "Analytics Dashboard"
+    _go_to(at, page)
+    results.append(("analytics: segment", _alternate(
+        at, "selectbox", "Segment", ["Province: Bagmati", "All Customers"], True, page)))
+
+    page = "Prediction History"
+    _go_to(at, page)
+    results.append(("history: page", _alternate(at, "number_input", "Page", [2, 1], True, page)))
+    results.append(("history: filter", _alternate(
+        at, "multiselect", "Filter by Risk Level", [["HIGH"], ["LOW", "MEDIUM", "HIGH"]], True, page)))
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    import streamlit
+    print(f"{args.script} ({args.history_rows:,} history rows, Streamlit {streamlit.__version__})")
+    if fragment_fallback:
+        print(f"⚠️ Fragment reruns are pinned to the AppTest internals of Streamlit {FRAGMENT_RERUN_STREAMLIT}.x; "
+              f"fragment interactions were timed as full reruns")
+    print(f"{'interaction':<24} {'median ms':>10} {'p90 ms':>10}")
+    for name, timings in results:
+        print(f"{name:<24} {np.median(timings):>10.1f} {np.percentile(timings, 90):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Batch Validation Benchmark
+Compares per-object CustomerData validation with the columnar validate_batch
+path used by /batch-predict
+
+Usage:
+    python benchmarks/bench_validation.py
+"""
+
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic import generate_records
+from src.predmodel import CustomerData
+from src.batch_validation import validate_batch
+
+BATCH_SIZES = [100, 1000, 10000, 100000]
+INVALID_FRACTION = 0.01
+REPEATS = 3
+
+
+def synthetic_records(n: int, seed: int = 0) -> list:
+    """Synthetic customer records with a small share of invalid ages"""
+    records = generate_records(n, seed)
+    invalid = np.random.default_rng(seed).random(n) < INVALID_FRACTION
+    for i in np.flatnonzero(invalid).tolist():
+        records[i]["age"] = 5
+    return records
+
+
+def per_object(records: list) -> int:
+    """The previous path: one CustomerData per row, then a DataFrame of the valid rows"""
+    customers = []
+    errors = 0
+    for record in records:
+        try:
+            customers.append(CustomerData(**record))
+        except ValueError:
+            errors += 1
+    pd.DataFrame([customer.dict() for customer in customers])
+    return errors
+
+
+def best_of(fn, records) -> float:
+    """Fastest of REPEATS runs in milliseconds"""
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(records)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    # CustomerData.dict() is what the API used; silence the Pydantic v2 notice
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    print(f"{'rows':>7} {'per-object ms':>14} {'columnar ms':>12} {'speedup':>8}")
+    for n in BATCH_SIZES:
+        records = synthetic_records(n)
+        assert per_object(records) == len(validate_batch(records)[1])
+        objects = best_of(per_object, records)
+        columnar = best_of(validate_batch, records)
+        print(f"{n:>7} {objects:>14.1f} {columnar:>12.1f} {objects / columnar:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+"""
+HTTP Load Testing Harness
+Starts the API locally and drives /predict, /batch-predict and /ws/predict
+with open-loop (Poisson) arrivals at a target rate, then reports latency
+percentiles, error rate and throughput for each server configuration
+
+Usage:
+    python main.py --load-test
+    python benchmarks/loadtest.py --rate 100 --duration 30 \\
+        --config batching=off --config batching=on --config batching=on,workers=2
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import logging
+import argparse
+import tempfile
+import subprocess
+import configparser
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import httpx
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.loadtest_options import ENDPOINTS, add_arguments, options_from_args
+from benchmarks.synthetic import generate_records
+from src.config import CONFIG_PATH
+
+try:
+    from websockets.asyncio.client import connect as ws_connect
+except ImportError:
+    ws_connect = None
+
+RESULTS_DIR = PROJECT_ROOT / "data" / "loadtest"
+DEFAULT_CONFIGS = ["batching=off", "batching=on"]
+
+SERVER_START_TIMEOUT = 180
+REQUEST_TIMEOUT = 30
+
+# Config sections and options behind the batching=on/off shorthand
+BATCHING = {
+    "on": {"scheduler": {"batch_predict_requests": "true"}},
+    "off": {
+        "scheduler": {"batch_predict_requests": "false"},
+        "performance": {"max_batch_size": "1", "max_wait_ms": "0"}
+    }
+}
+
+
+def parse_config_spec(spec: str) -> Dict:
+    """
+    Parse a server configuration such as "batching=on,workers=2,loop=uvloop"
+
+    Keys: workers, loop and http (uvicorn options), batching (on/off) and
+    section.key for any config.ini setting
+
+    Returns:
+        Dictionary with name, workers, loop, http and config overrides
+    """
+    config = {"name": spec or "default", "workers": 1, "loop": "auto", "http": "auto", "overrides": {}}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        key, sep, value = item.partition("=")
+        key, value = key.strip(), value.strip()
+        if not sep:
+            raise ValueError(f"Expected key=value in '{spec}', got '{item}'")
+        if key == "workers":
+            config["workers"] = int(value)
+        elif key in ("loop", "http"):
+            config[key] = value
+        elif key == "batching":
+            if value not in BATCHING:
+                raise ValueError(f"batching must be on or off, got '{value}'")
+            for section, options in BATCHING[value].items():
+                config["overrides"].setdefault(section, {}).update(options)
+        elif "." in key:
+            section, option = key.split(".", 1)
+            config["overrides"].setdefault(section, {})[option] = value
+        else:
+            raise ValueError(f"Unknown configuration key '{key}'")
+    return config
+
+
+class LocalServer:
+    """The API running under uvicorn in a subprocess, with config.ini overrides"""
+
+    def __init__(self, workers: int = 1, loop: str = "auto", http: str = "auto",
+                 overrides: Optional[Dict[str, Dict[str, str]]] = None):
+        self.workers = workers
+        self.loop = loop
+        self.http = http
+        self.overrides = overrides or {}
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._process = None
+        self._workdir = None
+
+    def __enter__(self) -> "LocalServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Launch uvicorn and wait until /health answers"""
+        self._workdir = tempfile.TemporaryDirectory(prefix="churn-loadtest-")
+        config_path = Path(self._workdir.name) / "config.ini"
+        config = configparser.ConfigParser(interpolation=None)
+        config.read(CONFIG_PATH, encoding="utf-8")
+        for section, values in self.overrides.items():
+            if not config.has_section(section):
+                config.add_section(section)
+            for key, value in values.items():
+                config[section][key] = str(value)
+        with open(config_path, "w", encoding="utf-8") as f:
+            config.write(f)
+
+        self._log = open(Path(self._workdir.name) / "server.log", "w+")
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.model:app",
+             "--host", "127.0.0.1", "--port", str(self.port),
+             "--workers", str(self.workers), "--loop", self.loop, "--http", self.http,
+             "--log-level", "warning"],
+            cwd=PROJECT_ROOT, env={**os.environ, "CHURN_CONFIG": str(config_path)},
+            stdout=self._log, stderr=subprocess.STDOUT
+        )
+
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"API server exited during startup:\n{self._log_tail()}")
+            try:
+                if httpx.get(f"{self.url}/health", timeout=2).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.5)
+        self.stop()
+        raise RuntimeError(f"API server not ready after {SERVER_START_TIMEOUT}s")
+
+    def stop(self) -> None:
+        """Terminate the server and remove its temporary config"""
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+        self._process = None
+        if self._workdir is not None:
+            self._log.close()
+            self._workdir.cleanup()
+            self._workdir = None
+
+    def _log_tail(self, lines: int = 20) -> str:
+        self._log.flush()
+        self._log.seek(0)
+        return "".join(self._log.readlines()[-lines:])
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def arrival_offsets(rate: float, duration: float, seed: int = 0) -> np.ndarray:
+    """Poisson arrival times (seconds from the start) at the given mean rate"""
+    rng = np.random.default_rng(seed)
+    gaps = rng.exponential(1 / rate, size=int(rate * duration * 1.5) + 16)
+    offsets = np.cumsum(gaps)
+    return offsets[offsets < duration]
+
+
+async def open_loop(send: Callable, offsets: np.ndarray, timeout: float = REQUEST_TIMEOUT) -> Dict:
+    """
+    Fire send(i) at each arrival time, without waiting for earlier responses
+
+    Latency is measured from the scheduled arrival time, so time a request
+    spends queued behind a slow server or a busy client still counts.
+
+    Returns:
+        latencies (seconds), errors (None or an error label) per request,
+        and the elapsed wall time until the last response
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time() + 0.05
+
+    async def timed(i: int, scheduled: float):
+        try:
+            ok = await asyncio.wait_for(send(i), timeout)
+            error = None if ok is True else str(ok or "failed")
+        except asyncio.TimeoutError:
+            error = "timeout"
+        except Exception as e:
+            error = type(e).__name__
+        return loop.time() - scheduled, error
+
+    tasks = []
+    for i, offset in enumerate(offsets.tolist()):
+        delay = start + offset - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(timed(i, start + offset)))
+    results = await asyncio.gather(*tasks)
+    return {
+        "latencies": np.array([latency for latency, _ in results]),
+        "errors": [error for _, error in results],
+        "elapsed": loop.time() - start
+    }
+
+
+def summarize(endpoint: str, target_rate: float, run: Dict, rows_per_request: int = 1) -> Dict:
+    """Latency percentiles (successful requests), error rate and throughput of one run"""
+    errors = run["errors"]
+    ok = np.array([error is None for error in errors], dtype=bool)
+    latencies_ms = run["latencies"][ok] * 1000
+    sent = len(errors)
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99]) if ok.any() else (np.nan,) * 3
+    throughput = ok.sum() / run["elapsed"] if run["elapsed"] > 0 else 0.0
+    return {
+        "endpoint": endpoint,
+        "target_rate": target_rate,
+        "sent": sent,
+        "ok": int(ok.sum()),
+        "error_rate": round(1 - ok.mean(), 4) if sent else 0.0,
+        "error_types": dict(Counter(error for error in errors if error is not None)),
+        "throughput": round(throughput, 2),
+        "rows_per_s": round(throughput * rows_per_request, 1),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(latencies_ms.max()), 2) if ok.any() else float("nan")
+    }
+
+
+async def _http_run(client: httpx.AsyncClient, path: str, payloads: list, offsets: np.ndarray) -> Dict:
+    async def send(i: int):
+        response = await client.post(path, json=payloads[i % len(payloads)])
+        return True if response.status_code == 200 else f"HTTP {response.status_code}"
+
+    return await open_loop(send, offsets)
+
+
+async def _ws_run(url: str, records: list, offsets: np.ndarray, connections: int) -> Dict:
+    """Spread the arrivals round-robin over several /ws/predict sessions"""
+    pending: Dict[int, asyncio.Future] = {}
+    sessions = [await ws_connect(url, max_queue=None) for _ in range(connections)]
+
+    async def read(session):
+        try:
+            async for text in session:
+                reply = json.loads(text)
+                future = pending.pop(reply.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        finally:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("WebSocket closed"))
+
+    readers = [asyncio.create_task(read(session)) for session in sessions]
+
+    async def send(i: int):
+        future = asyncio.get_running_loop().create_future()
+        pending[i] = future
+        await sessions[i % connections].send(json.dumps({"id": i, "customer": records[i % len(records)]}))
+        reply = await future
+        return True if "prediction" in reply else reply.get("error", "error")
+
+    try:
+        return await open_loop(send, offsets)
+    finally:
+        for session in sessions:
+            await session.close()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+
+async def run_scenarios(base_url: str, endpoints: List[str], rate: float, batch_rate: float,
+                        batch_size: int, duration: float, ws_connections: int = 4,
+                        seed: int = 0) -> List[Dict]:
+    """
+    Warm up, then load each endpoint in turn at its target rate
+
+    Args:
+        base_url: API root, e.g. http://127.0.0.1:8000
+        endpoints: Any of "predict", "batch-predict" and "ws"
+        rate: Requests per second for /predict and /ws/predict
+        batch_rate: Requests per second for /batch-predict
+        batch_size: Customers per /batch-predict request
+        duration: Seconds of load per endpoint
+        ws_connections: WebSocket sessions sharing the /ws/predict load
+
+    Returns:
+        One summarize() dictionary per endpoint
+    """
+    records = generate_records(1000, seed=seed)
+    batches = [generate_records(batch_size, seed=seed + i + 1) for i in range(4)]
+    results = []
+    limits = httpx.Limits(max_connections=256, max_keepalive_connections=256)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=REQUEST_TIMEOUT) as client:
+        for _ in range(5):
+            await client.post("/predict", json=records[0])
+        await client.post("/batch-predict", json=batches[0])
+
+        for endpoint in endpoints:
+            if endpoint == "predict":
+                run = await _http_run(client, "/predict", records, arrival_offsets(rate, duration, seed))
+                results.append(summarize("/predict", rate, run))
+            elif endpoint == "batch-predict":
+                run = await _http_run(client, "/batch-predict", batches,
+                                      arrival_offsets(batch_rate, duration, seed))
+                results.append(summarize("/batch-predict", batch_rate, run, batch_size))
+            elif endpoint == "ws":
+                if ws_connect is None:
+                    print("⚠️ 'websockets' is not installed, skipping /ws/predict")
+                    continue
+                ws_url = base_url.replace("http", "ws", 1) + "/ws/predict"
+                run = await _ws_run(ws_url, records, arrival_offsets(rate, duration, seed), ws_connections)
+                results.append(summarize("/ws/predict", rate, run))
+            else:
+                raise ValueError(f"Unknown endpoint '{endpoint}', expected one of {ENDPOINTS}")
+    return results
+
+
+def run_load_test(config_specs: Optional[List[str]] = None, endpoints: Optional[List[str]] = None,
+                  rate: float = 50, batch_rate: float = 2, batch_size: int = 100,
+                  duration: float = 20, ws_connections: int = 4,
+                  output: Optional[Path] = None) -> Dict:
+    """
+    Load-test every server configuration and write a comparison report
+
+    Args:
+        config_specs: Configurations for parse_config_spec (default: batching off and on)
+        endpoints: Endpoints to load (default: all)
+        output: Report JSON path (default: data/loadtest/loadtest_<timestamp>.json)
+
+    Returns:
+        The report: settings and one result row per configuration and endpoint
+    """
+    configs = [parse_config_spec(spec) for spec in (config_specs or DEFAULT_CONFIGS)]
+    endpoints = endpoints or ENDPOINTS
+    # One INFO line per request would swamp the report
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    rows = []
+    for config in configs:
+        print(f"🚀 {config['name']}: starting API ({config['workers']} worker(s))")
+        with LocalServer(config["workers"], config["loop"], config["http"], config["overrides"]) as server:
+            results = asyncio.run(run_scenarios(
+                server.url, endpoints, rate, batch_rate, batch_size, duration, ws_connections
+            ))
+        for result in results:
+            rows.append({"config": config["name"], **result})
+            print(
+                f"   {result['endpoint']:<15} {result['throughput']:>8.1f} req/s  "
+                f"p99 {result['p99_ms']:>8.1f} ms  errors {result['error_rate']:.1%}"
+            )
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "settings": {
+            "rate": rate, "batch_rate": batch_rate, "batch_size": batch_size,
+            "duration": duration, "ws_connections": ws_connections
+        },
+        "configs": configs,
+        "results": rows
+    }
+    output = output or RESULTS_DIR / f"loadtest_{report['timestamp'].replace(':', '')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print_report(report)
+    print(f"\n💾 Report written to {output}")
+    return report
+
+
+def print_report(report: Dict) -> None:
+    """Comparison table, grouped by endpoint, relative to the first configuration"""
+    rows = report["results"]
+    print(f"\n{'endpoint':<15} {'config':<36} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'errors':>7} {'vs first':>9}")
+    for endpoint in dict.fromkeys(row["endpoint"] for row in rows):
+        group = [row for row in rows if row["endpoint"] == endpoint]
+        first = group[0]["throughput"]
+        for row in group:
+            ratio = f"{row['throughput'] / first:.2f}x" if first else "-"
+            print(
+                f"{endpoint:<15} {row['config'][:36]:<36} {row['throughput']:>8.1f} "
+                f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} "
+                f"{row['error_rate']:>7.1%} {ratio:>9}"
+            )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Open-loop load test of the churn API")
+    add_arguments(parser)
+    run_load_test(**options_from_args(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Load-Test Command Line Options
+Kept apart from the harness so main.py can register them without importing
+httpx, NumPy or the benchmark code
+"""
+
+import argparse
+from pathlib import Path
+from typing import Dict
+
+ENDPOINTS = ["predict", "batch-predict", "ws"]
+
+
+def add_arguments(parser: argparse.ArgumentParser, prefix: str = "") -> None:
+    """Load-test options; main.py adds them with the prefix "load-" """
+    dest = prefix.replace("-", "_")
+    parser.add_argument(f"--{prefix}config", dest=f"{dest}config", action="append", metavar="SPEC",
+                        help="Server configuration, e.g. batching=on,workers=2 (repeatable; "
+                             "default: batching=off and batching=on)")
+    parser.add_argument(f"--{prefix}endpoint", dest=f"{dest}endpoint", action="append",
+                        choices=ENDPOINTS, help="Endpoint to load (repeatable; default: all)")
+    parser.add_argument(f"--{prefix}rate", dest=f"{dest}rate", type=float, default=50,
+                        help="Requests/s for /predict and /ws/predict (default: 50)")
+    parser.add_argument(f"--{prefix}batch-rate", dest=f"{dest}batch_rate", type=float, default=2,
+                        help="Requests/s for /batch-predict (default: 2)")
+    parser.add_argument(f"--{prefix}batch-size", dest=f"{dest}batch_size", type=int, default=100,
+                        help="Customers per /batch-predict request (default: 100)")
+    parser.add_argument(f"--{prefix}duration", dest=f"{dest}duration", type=float, default=20,
+                        help="Seconds of load per endpoint (default: 20)")
+    parser.add_argument(f"--{prefix}ws-connections", dest=f"{dest}ws_connections", type=int, default=4,
+                        help="WebSocket sessions for /ws/predict (default: 4)")
+    parser.add_argument(f"--{prefix}output", dest=f"{dest}output", type=Path,
+                        help="Report JSON path (default: data/loadtest/)")
+
+
+def options_from_args(args: argparse.Namespace, prefix: str = "") -> Dict:
+    """run_load_test() keyword arguments from options added by add_arguments()"""
+    dest = prefix.replace("-", "_")
+    names = ["config", "endpoint", "rate", "batch_rate", "batch_size", "duration", "ws_connections", "output"]
+    options = {name: getattr(args, f"{dest}{name}") for name in names}
+    options["config_specs"] = options.pop("config")
+    options["endpoints"] = options.pop("endpoint")
+    return options
@@ -0,0 +1,270 @@
+"""
+Benchmark Suite for ChurnModelService
+Measures single-prediction latency, batch throughput, preprocessing and
+recommendation cost, cold start and peak RSS; writes JSON results and flags
+regressions against a stored baseline
+
+Usage:
+    python benchmarks/run_benchmarks.py                  # run and compare with the baseline
+    python benchmarks/run_benchmarks.py --save-baseline  # run and store as the new baseline
+    python benchmarks/run_benchmarks.py --quick          # smaller sizes, fewer repeats
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# Time scoring alone: no audit log writes or drift updates unless asked for
+os.environ.setdefault("CHURN_AUDIT__ENABLED", "false")
+os.environ.setdefault("CHURN_DRIFT__ENABLED", "false")
+
+from benchmarks.synthetic import generate_customers, generate_records
+
+RESULTS_DIR = PROJECT_ROOT / "data" / "benchmarks"
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# Relative change tolerated before a metric counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+BATCH_SIZES = [1, 32, 256, 1024, 8192, 65536]
+QUICK_BATCH_SIZES = [1, 256, 8192]
+
+# Run in a fresh interpreter: cold start and peak RSS of a scoring process
+_COLD_START_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from src.model_service import ChurnModelService
+imported = time.perf_counter()
+service = ChurnModelService()
+loaded = time.perf_counter()
+rss_loaded = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+from benchmarks.synthetic import generate_customers
+service.predict_batch(generate_customers({rows}))
+print(json.dumps({{
+    "import_s": imported - start,
+    "load_s": loaded - imported,
+    "rss_loaded_kb": rss_loaded,
+    "rss_peak_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+}}))
+"""
+
+
+def _metric(value: float, unit: str, better: str) -> Dict:
+    return {"value": round(float(value), 4), "unit": unit, "better": better}
+
+
+def _timings_ms(fn: Callable, repeats: int) -> np.ndarray:
+    """Wall time of each call in milliseconds, after one warm-up call"""
+    fn()
+    timings = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings[i] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def bench_single_latency(service, repeats: int) -> Dict:
+    """ChurnModelService.predict on one customer at a time"""
+    records = generate_records(repeats, seed=1)
+    timings = []
+    service.predict(records[0])
+    for record in records:
+        start = time.perf_counter()
+        service.predict(record)
+        timings.append((time.perf_counter() - start) * 1000)
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    return {
+        "single_latency_p50": _metric(p50, "ms", "lower"),
+        "single_latency_p95": _metric(p95, "ms", "lower"),
+        "single_latency_p99": _metric(p99, "ms", "lower")
+    }
+
+
+def bench_batch_throughput(service, sizes: List[int], repeats: int) -> Dict:
+    """predict_batch rows per second at each batch size"""
+    metrics = {}
+    for size in sizes:
+        customers = generate_customers(size, seed=2)
+        best = _timings_ms(lambda: service.predict_batch(customers), repeats).min()
+        metrics[f"batch_throughput_{size}"] = _metric(size / (best / 1000), "rows/s", "higher")
+    return metrics
+
+
+def bench_preprocessing(service, rows: int, repeats: int) -> Dict:
+    """Encoding and scaling cost per row"""
+    customers = generate_customers(rows, seed=3)
+    best = _timings_ms(lambda: service.scale_encoded(service.encode_batch(customers)), repeats).min()
+    return {"preprocess_per_row": _metric(best * 1000 / rows, "us", "lower")}
+
+
+def bench_recommendations(service, rows: int, repeats: int) -> Dict:
+    """Rule evaluation and text attachment cost per row"""
+    encoded = service.encode_batch(generate_customers(rows, seed=4))
+    probs = service.predict_proba_encoded(service.scale_encoded(encoded))
+    _, risk = service.classify(probs)
+    evaluate = _timings_ms(lambda: service.recommendation_mask(encoded, probs, risk), repeats).min()
+    mask = service.recommendation_mask(encoded, probs, risk)
+    texts = _timings_ms(lambda: service.recommender.texts(mask), repeats).min()
+    return {
+        "recommend_rules_per_row": _metric(evaluate * 1000 / rows, "us", "lower"),
+        "recommend_text_per_row": _metric(texts * 1000 / rows, "us", "lower")
+    }
+
+
+def bench_cold_start(rows: int) -> Dict:
+    """Import and model load time, and peak RSS, of a fresh process"""
+    output = subprocess.run(
+        [sys.executable, "-c", _COLD_START_SCRIPT.format(root=str(PROJECT_ROOT), rows=rows)],
+        capture_output=True, text=True, check=True, cwd=PROJECT_ROOT
+    ).stdout.strip().splitlines()[-1]
+    result = json.loads(output)
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if platform.system() == "Darwin" else 1024
+    return {
+        "cold_start_import": _metric(result["import_s"], "s", "lower"),
+        "cold_start_load": _metric(result["load_s"], "s", "lower"),
+        "rss_after_load": _metric(result["rss_loaded_kb"] / scale, "MB", "lower"),
+        f"rss_peak_batch_{rows}": _metric(result["rss_peak_kb"] / scale, "MB", "lower")
+    }
+
+
+def run_suite(quick: bool = False) -> Dict:
+    """Run every benchmark and return the results document"""
+    from src.model_service import ChurnModelService
+
+    repeats = 3 if quick else 7
+    rows = 10000 if quick else 100000
+    service = ChurnModelService()
+
+    metrics = {}
+    print("⏱️  Single-prediction latency...")
+    metrics.update(bench_single_latency(service, 50 if quick else 300))
+    print("⏱️  Batch throughput...")
+    metrics.update(bench_batch_throughput(service, QUICK_BATCH_SIZES if quick else BATCH_SIZES, repeats))
+    print("⏱️  Preprocessing...")
+    metrics.update(bench_preprocessing(service, rows, repeats))
+    print("⏱️  Recommendations...")
+    metrics.update(bench_recommendations(service, rows, repeats))
+    print("⏱️  Cold start and peak RSS...")
+    metrics.update(bench_cold_start(rows))
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "model_version": service.model_version,
+        "metrics": metrics
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[Dict]:
+    """
+    Compare every metric present in both documents
+
+    Returns:
+        One row per metric with the relative change and a regression flag
+    """
+    rows = []
+    for name, metric in results["metrics"].items():
+        base = baseline.get("metrics", {}).get(name)
+        if base is None or base["value"] == 0:
+            continue
+        change = (metric["value"] - base["value"]) / base["value"]
+        worse = change if metric["better"] == "lower" else -change
+        rows.append({
+            "metric": name,
+            "baseline": base["value"],
+            "current": metric["value"],
+            "unit": metric["unit"],
+            "change": change,
+            "regression": worse > tolerance
+        })
+    return rows
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=PROJECT_ROOT, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _print_metrics(results: Dict) -> None:
+    print(f"\n{'metric':<32} {'value':>14} {'unit':<7}")
+    for name, metric in results["metrics"].items():
+        print(f"{name:<32} {metric['value']:>14,.3f} {metric['unit']:<7}")
+
+
+def _print_comparison(rows: List[Dict], tolerance: float) -> None:
+    print(f"\nComparison with baseline (tolerance {tolerance:.0%}):")
+    print(f"{'metric':<32} {'baseline':>12} {'current':>12} {'change':>8}")
+    for row in rows:
+        flag = "  ❌ REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['metric']:<32} {row['baseline']:>12,.3f} {row['current']:>12,.3f} "
+            f"{row['change']:>+8.1%}{flag}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="ChurnModelService benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes and fewer repeats")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON to compare with")
+    parser.add_argument("--output", type=Path, help="Results JSON path (default: data/benchmarks/)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Relative slowdown treated as a regression (default 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(quick=args.quick)
+    _print_metrics(results)
+
+    output = args.output or RESULTS_DIR / f"results_{results['timestamp'].replace(':', '')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    (output.parent / "latest.json").write_text(json.dumps(results, indent=2))
+    print(f"\n💾 Results written to {output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"ℹ️  No baseline at {args.baseline}; create one with --save-baseline")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("quick") != results["quick"]:
+        print("⚠️ Baseline and results were run with different --quick settings")
+    rows = compare(results, baseline, args.tolerance)
+    _print_comparison(rows, args.tolerance)
+    regressions = [row["metric"] for row in rows if row["regression"]]
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
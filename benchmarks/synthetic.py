@@ -0,0 +1,66 @@
+"""
+Synthetic Customer Generator
+Realistic CustomerData rows for benchmarks and load tests, following the
+distributions of the cleaned training data (see notebook/01_data_cleaning)
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+# Share of customers per province: the cleaning notebook maps the source
+# dataset's (evenly populated) states onto provinces, 29 states in total
+PROVINCE_WEIGHTS = {
+    "Bagmati": 6, "Koshi": 6, "Gandaki": 4, "Lumbini": 4,
+    "Madhesh": 3, "Karnali": 3, "Sudurpashchim": 3
+}
+
+# Two source operators map to each provider, so the split is even
+PROVIDER_WEIGHTS = {"Ncell": 1, "Nepal Telecom": 1}
+
+# Ranges of the cleaned data (df1.describe() in the cleaning notebook)
+NUMERIC_RANGES = {
+    "age": (18, 74),
+    "num_dependents": (0, 4),
+    "estimated_salary": (20000, 149999),
+    "calls_made": (0, 108),
+    "sms_sent": (0, 53),
+    "data_used": (0, 10991),
+    "tenure_months": (0, 40)
+}
+
+
+def _weighted_choice(rng: np.random.Generator, weights: Dict[str, float], n: int) -> np.ndarray:
+    labels = list(weights)
+    p = np.array([weights[label] for label in labels], dtype=np.float64)
+    return rng.choice(labels, size=n, p=p / p.sum())
+
+
+def generate_customers(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate n synthetic customers with CustomerData columns
+
+    Args:
+        n: Number of customers
+        seed: Random seed (same seed, same customers)
+
+    Returns:
+        DataFrame with one row per customer
+    """
+    rng = np.random.default_rng(seed)
+    columns = {
+        "name": [f"Customer {i}" for i in range(n)],
+        "gender": rng.choice(["MALE", "FEMALE"], size=n)
+    }
+    for field, (low, high) in NUMERIC_RANGES.items():
+        columns[field] = rng.integers(low, high + 1, size=n)
+    columns["estimated_salary"] = columns["estimated_salary"].astype(np.float64)
+    columns["data_used"] = columns["data_used"].astype(np.float64)
+    columns["province"] = _weighted_choice(rng, PROVINCE_WEIGHTS, n)
+    columns["provider"] = _weighted_choice(rng, PROVIDER_WEIGHTS, n)
+    return pd.DataFrame(columns)
+
+
+def generate_records(n: int, seed: int = 0) -> List[Dict]:
+    """Synthetic customers as JSON-ready dictionaries (API request bodies)"""
+    return generate_customers(n, seed).astype(object).to_dict("records")
@@ -10,20 +10,28 @@ import subprocess
 import logging
 from pathlib import Path
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+from src.config import get_settings, load_config
+from src.logging_config import configure_logging
+
+configure_logging()
 logger = logging.getLogger(__name__)
 
-def run_api(host: str = "0.0.0.0", port: int = 8000):
-    """Run FastAPI backend"""
-    logger.info(f"🚀 Starting API server on {host}:{port}")
-    logger.info("📚 API Documentation: http://localhost:8000/docs")
+def run_api(host: str = None, port: int = None):
+    """Run FastAPI backend ([api] and [performance] in config.ini)"""
+    settings = get_settings()
+    host = host or settings.api.host
+    port = port or settings.api.port
+    workers = settings.performance.api_workers
+    # uvicorn ignores --workers when reloading
+    server_args = ["--workers", str(workers)] if workers > 1 else (["--reload"] if settings.api.reload else [])
+    logger.info(f"🚀 Starting API server on {host}:{port} ({workers} worker(s))")
+    logger.info(f"📚 API Documentation: http://localhost:{port}/docs")
     try:
         subprocess.run(
             [sys.executable, "-m", "uvicorn", "src.model:app", 
-             "--host", host, "--port", str(port), "--reload"],
+             "--host", host, "--port", str(port), "--log-level", settings.api.log_level,
+             *server_args,
+             *([] if load_config()["logging"].getboolean("access_log", True) else ["--no-access-log"])],
             cwd=Path(__file__).parent
         )
     except KeyboardInterrupt:
@@ -48,8 +56,9 @@ def run_ui():
         logger.error(f"❌ Error running UI: {str(e)}")
         sys.exit(1)
 
-def run_both(host: str = "0.0.0.0", api_port: int = 8000):
+def run_both(host: str = None, api_port: int = None):
     """Run both API and UI"""
+    api_port = api_port or get_settings().api.port
     logger.info("🚀 Starting both API and UI")
     logger.info(f"📊 UI will open in your browser")
     logger.info(f"📚 API Documentation: http://localhost:{api_port}/docs")
@@ -80,6 +89,104 @@ def run_both(host: str = "0.0.0.0", api_port: int = 8000):
         ui_process.terminate()
         sys.exit(1)
 
+def run_batch_score(input_path: str, output_path: str, index_path: str = None):
+    """Score a customer CSV, only rescoring new or changed customers"""
+    logger.info(f"📦 Scoring {input_path} incrementally")
+    try:
+        from src.rescoring import run_batch_scoring
+        run_batch_scoring(
+            Path(input_path), Path(output_path),
+            Path(index_path) if index_path else None
+        )
+    except Exception as e:
+        logger.error(f"❌ Batch scoring failed: {str(e)}")
+        sys.exit(1)
+
+def run_build_feature_store(csv_path: str = None):
+    """Build the memory-mapped feature store from the cleaned data"""
+    logger.info("🏗️ Building feature store")
+    try:
+        from src.model_service import ChurnModelService
+        from src.feature_store import build_feature_store
+        build_feature_store(ChurnModelService(), Path(csv_path) if csv_path else None)
+    except Exception as e:
+        logger.error(f"❌ Feature store build failed: {str(e)}")
+        sys.exit(1)
+
+def run_build_drift_reference(csv_path: str = None):
+    """Write the drift monitor's reference distributions from the training data"""
+    logger.info("🏗️ Building drift reference")
+    try:
+        from src.model_service import ChurnModelService
+        from src.drift import build_drift_reference
+        build_drift_reference(ChurnModelService(), Path(csv_path) if csv_path else None)
+    except Exception as e:
+        logger.error(f"❌ Drift reference build failed: {str(e)}")
+        sys.exit(1)
+
+def run_train_segment_models(csv_path: str = None):
+    """Train the per-segment networks and compare them with the global model"""
+    logger.info("🏗️ Training segment models")
+    try:
+        from src.model_service import ChurnModelService
+        from src.segments import train_segment_models
+        train_segment_models(ChurnModelService(), Path(csv_path) if csv_path else None)
+    except Exception as e:
+        logger.error(f"❌ Segment model training failed: {str(e)}")
+        sys.exit(1)
+    run_segment_report(csv_path)
+
+def run_segment_report(csv_path: str = None):
+    """Held-out accuracy of the global and per-segment networks, per segment"""
+    try:
+        from src.model_service import ChurnModelService
+        from src.segments import SegmentModels, model_file, segment_report, print_segment_report
+        service = ChurnModelService()
+        if service.model_version.startswith("fallback-"):
+            logger.warning("⚠️ The global model is the untrained fallback; its accuracy is not meaningful")
+        models = SegmentModels.load(model_file(service.model_dir))
+        print_segment_report(
+            segment_report(service, models, Path(csv_path) if csv_path else None), models.segment_by
+        )
+    except Exception as e:
+        logger.error(f"❌ Segment report failed: {str(e)}")
+        sys.exit(1)
+
+def run_audit_replay(path: str, model_dir: str = None, output_path: str = None):
+    """Re-score an audit log segment (or directory) with the current or another model"""
+    logger.info(f"🔁 Replaying audit log {path}")
+    try:
+        from src.model_service import ChurnModelService
+        from src.audit_log import replay_segments, print_replay
+        service = ChurnModelService.from_directory(Path(model_dir)) if model_dir else ChurnModelService()
+        if service.model_version.startswith("fallback-"):
+            raise ValueError("No trained model could be loaded to replay with")
+        print_replay(replay_segments(Path(path), service, Path(output_path) if output_path else None))
+    except Exception as e:
+        logger.error(f"❌ Audit replay failed: {str(e)}")
+        sys.exit(1)
+
+def run_memory_report(api_url: str, watch: float = 0, top: int = 20):
+    """Print the memory report of a running API, optionally every few seconds"""
+    try:
+        from src.memory import run_memory_report as memory_report
+        memory_report(api_url, watch, top, token=load_config()["memory"].get("debug_token", ""))
+    except KeyboardInterrupt:
+        logger.info("🛑 Memory report stopped")
+    except Exception as e:
+        logger.error(f"❌ Memory report failed: {str(e)}")
+        sys.exit(1)
+
+def run_load_test(args):
+    """Start the API locally and load-test it under each configuration"""
+    logger.info("📈 Running load test")
+    try:
+        from benchmarks.loadtest import options_from_args, run_load_test as load_test
+        load_test(**options_from_args(args, prefix="load-"))
+    except Exception as e:
+        logger.error(f"❌ Load test failed: {str(e)}")
+        sys.exit(1)
+
 def main():
     parser = argparse.ArgumentParser(
         description="Nepal Telco Churn Prediction Application",
@@ -90,6 +197,15 @@ Examples:
   python main.py --api                   # Run FastAPI backend only
   python main.py --both                  # Run both UI and API
   python main.py --api --port 9000       # Run API on custom port
+  CHURN_PERFORMANCE__API_WORKERS=4 python main.py --api   # Override any config.ini option
+  python main.py --score customers.csv   # Incrementally score a customer CSV
+  python main.py --build-feature-store   # Build feature store from cleaned data
+  python main.py --build-drift-reference # Build drift reference from cleaned data
+  python main.py --audit-replay data/audit --replay-model-dir new_model/
+  python main.py --train-segment-models  # Per-provider networks + accuracy report
+  python main.py --load-test             # Load-test the API, batching off vs on
+  python main.py --memory-report --watch 60   # Memory of the running API every minute
+  python main.py --load-test --load-rate 200 --load-config workers=2,batching=on
         """
     )
     
@@ -103,14 +219,101 @@ Examples:
         "--both", action="store_true", help="Run both UI and API (default)"
     )
     parser.add_argument(
-        "--host", type=str, default="0.0.0.0", help="API host (default: 0.0.0.0)"
+        "--host", type=str, default=None, help="API host (default: [api] host in config.ini)"
+    )
+    parser.add_argument(
+        "--port", type=int, default=None, help="API port (default: [api] port in config.ini)"
+    )
+    parser.add_argument(
+        "--score", type=str, metavar="CSV",
+        help="Score a customer CSV, reusing scores of unchanged customers"
+    )
+    parser.add_argument(
+        "--output", type=str, default="predictions.csv",
+        help="Output CSV for --score (default: predictions.csv); rejected rows go to <name>.rejected.csv"
+    )
+    parser.add_argument(
+        "--index", type=str, default=None,
+        help="Rescore index path for --score (default: data/rescore_index.npz)"
+    )
+    parser.add_argument(
+        "--build-feature-store", nargs="?", const="", default=None, metavar="CSV",
+        help="Build the feature store (default source: data/cleaned_churn_data.csv)"
+    )
+    parser.add_argument(
+        "--build-drift-reference", nargs="?", const="", default=None, metavar="CSV",
+        help="Build model/drift_reference.json (default source: data/cleaned_churn_data.csv)"
+    )
+    parser.add_argument(
+        "--train-segment-models", nargs="?", const="", default=None, metavar="CSV",
+        help="Train per-segment networks ([segments]) and report their accuracy "
+             "(default source: data/cleaned_churn_data.csv)"
     )
     parser.add_argument(
-        "--port", type=int, default=8000, help="API port (default: 8000)"
+        "--segment-report", nargs="?", const="", default=None, metavar="CSV",
+        help="Compare held-out accuracy of the global and segment networks per segment"
     )
+    parser.add_argument(
+        "--audit-replay", type=str, metavar="PATH",
+        help="Re-score an audit log segment or directory and compare with the logged scores"
+    )
+    parser.add_argument(
+        "--replay-model-dir", type=str, default=None, metavar="DIR",
+        help="Model artifacts to replay with (default: model/)"
+    )
+    parser.add_argument(
+        "--replay-output", type=str, default=None, metavar="CSV",
+        help="Write logged and replayed scores per record for --audit-replay"
+    )
+    parser.add_argument(
+        "--memory-report", action="store_true",
+        help="Print the memory report of a running API (/debug/memory)"
+    )
+    parser.add_argument(
+        "--api-url", type=str, default=None,
+        help="API URL for --memory-report (default: [ui] api_url in config.ini)"
+    )
+    parser.add_argument(
+        "--watch", type=float, default=0, metavar="SECONDS",
+        help="Repeat --memory-report every SECONDS"
+    )
+    parser.add_argument(
+        "--load-test", action="store_true",
+        help="Start the API locally and load-test it (options: --load-*)"
+    )
+    from benchmarks.loadtest_options import add_arguments as add_load_test_arguments
+    add_load_test_arguments(parser, prefix="load-")
     
     args = parser.parse_args()
     
+    if args.score:
+        run_batch_score(args.score, args.output, args.index)
+        return
+    if args.build_feature_store is not None:
+        run_build_feature_store(args.build_feature_store or None)
+        return
+    if args.train_segment_models is not None:
+        run_train_segment_models(args.train_segment_models or None)
+        return
+    if args.segment_report is not None:
+        run_segment_report(args.segment_report or None)
+        return
+    if args.audit_replay:
+        run_audit_replay(args.audit_replay, args.replay_model_dir, args.replay_output)
+        return
+    if args.build_drift_reference is not None:
+        run_build_drift_reference(args.build_drift_reference or None)
+        return
+    if args.load_test:
+        run_load_test(args)
+        return
+    if args.memory_report:
+        api_url = args.api_url or load_config()["ui"].get(
+            "api_url", f"http://localhost:{args.port or get_settings().api.port}"
+        )
+        run_memory_report(api_url, args.watch)
+        return
+    
     # If no specific mode is chosen, run both
     if not (args.ui or args.api or args.both):
         args.both = True
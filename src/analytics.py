@@ -0,0 +1,149 @@
+"""
+Running Analytics Aggregates
+Constant-size prediction statistics updated as predictions are made, so the
+dashboard and /analytics never rescan the history
+"""
+
+import threading
+import numpy as np
+from typing import Dict, List, Optional
+
+RISK_LEVELS = ["LOW", "MEDIUM", "HIGH"]
+CHURN_PREDICTIONS = ["CHURN", "RETAIN"]
+
+# Fixed histogram bins over churn_probability (percent)
+HISTOGRAM_BINS = 20
+HISTOGRAM_EDGES = np.linspace(0, 100, HISTOGRAM_BINS + 1)
+
+
+class _Aggregate:
+    """Counts, histogram and Welford mean/variance for one slice of predictions"""
+
+    __slots__ = ("count", "mean", "m2", "risk_counts", "churn_counts", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.risk_counts = np.zeros(len(RISK_LEVELS), dtype=np.int64)
+        self.churn_counts = np.zeros(len(CHURN_PREDICTIONS), dtype=np.int64)
+        self.histogram = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+
+    def add(self, probs: np.ndarray, risk_codes: np.ndarray, churn_codes: np.ndarray) -> None:
+        """Merge a batch using the parallel variance combination (Chan et al.)"""
+        n = len(probs)
+        if n == 0:
+            return
+        batch_mean = float(probs.mean())
+        batch_m2 = float(((probs - batch_mean) ** 2).sum())
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += batch_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+        self.risk_counts += np.bincount(risk_codes[risk_codes >= 0], minlength=len(RISK_LEVELS))
+        self.churn_counts += np.bincount(churn_codes[churn_codes >= 0], minlength=len(CHURN_PREDICTIONS))
+        bins = np.clip(np.searchsorted(HISTOGRAM_EDGES, probs, side="right") - 1, 0, HISTOGRAM_BINS - 1)
+        self.histogram += np.bincount(bins, minlength=HISTOGRAM_BINS)
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean_probability": round(self.mean, 4),
+            "std_probability": round(float(np.sqrt(self.m2 / self.count)) if self.count else 0.0, 4),
+            "churn_rate": round(self.churn_counts[0] / self.count * 100, 2) if self.count else 0.0,
+            "risk_counts": dict(zip(RISK_LEVELS, self.risk_counts.tolist())),
+            "churn_counts": dict(zip(CHURN_PREDICTIONS, self.churn_counts.tolist())),
+            "histogram": {
+                "edges": HISTOGRAM_EDGES.tolist(),
+                "counts": self.histogram.tolist()
+            }
+        }
+
+
+class RunningAggregates:
+    """Overall and per-segment aggregates of prediction results"""
+
+    def __init__(self, by_segment: bool = True):
+        self.by_segment = by_segment
+        self.overall = _Aggregate()
+        self.provinces: Dict[str, _Aggregate] = {}
+        self.providers: Dict[str, _Aggregate] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.overall.count
+
+    def update(self, results: List[Dict], provinces: Optional[List[str]] = None,
+               providers: Optional[List[str]] = None) -> None:
+        """
+        Fold prediction results into the aggregates
+
+        Args:
+            results: Successful prediction dictionaries
+            provinces: Optional province per result, for the per-province split
+            providers: Optional provider per result, for the per-provider split
+        """
+        if not results:
+            return
+        self.update_columns(
+            np.fromiter((r["churn_probability"] for r in results), dtype=np.float64, count=len(results)),
+            [r["risk_level"] for r in results],
+            [r["churn_prediction"] for r in results],
+            provinces, providers
+        )
+
+    def update_columns(self, probabilities: np.ndarray, risk_levels, churn_predictions,
+                       provinces: Optional[List[str]] = None,
+                       providers: Optional[List[str]] = None) -> None:
+        """
+        Fold columnar prediction results into the aggregates
+
+        Args:
+            probabilities: Churn probabilities in percent
+            risk_levels: Risk level per prediction
+            churn_predictions: CHURN/RETAIN per prediction
+            provinces: Optional province per prediction
+            providers: Optional provider per prediction
+        """
+        probs = np.asarray(probabilities, dtype=np.float64)
+        if len(probs) == 0:
+            return
+        risk_codes = _codes(risk_levels, RISK_LEVELS)
+        churn_codes = _codes(churn_predictions, CHURN_PREDICTIONS)
+
+        with self._lock:
+            self.overall.add(probs, risk_codes, churn_codes)
+            if not self.by_segment:
+                return
+            for labels, segments in ((provinces, self.provinces), (providers, self.providers)):
+                if labels is None:
+                    continue
+                labels = np.array(["" if label is None else str(label) for label in labels])
+                for label in np.unique(labels[labels != ""]):
+                    mask = labels == label
+                    segments.setdefault(str(label), _Aggregate()).add(
+                        probs[mask], risk_codes[mask], churn_codes[mask]
+                    )
+
+    def snapshot(self) -> Dict:
+        """JSON-serializable view of all aggregates"""
+        with self._lock:
+            snapshot = {"overall": self.overall.to_dict()}
+            if self.by_segment:
+                snapshot["by_province"] = {k: v.to_dict() for k, v in self.provinces.items()}
+                snapshot["by_provider"] = {k: v.to_dict() for k, v in self.providers.items()}
+            return snapshot
+
+    def reset(self) -> None:
+        """Forget everything"""
+        with self._lock:
+            self.overall = _Aggregate()
+            self.provinces = {}
+            self.providers = {}
+
+
+def _codes(values, categories: List[str]) -> np.ndarray:
+    lookup = {value: code for code, value in enumerate(categories)}
+    return np.fromiter((lookup.get(v, -1) for v in values), dtype=np.int64, count=len(values))
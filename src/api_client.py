@@ -0,0 +1,188 @@
+"""
+HTTP Client for the Churn Prediction API
+Drop-in replacement for ChurnModelService when the UI runs in remote-inference
+mode; it never imports TensorFlow
+"""
+
+import time
+import logging
+import requests
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Column-oriented /batch-predict response (see src/response_formats.py)
+COLUMNAR_JSON = "application/vnd.churn.columnar+json"
+
+
+class ChurnApiClient:
+    """Pooled, keep-alive client exposing the ChurnModelService prediction interface"""
+
+    # Seconds a health check result is reused (model_loaded is read on every rerun)
+    HEALTH_TTL = 10.0
+
+    def __init__(self, base_url: str, timeout: float = 30.0,
+                 pool_size: int = 10, batch_size: int = 1000):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.batch_size = batch_size
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=2, backoff_factor=0.2, allowed_methods=["GET"])
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._health_checked_at = 0.0
+        self._model_loaded = False
+
+    @property
+    def model_loaded(self) -> bool:
+        """Whether the API reports a loaded model (cached for HEALTH_TTL seconds)"""
+        now = time.monotonic()
+        if now - self._health_checked_at > self.HEALTH_TTL:
+            try:
+                response = self.session.get(f"{self.base_url}/health", timeout=self.timeout)
+                self._model_loaded = response.ok and response.json().get("model_loaded", False)
+            except requests.RequestException as e:
+                logger.warning(f"⚠️ API health check failed: {str(e)}")
+                self._model_loaded = False
+            self._health_checked_at = now
+        return self._model_loaded
+
+    def _error_detail(self, response: requests.Response) -> str:
+        try:
+            return str(response.json().get("detail", response.text))
+        except ValueError:
+            return response.text or f"HTTP {response.status_code}"
+
+    def predict(self, customer_dict: Dict) -> Dict:
+        """
+        Make a prediction for a customer through POST /predict
+
+        Returns:
+            Dictionary with prediction results, same shape as ChurnModelService.predict
+        """
+        try:
+            response = self.session.post(
+                f"{self.base_url}/predict", json=customer_dict, timeout=self.timeout
+            )
+        except requests.RequestException as e:
+            logger.error(f"❌ API request failed: {str(e)}")
+            return {"success": False, "error": f"API request failed: {str(e)}"}
+
+        if not response.ok:
+            return {"success": False, "error": self._error_detail(response)}
+        return {"success": True, **response.json()}
+
+    def predict_batch(self, customers: pd.DataFrame) -> list:
+        """
+        Make predictions for many customers through POST /batch-predict
+
+        Returns:
+            List of prediction result dictionaries, same shape as predict()
+        """
+        records = customers.astype(object).where(customers.notna(), None).to_dict("records")
+        results = []
+        for start in range(0, len(records), self.batch_size):
+            batch = records[start:start + self.batch_size]
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/batch-predict", json=batch, timeout=self.timeout,
+                    headers={"Accept": f"{COLUMNAR_JSON}, application/json;q=0.5"}
+                )
+                error = None if response.ok else self._error_detail(response)
+            except requests.RequestException as e:
+                logger.error(f"❌ API batch request failed: {str(e)}")
+                error = f"API request failed: {str(e)}"
+
+            if error is not None:
+                results.extend(
+                    {
+                        "success": False,
+                        "customer_name": record.get("name") or "Unknown",
+                        "churn_prediction": "ERROR",
+                        "churn_probability": 0,
+                        "risk_level": "UNKNOWN",
+                        "error": error
+                    }
+                    for record in batch
+                )
+                continue
+            if response.headers.get("content-type", "").startswith(COLUMNAR_JSON):
+                results.extend(self._expand_columnar(response.json()))
+                continue
+            for prediction in response.json()["predictions"]:
+                prediction["success"] = prediction.get("churn_prediction") != "ERROR"
+                results.append(prediction)
+        return results
+
+    def predict_proba_batch(self, customers: pd.DataFrame) -> np.ndarray:
+        """
+        Churn probabilities through POST /batch-predict/probabilities
+
+        The API records nothing for these rows (no analytics, drift or audit),
+        so hypothetical customers can be scored freely.
+
+        Returns:
+            Probabilities (0-1), NaN for rows that failed validation or
+            whose request failed
+        """
+        records = customers.astype(object).where(customers.notna(), None).to_dict("records")
+        probs = np.full(len(records), np.nan)
+        for start in range(0, len(records), self.batch_size):
+            batch = records[start:start + self.batch_size]
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/batch-predict/probabilities", json=batch, timeout=self.timeout
+                )
+            except requests.RequestException as e:
+                logger.error(f"❌ API probability request failed: {str(e)}")
+                continue
+            if not response.ok:
+                logger.error(f"❌ API probability request failed: {self._error_detail(response)}")
+                continue
+            values = response.json()["churn_probability"]
+            probs[start:start + len(batch)] = [np.nan if v is None else v / 100 for v in values]
+        return probs
+
+    def _expand_columnar(self, payload: Dict) -> List[Dict]:
+        """Turn a columnar batch response back into prediction dictionaries"""
+        columns = payload["columns"]
+        codes = payload["recommendation_codes"]
+        texts = payload["recommendation_text"]
+        errors = {e["row"]: e["error"] for e in payload.get("errors", [])}
+
+        # Few distinct recommendation bitmasks per batch; expand each once
+        expanded = {}
+        for bits in set(columns["recommendations"]):
+            expanded[bits] = [texts[code] for i, code in enumerate(codes) if bits >> i & 1]
+
+        predictions = []
+        for row, (name, status, prob, risk, bits) in enumerate(zip(
+            columns["customer_name"], columns["churn_prediction"], columns["churn_probability"],
+            columns["risk_level"], columns["recommendations"]
+        )):
+            prediction = {
+                "success": row not in errors,
+                "customer_name": name,
+                "churn_prediction": status,
+                "churn_probability": prob,
+                "risk_level": risk,
+                "recommendations": list(expanded[bits])
+            }
+            if row in errors:
+                prediction["error"] = errors[row]
+            predictions.append(prediction)
+        return predictions
+
+    def close(self) -> None:
+        """Close pooled connections"""
+        self.session.close()
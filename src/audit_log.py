@@ -0,0 +1,388 @@
+"""
+Prediction Audit Log
+Every scored prediction appended as a fixed-width binary record (timestamp,
+model version, encoded features, probability, risk code) to a memory-mapped
+segment file. Segments are msync'ed in the background in batches and rotated
+by size; read_segment/replay_segments read them back for offline analysis
+and for re-scoring with another model version.
+"""
+
+import os
+import json
+import time
+import mmap
+import atexit
+import struct
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUDIT_DIR = Path(__file__).parent.parent / "data" / "audit"
+
+# Segment layout: fixed-size header, then records back to back
+MAGIC = b"CHRNAUD1"
+HEADER_SIZE = 4096
+# magic, committed record count, length of the JSON metadata that follows
+_HEADER_PREFIX = struct.Struct("<8sQI")
+
+RISK_LEVELS = ["LOW", "MEDIUM", "HIGH"]
+MODEL_VERSION_BYTES = 24
+SEGMENT_SUFFIX = ".seg"
+
+
+def record_dtype(n_features: int) -> np.dtype:
+    """Packed record layout for rows with n_features encoded columns"""
+    return np.dtype([
+        ("timestamp", "<f8"),
+        ("model_version", f"S{MODEL_VERSION_BYTES}"),
+        ("probability", "<f4"),
+        ("risk", "i1"),
+        ("features", "<f4", (n_features,))
+    ])
+
+
+def risk_codes(risk_levels: np.ndarray) -> np.ndarray:
+    """LOW/MEDIUM/HIGH -> 0/1/2"""
+    risk_levels = np.asarray(risk_levels)
+    return ((risk_levels == "MEDIUM") + 2 * (risk_levels == "HIGH")).astype(np.int8)
+
+
+class AuditLog:
+    """
+    Append-only writer of memory-mapped audit segments
+
+    append() copies a batch into the mapped segment with one vectorized
+    assignment per field; nothing is written to disk on the request path.
+    A background thread commits the record count and msyncs the segment
+    every fsync_interval seconds, or sooner once fsync_records records are
+    pending. Records past the committed count (e.g. after a crash) are
+    ignored by readers. A full segment is synced, closed and replaced by a
+    new one; closed segments are truncated to their records.
+
+    Args:
+        directory: Where segment files are written
+        train_columns: Names of the encoded feature columns
+        segment_bytes: Size of each segment file
+        fsync_interval: Seconds between background syncs
+        fsync_records: Pending records that trigger an early sync
+    """
+
+    def __init__(self, directory: Path, train_columns: List[str], segment_bytes: int = 64 * 1024 * 1024,
+                 fsync_interval: float = 1.0, fsync_records: int = 10000):
+        self.directory = Path(directory)
+        self.train_columns = list(train_columns)
+        self.dtype = record_dtype(len(self.train_columns))
+        self.capacity = max((segment_bytes - HEADER_SIZE) // self.dtype.itemsize, 1)
+        self.fsync_interval = fsync_interval
+        self.fsync_records = fsync_records
+        self.records_written = 0
+        self.segments_written = 0
+
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._file = None
+        self._map = None
+        self._records = None
+        self._count = 0
+        self._committed = 0
+        self.path: Optional[Path] = None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._open_segment()
+
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._sync_loop, name="audit-log-sync", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_config(cls, config, train_columns: List[str]) -> Optional["AuditLog"]:
+        """Writer configured by the [audit] section, or None when disabled"""
+        section = config["audit"] if config.has_section("audit") else {}
+        if str(section.get("enabled", "false")).lower() not in ("1", "true", "yes", "on"):
+            return None
+        directory = Path(section.get("directory", "data/audit"))
+        if not directory.is_absolute():
+            directory = DEFAULT_AUDIT_DIR.parent.parent / directory
+        try:
+            audit_log = cls(
+                directory, train_columns,
+                segment_bytes=int(float(section.get("segment_mb", 64)) * 1024 * 1024),
+                fsync_interval=float(section.get("fsync_interval", 1.0)),
+                fsync_records=int(section.get("fsync_records", 10000))
+            )
+        except OSError as e:
+            logger.warning(f"⚠️ Could not open audit log in {directory}: {str(e)}")
+            return None
+        logger.info(f"✅ Audit log writing to {directory} ({audit_log.capacity} records per segment)")
+        return audit_log
+
+    # ==================== Segments ====================
+
+    def _open_segment(self) -> None:
+        self._sequence += 1
+        name = f"audit-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}-{self._sequence:04d}{SEGMENT_SUFFIX}"
+        self.path = self.directory / name
+        size = HEADER_SIZE + self.capacity * self.dtype.itemsize
+
+        metadata = json.dumps({
+            "format": 1,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "train_columns": self.train_columns,
+            "record_size": self.dtype.itemsize,
+            "risk_levels": RISK_LEVELS
+        }).encode("utf-8")
+        if _HEADER_PREFIX.size + len(metadata) > HEADER_SIZE:
+            raise ValueError("Audit segment metadata does not fit in the header")
+
+        self._file = open(self.path, "w+b")
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._map[:_HEADER_PREFIX.size] = _HEADER_PREFIX.pack(MAGIC, 0, len(metadata))
+        self._map[_HEADER_PREFIX.size:_HEADER_PREFIX.size + len(metadata)] = metadata
+        self._records = np.frombuffer(self._map, dtype=self.dtype, count=self.capacity, offset=HEADER_SIZE)
+        self._count = 0
+        self._committed = 0
+
+    def _commit(self) -> None:
+        """Record the count in the header and msync the segment (lock held)"""
+        if self._map is None or self._committed == self._count:
+            return
+        struct.pack_into("<Q", self._map, 8, self._count)
+        self._map.flush()
+        self._committed = self._count
+
+    def _close_segment(self) -> None:
+        """Sync, unmap and truncate the active segment to its records (lock held)"""
+        self._commit()
+        self._records = None
+        self._map.close()
+        self._file.truncate(HEADER_SIZE + self._count * self.dtype.itemsize)
+        self._file.close()
+        self._map = self._file = None
+        self.segments_written += 1
+
+    # ==================== Writing ====================
+
+    def append(self, encoded: np.ndarray, probabilities: np.ndarray, risk_levels: np.ndarray,
+               model_version: str, timestamp: Optional[float] = None) -> None:
+        """
+        Append one record per scored row
+
+        Args:
+            encoded: Encoded, unscaled feature rows (n_rows, n_train_columns)
+            probabilities: Churn probabilities (0-1)
+            risk_levels: LOW/MEDIUM/HIGH per row
+            model_version: Version of the model that produced the scores
+            timestamp: Unix time shared by the rows (defaults to now)
+        """
+        n = len(encoded)
+        if n == 0:
+            return
+        timestamp = time.time() if timestamp is None else timestamp
+        version = model_version.encode("utf-8")[:MODEL_VERSION_BYTES]
+        codes = risk_codes(risk_levels)
+
+        with self._lock:
+            if self._map is None:
+                return
+            start = 0
+            while start < n:
+                if self._count == self.capacity:
+                    self._close_segment()
+                    self._open_segment()
+                take = min(n - start, self.capacity - self._count)
+                block = self._records[self._count:self._count + take]
+                block["timestamp"] = timestamp
+                block["model_version"] = version
+                block["probability"] = probabilities[start:start + take]
+                block["risk"] = codes[start:start + take]
+                block["features"] = encoded[start:start + take]
+                # The view pins the mapping, which must be unmapped on rotation
+                del block
+                self._count += take
+                start += take
+            self.records_written += n
+            pending = self._count - self._committed
+        if pending >= self.fsync_records:
+            self._wake.set()
+
+    def _sync_loop(self) -> None:
+        while not self._stopped:
+            self._wake.wait(self.fsync_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit and msync pending records now"""
+        with self._lock:
+            try:
+                self._commit()
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Audit log sync failed: {str(e)}")
+
+    def close(self) -> None:
+        """Sync and close the active segment; later appends are ignored"""
+        self._stopped = True
+        self._wake.set()
+        with self._lock:
+            if self._map is not None:
+                self._close_segment()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "segment": self.path.name if self.path else None,
+                "records_in_segment": self._count,
+                "unsynced_records": self._count - self._committed,
+                "records_written": self.records_written,
+                "segments_closed": self.segments_written
+            }
+
+
+# ==================== Reading ====================
+
+def read_segment(path: Path) -> Tuple[Dict, np.ndarray]:
+    """
+    Memory-map a segment read-only
+
+    Returns:
+        (metadata, records): the header metadata and a structured array of
+        the committed records
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(_HEADER_PREFIX.size)
+        magic, count, metadata_size = _HEADER_PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an audit log segment")
+        metadata = json.loads(f.read(metadata_size).decode("utf-8"))
+    dtype = record_dtype(len(metadata["train_columns"]))
+    if count == 0:
+        return metadata, np.empty(0, dtype=dtype)
+    return metadata, np.memmap(path, dtype=dtype, mode="r", offset=HEADER_SIZE, shape=(count,))
+
+
+def segment_paths(path: Path) -> List[Path]:
+    """A segment file, or the segments of a directory in write order"""
+    path = Path(path)
+    return sorted(path.glob(f"*{SEGMENT_SUFFIX}")) if path.is_dir() else [path]
+
+
+def iter_records(path: Path, chunk_size: int = 65536) -> Iterator[Tuple[Dict, np.ndarray]]:
+    """(metadata, records chunk) for every segment under path"""
+    for segment in segment_paths(path):
+        metadata, records = read_segment(segment)
+        for start in range(0, len(records), chunk_size):
+            yield metadata, records[start:start + chunk_size]
+
+
+def _aligned_features(records: np.ndarray, columns: List[str], train_columns: List[str]) -> np.ndarray:
+    """Recorded features reordered to another model's columns (missing columns are zero)"""
+    if columns == train_columns:
+        return np.ascontiguousarray(records["features"])
+    features = np.zeros((len(records), len(train_columns)), dtype=np.float32)
+    position = {col: i for i, col in enumerate(columns)}
+    for i, col in enumerate(train_columns):
+        if col in position:
+            features[:, i] = records["features"][:, position[col]]
+    return features
+
+
+def replay_segments(path: Path, model_service, output_path: Optional[Path] = None,
+                    chunk_size: int = 65536) -> Dict:
+    """
+    Re-score logged features with another model and compare with the logged scores
+
+    Args:
+        path: A segment file or a directory of segments
+        model_service: ChurnModelService holding the model to compare
+        output_path: Optional CSV with one row per record (logged and replayed scores)
+        chunk_size: Records scored per model call
+
+    Returns:
+        Summary: records, logged model versions, mean/max absolute probability
+        change, churn decision agreement and a logged -> replayed risk matrix
+    """
+    train_columns = list(model_service.train_columns)
+    risk_matrix = np.zeros((len(RISK_LEVELS), len(RISK_LEVELS)), dtype=np.int64)
+    versions: Dict[str, int] = {}
+    total, abs_diff_sum, max_diff, agree = 0, 0.0, 0.0, 0
+    frames = []
+    missing_reported = False
+
+    for metadata, records in iter_records(path, chunk_size):
+        columns = metadata["train_columns"]
+        missing = set(train_columns) - set(columns)
+        if missing and not missing_reported:
+            logger.warning(f"⚠️ Columns not in the audit log, replayed as 0: {sorted(missing)}")
+            missing_reported = True
+
+        features = _aligned_features(records, columns, train_columns)
+        replayed = model_service.predict_proba_encoded(model_service.scale_encoded(features))
+        _, replayed_risk = model_service.classify(replayed)
+        replayed_codes = risk_codes(replayed_risk)
+        logged = np.asarray(records["probability"], dtype=np.float32)
+        logged_codes = np.asarray(records["risk"], dtype=np.int64)
+
+        diff = np.abs(replayed - logged)
+        total += len(records)
+        abs_diff_sum += float(diff.sum())
+        max_diff = max(max_diff, float(diff.max()))
+        agree += int(((replayed > model_service.CHURN_THRESHOLD) == (logged > model_service.CHURN_THRESHOLD)).sum())
+        np.add.at(risk_matrix, (logged_codes, replayed_codes), 1)
+        for version, count in zip(*np.unique(records["model_version"], return_counts=True)):
+            key = version.decode("utf-8")
+            versions[key] = versions.get(key, 0) + int(count)
+
+        if output_path is not None:
+            frames.append(pd.DataFrame({
+                "timestamp": pd.to_datetime(records["timestamp"], unit="s"),
+                "logged_model_version": np.char.decode(records["model_version"], "utf-8"),
+                "logged_probability": np.round(logged * 100, 2),
+                "logged_risk_level": np.array(RISK_LEVELS)[logged_codes],
+                "replayed_probability": np.round(replayed * 100, 2),
+                "replayed_risk_level": replayed_risk
+            }))
+
+    if output_path is not None:
+        columns = ["timestamp", "logged_model_version", "logged_probability", "logged_risk_level",
+                   "replayed_probability", "replayed_risk_level"]
+        (pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)).to_csv(
+            output_path, index=False
+        )
+        logger.info(f"✅ Replayed scores written to {output_path}")
+
+    return {
+        "records": total,
+        "logged_model_versions": versions,
+        "replay_model_version": model_service.model_version,
+        "mean_abs_probability_change": round(abs_diff_sum / total * 100, 4) if total else 0.0,
+        "max_abs_probability_change": round(max_diff * 100, 4),
+        "churn_decision_agreement": round(agree / total, 4) if total else None,
+        "risk_transitions": {
+            logged: dict(zip(RISK_LEVELS, row.tolist()))
+            for logged, row in zip(RISK_LEVELS, risk_matrix)
+        }
+    }
+
+
+def print_replay(summary: Dict) -> None:
+    """Human-readable replay summary"""
+    print(f"\nAudit replay: {summary['records']} records")
+    print(f"  Logged model versions: {summary['logged_model_versions']}")
+    print(f"  Replayed with:         {summary['replay_model_version']}")
+    print(f"  Mean |Δ probability|:  {summary['mean_abs_probability_change']:.4f} pp")
+    print(f"  Max |Δ probability|:   {summary['max_abs_probability_change']:.4f} pp")
+    if summary["churn_decision_agreement"] is not None:
+        print(f"  Churn decision agreement: {summary['churn_decision_agreement'] * 100:.2f}%")
+    print("  Risk level (logged -> replayed):")
+    print("    " + " " * 8 + "".join(f"{level:>10}" for level in RISK_LEVELS))
+    for logged, row in summary["risk_transitions"].items():
+        print(f"    {logged:<8}" + "".join(f"{row[level]:>10}" for level in RISK_LEVELS))
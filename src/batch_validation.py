@@ -0,0 +1,162 @@
+"""
+Columnar Batch Validation
+Checks a /batch-predict payload one column at a time with NumPy instead of
+building a CustomerData object per row; errors are reported per row index
+"""
+
+import numpy as np
+import pandas as pd
+from collections import defaultdict
+from operator import itemgetter
+from typing import Dict, List, Tuple
+
+try:
+    from src.predmodel import VALID_GENDERS, VALID_PROVINCES, VALID_PROVIDERS
+except ImportError:
+    from predmodel import VALID_GENDERS, VALID_PROVINCES, VALID_PROVIDERS
+
+# Numeric CustomerData fields: (required, default, minimum, maximum, integer)
+NUMERIC_FIELDS = {
+    "age": (True, None, 18, 100, True),
+    "num_dependents": (False, 0, 0, 10, True),
+    "estimated_salary": (True, None, 0, None, False),
+    "calls_made": (False, 0, 0, None, True),
+    "sms_sent": (False, 0, 0, None, True),
+    "data_used": (False, 0, 0, None, False),
+    "tenure_months": (True, None, 0, 72, True)
+}
+
+# Categorical CustomerData fields and their allowed values
+CATEGORICAL_FIELDS = {
+    "gender": VALID_GENDERS,
+    "province": VALID_PROVINCES,
+    "provider": VALID_PROVIDERS
+}
+
+OUTPUT_COLUMNS = ["name", "gender", *NUMERIC_FIELDS, "province", "provider"]
+
+# Integer fields are returned as int64; larger magnitudes would wrap around
+INT64_LIMIT = 2.0 ** 63
+
+
+def _columns(records: list) -> Dict[str, np.ndarray]:
+    """Transpose records into object arrays, one per CustomerData field (None when absent)"""
+    if not records:
+        return {field: np.empty(0, dtype=object) for field in OUTPUT_COLUMNS}
+    try:
+        # Fast path: every record has every field, transposed in C
+        rows = list(map(itemgetter(*OUTPUT_COLUMNS), records))
+        columns = zip(*rows)
+    except KeyError:
+        columns = ([r.get(field) for r in records] for field in OUTPUT_COLUMNS)
+    return {field: _object_array(values) for field, values in zip(OUTPUT_COLUMNS, columns)}
+
+
+def _object_array(values) -> np.ndarray:
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def _numeric_column(values: np.ndarray) -> np.ndarray:
+    """Column as float64 with NaN for nulls and for values that are not numbers"""
+    try:
+        return values.astype(np.float64)
+    except (ValueError, TypeError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+
+
+def _categorical_column(values: np.ndarray, allowed: List[str], upper: bool) -> np.ndarray:
+    """Column normalised to the allowed values (None where invalid), one lookup per distinct value"""
+    def normalise(value):
+        if not isinstance(value, str):
+            return None
+        value = value.upper() if upper else value
+        return value if value in allowed else None
+
+    try:
+        lookup = {value: normalise(value) for value in set(values)}
+    except TypeError:
+        # Unhashable JSON values (objects or arrays) in the column
+        return _object_array([normalise(value) for value in values])
+    return _object_array(list(map(lookup.__getitem__, values)))
+
+
+def validate_batch(records: list) -> Tuple[pd.DataFrame, Dict[int, List[str]]]:
+    """
+    Validate customer records with the CustomerData rules, a column at a time
+
+    Missing and null values are treated alike: optional fields take their
+    default, required fields are reported. Gender is upper-cased as
+    CustomerData does.
+
+    Args:
+        records: Decoded JSON array from the request body
+
+    Returns:
+        Tuple of (valid rows indexed by their position in records,
+        {row index: [error messages]} for the rejected rows)
+    """
+    errors: Dict[int, List[str]] = defaultdict(list)
+
+    is_object = np.fromiter((type(r) is dict for r in records), dtype=bool, count=len(records))
+    positions = np.flatnonzero(is_object)
+    if len(positions) < len(records):
+        for i in np.flatnonzero(~is_object).tolist():
+            errors[i].append("row must be a JSON object")
+        records = [records[i] for i in positions.tolist()]
+
+    def report(bad: np.ndarray, message: str) -> None:
+        for i in positions[bad].tolist():
+            errors[i].append(message)
+
+    columns = _columns(records)
+    output = {}
+
+    names = columns["name"]
+    missing = names == None  # noqa: E711 (elementwise)
+    is_text = (_object_array(list(map(type, names))) == str) & (names != "")
+    report(missing, "name: field required")
+    report(~missing & ~is_text, "name: must be a non-empty string")
+    output["name"] = names
+
+    for field, (required, default, minimum, maximum, integer) in NUMERIC_FIELDS.items():
+        raw = columns[field]
+        values = _numeric_column(raw)
+        missing = raw == None if np.isnan(values).any() else np.zeros(len(raw), dtype=bool)  # noqa: E711
+        if required:
+            report(missing, f"{field}: field required")
+        else:
+            values = np.where(missing, default, values)
+        report(~missing & np.isnan(values), f"{field}: must be a number")
+        finite = ~np.isnan(values)
+        if integer:
+            with np.errstate(invalid="ignore"):
+                # Infinity has no remainder and counts as fractional
+                fractional = np.mod(values, 1) != 0
+            report(finite & fractional, f"{field}: must be an integer")
+            report(finite & ~fractional & (np.abs(values) >= INT64_LIMIT), f"{field}: must be a 64-bit integer")
+        if minimum is not None:
+            report(finite & (values < minimum), f"{field}: must be >= {minimum}")
+        if maximum is not None:
+            report(finite & (values > maximum), f"{field}: must be <= {maximum}")
+        output[field] = values
+
+    for field, allowed in CATEGORICAL_FIELDS.items():
+        raw = columns[field]
+        values = _categorical_column(raw, allowed, upper=field == "gender")
+        missing = raw == None  # noqa: E711
+        report(missing, f"{field}: field required")
+        report(~missing & (values == None), f"{field}: must be one of {allowed}")  # noqa: E711
+        output[field] = values
+
+    # Object columns: skip pandas' string dtype inference on 100k-row payloads
+    frame = pd.DataFrame(
+        {field: pd.Series(values, index=positions, dtype=object if values.dtype == object else None)
+         for field, values in output.items()}
+    )
+    valid = frame.drop(index=list(errors), errors="ignore")
+    for field, (_, _, _, _, integer) in NUMERIC_FIELDS.items():
+        if integer:
+            valid[field] = valid[field].astype(np.int64)
+    return valid[OUTPUT_COLUMNS], dict(errors)
@@ -0,0 +1,261 @@
+"""
+Application Configuration
+Reads config.ini from the project root (or the file named by the
+CHURN_CONFIG environment variable) once per process. Any option can be
+overridden from the environment as CHURN_<SECTION>__<KEY>, e.g.
+CHURN_PERFORMANCE__API_WORKERS=4. get_settings() parses the sections the
+entry points share into typed settings.
+"""
+
+import os
+import configparser
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CONFIG_PATH = Path(os.environ.get("CHURN_CONFIG", PROJECT_ROOT / "config.ini"))
+
+# CHURN_<SECTION>__<KEY>; single-underscore names such as CHURN_CONFIG are not overrides
+ENV_PREFIX = "CHURN_"
+ENV_SEPARATOR = "__"
+
+INFERENCE_BACKENDS = ("compiled", "eager", "predict")
+
+
+@lru_cache(maxsize=1)
+def load_config() -> configparser.ConfigParser:
+    """Parse config.ini (interpolation disabled so logging format strings survive)"""
+    config = configparser.ConfigParser(interpolation=None)
+    config.read(CONFIG_PATH, encoding="utf-8")
+    apply_env_overrides(config, os.environ)
+    return config
+
+
+def apply_env_overrides(config: configparser.ConfigParser, environ: Mapping[str, str]) -> List[str]:
+    """
+    Set options from CHURN_<SECTION>__<KEY> variables
+
+    Returns:
+        The "section.key" options that were overridden
+    """
+    applied = []
+    for name, value in environ.items():
+        if not name.startswith(ENV_PREFIX) or ENV_SEPARATOR not in name:
+            continue
+        section, key = name[len(ENV_PREFIX):].split(ENV_SEPARATOR, 1)
+        section, key = section.lower(), key.lower()
+        if not section or not key:
+            continue
+        if not config.has_section(section):
+            config.add_section(section)
+        config[section][key] = value
+        applied.append(f"{section}.{key}")
+    return applied
+
+
+def _option(config: configparser.ConfigParser, section: str, key: str, kind, default):
+    """Typed option with a default, naming the option in conversion errors"""
+    if not config.has_option(section, key):
+        return default
+    try:
+        if kind is bool:
+            return config.getboolean(section, key)
+        return kind(config.get(section, key).strip())
+    except ValueError:
+        raise ValueError(
+            f"Invalid value for [{section}] {key}: {config.get(section, key)!r} (expected {kind.__name__})"
+        ) from None
+
+
+def _path(value: str) -> Path:
+    path = Path(value)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+class ApiSettings:
+    """[api] section: how python main.py --api starts uvicorn"""
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 8000, reload: bool = True,
+                 log_level: str = "info"):
+        self.host = host
+        self.port = port
+        self.reload = reload
+        self.log_level = log_level
+
+    @classmethod
+    def from_config(cls, config) -> "ApiSettings":
+        return cls(
+            host=_option(config, "api", "host", str, "0.0.0.0"),
+            port=_option(config, "api", "port", int, 8000),
+            reload=_option(config, "api", "reload", bool, True),
+            log_level=_option(config, "api", "log_level", str, "info").lower()
+        )
+
+
+class ModelSettings:
+    """[model] section: artifact paths (relative paths are from the project root)"""
+
+    def __init__(self, model_path: str = "model/Churnpred_ann.keras", scaler_path: str = "model/scaler.pkl",
+                 columns_path: str = "model/train_columns.pkl", use_fallback: bool = True):
+        self.model_path = _path(model_path)
+        self.scaler_path = _path(scaler_path)
+        self.columns_path = _path(columns_path)
+        self.use_fallback = use_fallback
+
+    @property
+    def model_dir(self) -> Path:
+        """Directory of the model file; other artifacts (drift reference) are kept beside it"""
+        return self.model_path.parent
+
+    def in_directory(self, model_dir: Path) -> "ModelSettings":
+        """The same artifact file names in another directory"""
+        model_dir = Path(model_dir)
+        return ModelSettings(
+            str(model_dir / self.model_path.name), str(model_dir / self.scaler_path.name),
+            str(model_dir / self.columns_path.name), self.use_fallback
+        )
+
+    @classmethod
+    def from_config(cls, config) -> "ModelSettings":
+        return cls(
+            model_path=_option(config, "model", "model_path", str, "model/Churnpred_ann.keras"),
+            scaler_path=_option(config, "model", "scaler_path", str, "model/scaler.pkl"),
+            columns_path=_option(config, "model", "columns_path", str, "model/train_columns.pkl"),
+            use_fallback=_option(config, "model", "use_fallback", bool, True)
+        )
+
+
+class ThresholdSettings:
+    """[thresholds] section: decision thresholds on the raw churn probability (0-1)"""
+
+    def __init__(self, churn_threshold: float = 0.5, low_risk_max: float = 0.3,
+                 medium_risk_max: float = 0.6):
+        if not 0.0 <= low_risk_max <= medium_risk_max <= 1.0:
+            raise ValueError(
+                f"[thresholds] needs 0 <= low_risk_max <= medium_risk_max <= 1, "
+                f"got {low_risk_max} and {medium_risk_max}"
+            )
+        if not 0.0 <= churn_threshold <= 1.0:
+            raise ValueError(f"[thresholds] churn_threshold must be within 0-1, got {churn_threshold}")
+        self.churn_threshold = churn_threshold
+        self.low_risk_max = low_risk_max
+        self.medium_risk_max = medium_risk_max
+
+    @classmethod
+    def from_config(cls, config) -> "ThresholdSettings":
+        return cls(
+            churn_threshold=_option(config, "thresholds", "churn_threshold", float, 0.5),
+            low_risk_max=_option(config, "thresholds", "low_risk_max", float, 0.3),
+            medium_risk_max=_option(config, "thresholds", "medium_risk_max", float, 0.6)
+        )
+
+
+class PerformanceSettings:
+    """
+    [performance] section: deployment tuning
+
+    Args:
+        backend: Model execution for scoring: compiled (tf.function graph),
+            eager (direct Keras call, model.predict past inference_batch_size)
+            or predict (always model.predict)
+        inference_batch_size: Rows per model call for large batches
+        max_batch_size: Most requests the inference scheduler merges into one batch
+        max_wait_ms: Longest a request waits for its micro-batch to fill
+        api_workers: uvicorn worker processes for python main.py --api
+        recommendation_cache_size: Distinct recommendation patterns whose texts are cached
+        numpy_threads: BLAS/OpenMP threads used by NumPy (0 = library default)
+        tensorflow_intra_op_threads: Threads within one TensorFlow op (0 = default)
+        tensorflow_inter_op_threads: TensorFlow ops run in parallel (0 = default)
+    """
+
+    def __init__(self, backend: str = "compiled", inference_batch_size: int = 1024,
+                 max_batch_size: int = 256, max_wait_ms: float = 2.0, api_workers: int = 1,
+                 recommendation_cache_size: int = 4096, numpy_threads: int = 0,
+                 tensorflow_intra_op_threads: int = 0, tensorflow_inter_op_threads: int = 0):
+        if backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"[performance] backend must be one of {', '.join(INFERENCE_BACKENDS)}, got {backend!r}")
+        for name, value in (("inference_batch_size", inference_batch_size),
+                            ("max_batch_size", max_batch_size), ("api_workers", api_workers)):
+            if value < 1:
+                raise ValueError(f"[performance] {name} must be at least 1, got {value}")
+        self.backend = backend
+        self.inference_batch_size = inference_batch_size
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max(max_wait_ms, 0.0)
+        self.api_workers = api_workers
+        self.recommendation_cache_size = max(recommendation_cache_size, 0)
+        self.numpy_threads = max(numpy_threads, 0)
+        self.tensorflow_intra_op_threads = max(tensorflow_intra_op_threads, 0)
+        self.tensorflow_inter_op_threads = max(tensorflow_inter_op_threads, 0)
+
+    @classmethod
+    def from_config(cls, config) -> "PerformanceSettings":
+        def option(key, kind, default, legacy_section=None):
+            # Micro-batching options used to live in [scheduler]
+            if legacy_section and not config.has_option("performance", key):
+                return _option(config, legacy_section, key, kind, default)
+            return _option(config, "performance", key, kind, default)
+
+        return cls(
+            backend=option("backend", str, "compiled").lower(),
+            inference_batch_size=option("inference_batch_size", int, 1024),
+            max_batch_size=option("max_batch_size", int, 256, legacy_section="scheduler"),
+            max_wait_ms=option("max_wait_ms", float, 2.0, legacy_section="scheduler"),
+            api_workers=option("api_workers", int, 1),
+            recommendation_cache_size=option("recommendation_cache_size", int, 4096),
+            numpy_threads=option("numpy_threads", int, 0),
+            tensorflow_intra_op_threads=option("tensorflow_intra_op_threads", int, 0),
+            tensorflow_inter_op_threads=option("tensorflow_inter_op_threads", int, 0)
+        )
+
+
+class Settings:
+    """Typed view of the sections shared by the API, UI and CLI"""
+
+    def __init__(self, api: ApiSettings, model: ModelSettings, thresholds: ThresholdSettings,
+                 performance: PerformanceSettings):
+        self.api = api
+        self.model = model
+        self.thresholds = thresholds
+        self.performance = performance
+
+    @classmethod
+    def from_config(cls, config) -> "Settings":
+        return cls(
+            api=ApiSettings.from_config(config),
+            model=ModelSettings.from_config(config),
+            thresholds=ThresholdSettings.from_config(config),
+            performance=PerformanceSettings.from_config(config)
+        )
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable view (paths as strings)"""
+        return {
+            name: {key: str(value) if isinstance(value, Path) else value for key, value in vars(part).items()}
+            for name, part in (("api", self.api), ("model", self.model),
+                               ("thresholds", self.thresholds), ("performance", self.performance))
+        }
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Typed settings from load_config(), parsed and validated once per process"""
+    return Settings.from_config(load_config())
+
+
+def configure_numpy_threads(threads: int) -> Optional[str]:
+    """
+    Limit the BLAS/OpenMP thread pools NumPy uses (requires threadpoolctl)
+
+    Returns:
+        None on success or when threads is 0, otherwise why the limit was not applied
+    """
+    if threads <= 0:
+        return None
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return "threadpoolctl is not installed"
+    threadpool_limits(limits=threads)
+    return None
@@ -0,0 +1,321 @@
+"""
+Streaming Feature Drift Monitor
+Fixed-bin histograms of the numeric features and province/provider counts of
+scored rows, compared against reference distributions saved next to the model
+artifacts. Memory is constant: rows are folded into counts and never kept.
+"""
+
+import json
+import logging
+import threading
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+from statistics import NormalDist
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_FILE = "drift_reference.json"
+
+# One-hot column prefixes of the categorical features, by feature name
+CATEGORICAL_PREFIXES = {"province": "province_", "provider": "provider_nepal_"}
+
+# Rows without any matching one-hot column (e.g. an unknown provider spelling)
+UNMATCHED = "(unmatched)"
+
+# Floor for empty bins so PSI stays finite
+_EPSILON = 1e-4
+
+
+def _proportions(counts: np.ndarray) -> np.ndarray:
+    total = counts.sum()
+    return counts / total if total else np.zeros(len(counts))
+
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Population stability index between two binned distributions (proportions)"""
+    expected = np.maximum(np.asarray(expected, dtype=np.float64), _EPSILON)
+    actual = np.maximum(np.asarray(actual, dtype=np.float64), _EPSILON)
+    return float(((actual - expected) * np.log(actual / expected)).sum())
+
+
+def binned_ks(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Kolmogorov-Smirnov statistic on the bin edges (largest gap between the CDFs)"""
+    return float(np.abs(np.cumsum(actual) - np.cumsum(expected)).max())
+
+
+def _categorical_columns(train_columns: List[str]) -> Dict[str, List[str]]:
+    """Category labels per categorical feature, in train_columns order"""
+    return {
+        feature: [col[len(prefix):] for col in train_columns if col.startswith(prefix)]
+        for feature, prefix in CATEGORICAL_PREFIXES.items()
+    }
+
+
+def build_reference(encoded: np.ndarray, train_columns: List[str], numeric_features: List[str],
+                    bins: int = 10, source: str = "training data") -> Dict:
+    """
+    Reference distributions of encoded (unscaled) training rows
+
+    Numeric bin edges are the interior quantiles of each feature (duplicates
+    removed for discrete features), so every bin holds a similar share of the
+    training rows.
+
+    Args:
+        encoded: Rows from ChurnModelService.encode_batch
+        train_columns: Column names of the encoded rows
+        numeric_features: Numeric columns to bin
+        bins: Target number of bins per numeric feature
+        source: Free-text description stored with the reference
+
+    Returns:
+        JSON-serialisable reference dictionary
+    """
+    numeric = {}
+    for feature in numeric_features:
+        values = encoded[:, train_columns.index(feature)].astype(np.float64)
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]))
+        counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+        numeric[feature] = {"edges": edges.tolist(), "proportions": _proportions(counts).tolist()}
+
+    categorical = {}
+    for feature, labels in _categorical_columns(train_columns).items():
+        counts = _category_counts(encoded, [train_columns.index(CATEGORICAL_PREFIXES[feature] + label)
+                                            for label in labels])
+        categorical[feature] = dict(zip(labels + [UNMATCHED], _proportions(counts).tolist()))
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "source": source,
+        "rows": int(len(encoded)),
+        "numeric": numeric,
+        "categorical": categorical
+    }
+
+
+def reference_from_scaler(scaler, numeric_features: List[str], bins: int = 10) -> Optional[Dict]:
+    """
+    Approximate numeric reference from the fitted StandardScaler's mean and variance
+
+    Used when no reference file exists: bins are normal deciles, so the scores
+    are only a rough guide for skewed features. No categorical reference.
+    """
+    if scaler is None or not hasattr(scaler, "mean_") or getattr(scaler, "var_", None) is None:
+        return None
+    names = list(getattr(scaler, "feature_names_in_", numeric_features))
+    quantiles = [NormalDist().inv_cdf(q) for q in np.linspace(0, 1, bins + 1)[1:-1]]
+    numeric = {}
+    for feature, mean, var in zip(names, scaler.mean_, scaler.var_):
+        numeric[feature] = {
+            "edges": [float(mean + np.sqrt(var) * z) for z in quantiles],
+            "proportions": [1.0 / bins] * bins
+        }
+    return {
+        "created": None,
+        "source": "scaler (normal approximation)",
+        "rows": int(getattr(scaler, "n_samples_seen_", 0)),
+        "numeric": numeric,
+        "categorical": {}
+    }
+
+
+def _category_counts(encoded: np.ndarray, positions: List[int]) -> np.ndarray:
+    """Counts per one-hot column, plus a final count of rows matching none of them"""
+    if not positions:
+        return np.array([len(encoded)], dtype=np.int64)
+    block = encoded[:, positions]
+    codes = np.where(block.any(axis=1), block.argmax(axis=1), len(positions))
+    return np.bincount(codes, minlength=len(positions) + 1)
+
+
+class DriftMonitor:
+    """
+    Online drift scores of scored rows against a reference
+
+    observe() folds a batch of encoded rows into fixed-size counters in
+    O(1) per row. Scores are reported both since startup and for the most
+    recent window of window_rows rows (the window in progress and the one
+    before it, so the window never drops below window_rows once full).
+
+    Args:
+        reference: Dictionary from build_reference or reference_from_scaler
+        train_columns: Column names of the encoded rows passed to observe()
+        window_rows: Rows per recent window
+        min_rows: Rows needed before a status other than "insufficient_data"
+        psi_warning: PSI from which a feature is reported as "warning"
+        psi_alert: PSI from which a feature is reported as "drift"
+    """
+
+    def __init__(self, reference: Dict, train_columns: List[str], window_rows: int = 10000,
+                 min_rows: int = 500, psi_warning: float = 0.1, psi_alert: float = 0.25):
+        self.reference = reference
+        self.window_rows = window_rows
+        self.min_rows = min_rows
+        self.psi_warning = psi_warning
+        self.psi_alert = psi_alert
+        self._lock = threading.Lock()
+
+        self._numeric = []
+        for feature, ref in reference.get("numeric", {}).items():
+            if feature in train_columns:
+                self._numeric.append((feature, train_columns.index(feature), np.asarray(ref["edges"]),
+                                      np.asarray(ref["proportions"])))
+        self._categorical = []
+        for feature, labels in _categorical_columns(train_columns).items():
+            ref = reference.get("categorical", {}).get(feature)
+            positions = [train_columns.index(CATEGORICAL_PREFIXES[feature] + label) for label in labels]
+            expected = np.array([ref.get(label, 0.0) for label in labels + [UNMATCHED]]) if ref else None
+            self._categorical.append((feature, labels + [UNMATCHED], positions, expected))
+
+        self.started = datetime.now()
+        self.total = self._empty_counts()
+        self.current = self._empty_counts()
+        self.previous = None
+
+    def _empty_counts(self) -> Dict:
+        counts = {"rows": 0}
+        for feature, _, edges, _ in self._numeric:
+            counts[feature] = np.zeros(len(edges) + 1, dtype=np.int64)
+        for feature, labels, _, _ in self._categorical:
+            counts[feature] = np.zeros(len(labels), dtype=np.int64)
+        return counts
+
+    @classmethod
+    def from_config(cls, config, model_dir: Path, train_columns: List[str],
+                    numeric_features: List[str], scaler=None) -> Optional["DriftMonitor"]:
+        """
+        Monitor configured by the [drift] section, or None when disabled
+
+        The reference is model_dir/drift_reference.json, falling back to the
+        scaler statistics when the file does not exist.
+        """
+        section = config["drift"] if config.has_section("drift") else {}
+        if str(section.get("enabled", "true")).lower() not in ("1", "true", "yes", "on"):
+            return None
+
+        path = Path(model_dir) / REFERENCE_FILE
+        reference = None
+        if path.exists():
+            try:
+                reference = json.loads(path.read_text(encoding="utf-8"))
+                logger.info(f"✅ Drift reference loaded ({reference.get('rows', 0)} rows)")
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Could not load drift reference: {str(e)}")
+        if reference is None:
+            reference = reference_from_scaler(scaler, numeric_features)
+            if reference is None:
+                logger.warning("⚠️ No drift reference and no fitted scaler, drift monitor disabled")
+                return None
+            logger.warning(f"⚠️ Drift reference not found at {path}, approximating from the scaler")
+
+        return cls(
+            reference, train_columns,
+            window_rows=int(section.get("window_rows", 10000)),
+            min_rows=int(section.get("min_rows", 500)),
+            psi_warning=float(section.get("psi_warning", 0.1)),
+            psi_alert=float(section.get("psi_alert", 0.25))
+        )
+
+    def observe(self, encoded: np.ndarray) -> None:
+        """Fold encoded (unscaled) rows into the histograms"""
+        n = len(encoded)
+        if n == 0:
+            return
+        batch = {"rows": n}
+        for feature, position, edges, _ in self._numeric:
+            batch[feature] = np.bincount(np.searchsorted(edges, encoded[:, position], side="right"),
+                                         minlength=len(edges) + 1)
+        for feature, _, positions, _ in self._categorical:
+            batch[feature] = _category_counts(encoded, positions)
+
+        with self._lock:
+            for counts in (self.total, self.current):
+                for key, value in batch.items():
+                    counts[key] += value
+            if self.current["rows"] >= self.window_rows:
+                self.previous, self.current = self.current, self._empty_counts()
+
+    def _scores(self, counts: Dict) -> Dict:
+        rows = counts["rows"]
+        features = {}
+        for feature, _, edges, expected in self._numeric:
+            actual = _proportions(counts[feature])
+            features[feature] = self._feature_scores(expected, actual, rows)
+            features[feature]["bins"] = {"edges": edges.tolist(), "counts": counts[feature].tolist()}
+        for feature, labels, _, expected in self._categorical:
+            actual = _proportions(counts[feature])
+            if expected is None:
+                features[feature] = {"psi": None, "status": "no_reference"}
+            else:
+                features[feature] = self._feature_scores(expected, actual, rows, ks=False)
+            features[feature]["frequencies"] = dict(zip(labels, np.round(actual, 4).tolist()))
+        return {"rows": rows, "features": features}
+
+    def _feature_scores(self, expected: np.ndarray, actual: np.ndarray, rows: int, ks: bool = True) -> Dict:
+        score = psi(expected, actual) if rows else 0.0
+        if rows < self.min_rows:
+            status = "insufficient_data"
+        elif score >= self.psi_alert:
+            status = "drift"
+        elif score >= self.psi_warning:
+            status = "warning"
+        else:
+            status = "stable"
+        result = {"psi": round(score, 4), "status": status}
+        if ks:
+            result["ks"] = round(binned_ks(expected, actual), 4) if rows else 0.0
+        return result
+
+    def report(self) -> Dict:
+        """Drift scores since startup and for the recent window"""
+        with self._lock:
+            total = {key: value + 0 for key, value in self.total.items()}
+            recent = {key: value + (self.previous[key] if self.previous else 0)
+                      for key, value in self.current.items()}
+
+        since_start = self._scores(total)
+        window = self._scores(recent)
+        flagged = sorted(
+            feature for feature, scores in window["features"].items()
+            if scores["status"] in ("warning", "drift")
+        )
+        return {
+            "status": "insufficient_data" if recent["rows"] < self.min_rows
+            else "drift" if any(window["features"][f]["status"] == "drift" for f in flagged)
+            else "warning" if flagged else "stable",
+            "flagged_features": flagged,
+            "thresholds": {"psi_warning": self.psi_warning, "psi_alert": self.psi_alert,
+                           "min_rows": self.min_rows, "window_rows": self.window_rows},
+            "reference": {key: self.reference.get(key) for key in ("source", "rows", "created")},
+            "monitoring_since": self.started.isoformat(timespec="seconds"),
+            "recent_window": window,
+            "since_start": since_start
+        }
+
+
+def build_drift_reference(model_service, csv_path: Optional[Path] = None, bins: int = 10) -> Path:
+    """
+    Write model/drift_reference.json from the training data
+
+    Args:
+        model_service: Loaded ChurnModelService (provides the encoder)
+        csv_path: Cleaned data CSV (defaults to data/cleaned_churn_data.csv)
+        bins: Target number of bins per numeric feature
+
+    Returns:
+        Path of the reference file
+    """
+    try:
+        from src.feature_store import DEFAULT_SOURCE_CSV, load_customer_frame
+    except ImportError:
+        from feature_store import DEFAULT_SOURCE_CSV, load_customer_frame
+
+    csv_path = Path(csv_path) if csv_path else DEFAULT_SOURCE_CSV
+    encoded = model_service.encode_batch(load_customer_frame(csv_path))
+    reference = build_reference(encoded, list(model_service.train_columns),
+                                model_service.NUMERIC_FEATURES, bins=bins, source=csv_path.name)
+    path = model_service.model_dir / REFERENCE_FILE
+    path.write_text(json.dumps(reference, indent=2), encoding="utf-8")
+    logger.info(f"✅ Drift reference for {len(encoded)} rows written to {path}")
+    return path
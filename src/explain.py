@@ -0,0 +1,138 @@
+"""
+Per-Feature Attribution for Churn Predictions
+Gradient x input and integrated gradients on the network that scored each row
+(its segment network when [segments] is enabled, otherwise the global one),
+computed for a whole batch at once and grouped back to the CustomerData fields
+"""
+
+import numpy as np
+import tensorflow as tf
+from typing import Dict, List, Optional, Tuple
+
+GRADIENT_X_INPUT = "gradient_x_input"
+INTEGRATED_GRADIENTS = "integrated_gradients"
+METHODS = (GRADIENT_X_INPUT, INTEGRATED_GRADIENTS)
+
+# Rows per gradient pass, bounds the memory of the tape for large batches
+GRADIENT_CHUNK_ROWS = 8192
+
+# One-hot column prefixes that are summed into a single field attribution
+FEATURE_GROUPS = {"province_": "province", "provider_nepal_": "provider"}
+
+
+class ExplanationBudgetError(ValueError):
+    """Raised when an explanation request exceeds the per-request cost budget"""
+
+
+def explanation_cost(n_rows: int, method: str, steps: int) -> int:
+    """Number of per-row gradient evaluations a request needs"""
+    return n_rows * (steps if method == INTEGRATED_GRADIENTS else 1)
+
+
+def check_request(n_rows: int, method: str, steps: int, max_evaluations: int = 0) -> None:
+    """
+    Reject an explanation request before any work is done
+
+    Raises:
+        ValueError: Unknown method
+        ExplanationBudgetError: More than max_evaluations row-gradient evaluations (0 disables it)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown attribution method '{method}', use one of {list(METHODS)}")
+    cost = explanation_cost(n_rows, method, steps)
+    if max_evaluations and cost > max_evaluations:
+        raise ExplanationBudgetError(
+            f"Explanation needs {cost} gradient evaluations, budget is {max_evaluations}. "
+            f"Send fewer rows or use {GRADIENT_X_INPUT}."
+        )
+
+
+def _gradients(model, inputs: np.ndarray) -> np.ndarray:
+    """d(probability)/d(input) for every row, in chunks"""
+    grads = np.empty_like(inputs, dtype=np.float32)
+    for start in range(0, len(inputs), GRADIENT_CHUNK_ROWS):
+        x = tf.convert_to_tensor(inputs[start:start + GRADIENT_CHUNK_ROWS], dtype=tf.float32)
+        with tf.GradientTape() as tape:
+            tape.watch(x)
+            probs = model(x, training=False)
+        grads[start:start + len(x)] = tape.gradient(probs, x).numpy()
+    return grads
+
+
+def _model_gradients(model_service, inputs: np.ndarray, codes: Optional[np.ndarray]) -> np.ndarray:
+    """Gradients from each row's segment network, or the global network for the rest"""
+    if codes is None:
+        return _gradients(model_service.model, inputs)
+    grads = model_service.segments.input_gradients(inputs, codes)
+    unrouted = codes < 0
+    if unrouted.any():
+        grads[unrouted] = _gradients(model_service.model, inputs[unrouted])
+    return grads
+
+
+def attribute(model_service, encoded: np.ndarray, method: str = GRADIENT_X_INPUT,
+              steps: int = 32, max_evaluations: int = 0) -> np.ndarray:
+    """
+    Attribute each row's churn probability to its model inputs
+
+    The baseline is the all-zero scaled input: the average customer on the
+    numeric features with no province or provider set. Gradients come from
+    the network predict_proba_encoded scores the row with, so with segment
+    models loaded a routed row is explained by its segment network.
+
+    Args:
+        model_service: Loaded ChurnModelService
+        encoded: Encoded, unscaled rows from encode_batch
+        method: gradient_x_input or integrated_gradients
+        steps: Interpolation steps for integrated gradients
+        max_evaluations: Cost budget in row-gradient evaluations (0 disables it)
+
+    Returns:
+        Attributions in probability units, shape (n_rows, n_train_columns)
+    """
+    check_request(len(encoded), method, steps, max_evaluations)
+
+    scaled = model_service.scale_encoded(encoded).astype(np.float32)
+    segments = getattr(model_service, "segments", None)
+    codes = segments.segment_codes(scaled) if segments is not None else None
+    if method == GRADIENT_X_INPUT:
+        return _model_gradients(model_service, scaled, codes) * scaled
+
+    # Integrated gradients: midpoint Riemann sum along the straight path from zero.
+    # Every point of the path is routed with its row's segment, not re-routed.
+    n_rows, n_cols = scaled.shape
+    alphas = ((np.arange(steps) + 0.5) / steps).astype(np.float32)
+    path = alphas[:, None, None] * scaled[None, :, :]
+    path_codes = None if codes is None else np.tile(codes, steps)
+    grads = _model_gradients(model_service, path.reshape(-1, n_cols), path_codes)
+    return grads.reshape(steps, n_rows, n_cols).mean(axis=0) * scaled
+
+
+def group_attributions(train_columns: List[str], attributions: np.ndarray) -> List[Dict]:
+    """
+    Sum one-hot columns into their field and return one dictionary per row
+
+    Values are in percentage points of churn probability.
+    """
+    fields, grouped = grouped_attribution_matrix(train_columns, attributions)
+    return [dict(zip(fields, row)) for row in grouped.tolist()]
+
+
+def grouped_attribution_matrix(train_columns: List[str],
+                               attributions: np.ndarray) -> Tuple[List[str], np.ndarray]:
+    """
+    Sum one-hot columns into their field
+
+    Returns:
+        Tuple of (field names, attributions in percentage points with shape
+        (n_rows, n_fields))
+    """
+    names = []
+    for col in train_columns:
+        prefix = next((p for p in FEATURE_GROUPS if col.startswith(p)), None)
+        names.append(FEATURE_GROUPS[prefix] if prefix else col)
+    fields = list(dict.fromkeys(names))
+    membership = np.zeros((len(train_columns), len(fields)), dtype=np.float32)
+    membership[np.arange(len(train_columns)), [fields.index(n) for n in names]] = 1
+
+    return fields, np.round((attributions @ membership).astype(np.float64) * 100, 3)
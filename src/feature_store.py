@@ -0,0 +1,151 @@
+"""
+Memory-Mapped Feature Store
+Encoded customer features built from the cleaned data, served by customer_id
+without re-sending or re-validating the raw attributes
+"""
+
+import json
+import logging
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = Path(__file__).parent.parent / "data" / "feature_store"
+DEFAULT_SOURCE_CSV = Path(__file__).parent.parent / "data" / "cleaned_churn_data.csv"
+
+FEATURES_FILE = "features.npy"
+IDS_FILE = "customer_ids.npy"
+OFFSETS_FILE = "row_offsets.npy"
+META_FILE = "meta.json"
+
+
+def load_customer_frame(csv_path: Path) -> pd.DataFrame:
+    """
+    Load the cleaned churn data into CustomerData-style columns
+
+    Derives tenure_months from date_of_registration the same way the
+    training notebook does and renames provider_nepal to provider.
+    """
+    df = pd.read_csv(csv_path)
+    if "tenure_months" not in df and "date_of_registration" in df:
+        registered = pd.to_datetime(df["date_of_registration"])
+        df["tenure_months"] = (registered.max() - registered).dt.days // 30
+    if "provider" not in df and "provider_nepal" in df:
+        df = df.rename(columns={"provider_nepal": "provider"})
+    return df
+
+
+def build_feature_store(model_service, csv_path: Optional[Path] = None,
+                        store_dir: Optional[Path] = None,
+                        chunk_size: int = 50000) -> Path:
+    """
+    Encode the cleaned data into a memory-mapped float32 matrix plus id index
+
+    Args:
+        model_service: Loaded ChurnModelService (provides the encoder)
+        csv_path: Cleaned data CSV (defaults to data/cleaned_churn_data.csv)
+        store_dir: Output directory (defaults to data/feature_store)
+        chunk_size: Rows encoded per chunk
+
+    Returns:
+        Path of the store directory
+    """
+    csv_path = Path(csv_path) if csv_path else DEFAULT_SOURCE_CSV
+    store_dir = Path(store_dir) if store_dir else DEFAULT_STORE_DIR
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    customers = load_customer_frame(csv_path)
+    if "customer_id" not in customers:
+        raise ValueError(f"{csv_path} has no customer_id column")
+
+    n_rows, n_cols = len(customers), len(model_service.train_columns)
+    features = np.lib.format.open_memmap(
+        store_dir / FEATURES_FILE, mode="w+", dtype=np.float32, shape=(n_rows, n_cols)
+    )
+    for start in range(0, n_rows, chunk_size):
+        chunk = customers.iloc[start:start + chunk_size]
+        features[start:start + len(chunk)] = model_service.encode_batch(chunk)
+    features.flush()
+    del features
+
+    ids = np.asarray(customers["customer_id"])
+    ids = ids.astype(np.int64) if ids.dtype.kind in "iu" else ids.astype(str)
+    sorted_ids, first_rows = np.unique(ids, return_index=True)
+    if len(sorted_ids) != n_rows:
+        logger.warning(f"⚠️ {n_rows - len(sorted_ids)} duplicate customer ids, keeping first rows")
+    np.save(store_dir / IDS_FILE, sorted_ids)
+    np.save(store_dir / OFFSETS_FILE, first_rows.astype(np.int64))
+
+    meta = {
+        "columns": list(model_service.train_columns),
+        "rows": n_rows,
+        "source": str(csv_path),
+        "created_at": datetime.now().isoformat(timespec="seconds")
+    }
+    (store_dir / META_FILE).write_text(json.dumps(meta, indent=2))
+    logger.info(f"✅ Feature store built: {n_rows} customers -> {store_dir}")
+    return store_dir
+
+
+class FeatureStore:
+    """Read-only view over a feature store directory; all arrays are memory-mapped"""
+
+    def __init__(self, features: np.ndarray, customer_ids: np.ndarray,
+                 row_offsets: np.ndarray, columns: list):
+        self.features = features
+        self.customer_ids = customer_ids
+        self.row_offsets = row_offsets
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.customer_ids)
+
+    @classmethod
+    def open(cls, store_dir: Optional[Path] = None) -> "FeatureStore":
+        """Open a store without reading the feature matrix into memory"""
+        store_dir = Path(store_dir) if store_dir else DEFAULT_STORE_DIR
+        meta = json.loads((store_dir / META_FILE).read_text())
+        store = cls(
+            features=np.load(store_dir / FEATURES_FILE, mmap_mode="r"),
+            customer_ids=np.load(store_dir / IDS_FILE, mmap_mode="r"),
+            row_offsets=np.load(store_dir / OFFSETS_FILE, mmap_mode="r"),
+            columns=meta["columns"]
+        )
+        logger.info(f"✅ Feature store opened: {len(store)} customers from {store_dir}")
+        return store
+
+    def _coerce_ids(self, ids: list) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert request ids to the store's id type; returns (ids, valid_mask)"""
+        if self.customer_ids.dtype.kind in "iu":
+            coerced = pd.to_numeric(pd.Series(ids, dtype=object), errors="coerce")
+            valid = (coerced.notna() & (coerced % 1 == 0)).to_numpy()
+            return coerced.where(valid, -1).to_numpy(dtype=np.int64), valid
+        return np.asarray([str(i) for i in ids]), np.ones(len(ids), dtype=bool)
+
+    def lookup(self, ids: list) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Resolve customer ids to row offsets
+
+        Returns:
+            Tuple of (row_offsets, found_mask); offsets are only valid where found
+        """
+        keys, valid = self._coerce_ids(ids)
+        if len(self) == 0:
+            return np.zeros(len(keys), dtype=np.int64), np.zeros(len(keys), dtype=bool)
+        positions = np.minimum(np.searchsorted(self.customer_ids, keys), len(self) - 1)
+        found = valid & (self.customer_ids[positions] == keys)
+        return self.row_offsets[positions], found
+
+    def get_rows(self, ids: list) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fetch encoded rows for the given customer ids
+
+        Returns:
+            Tuple of (rows for found ids in request order, found_mask)
+        """
+        offsets, found = self.lookup(ids)
+        return np.asarray(self.features[offsets[found]]), found
@@ -0,0 +1,298 @@
+"""
+Prediction History Store
+Recent predictions are kept in preallocated column arrays (a fixed-size ring
+buffer) that serve the History page; every prediction is also spilled to a
+local SQLite file, queried with indexed filters and pagination once a page
+reaches past the buffer. The file is shared by all UI sessions, each session
+only sees and clears its own rows, and rows older than the retention period
+are pruned whenever a session opens its history.
+"""
+
+import time
+import sqlite3
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from src.analytics import RunningAggregates
+except ImportError:
+    from analytics import RunningAggregates
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = Path(__file__).parent.parent / "data" / "prediction_history.db"
+
+RISK_LEVELS = ["LOW", "MEDIUM", "HIGH", "UNKNOWN"]
+CHURN_PREDICTIONS = ["CHURN", "RETAIN", "ERROR"]
+
+# Columns returned by queries, in order (also the insert order, before session_id)
+COLUMNS = [
+    "timestamp", "customer_name", "churn_prediction", "churn_probability", "risk_level",
+    "province", "provider", "recommendations"
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp REAL NOT NULL,
+    customer_name TEXT,
+    churn_prediction TEXT,
+    churn_probability REAL,
+    risk_level TEXT,
+    recommendations TEXT,
+    province TEXT,
+    provider TEXT,
+    session_id TEXT NOT NULL DEFAULT ''
+);
+"""
+
+
+class HistoryDatabase:
+    """The SQLite spill file: one connection per process, shared by every session"""
+
+    def __init__(self, path: Optional[Path] = None, retention_days: float = 0):
+        self.path = Path(path) if path else DEFAULT_HISTORY_PATH
+        self.retention_days = retention_days
+        self.lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """Add columns to history files created before they existed and index by session"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(predictions)")}
+        with self.conn:
+            for column in ("province", "provider"):
+                if column not in columns:
+                    self.conn.execute(f"ALTER TABLE predictions ADD COLUMN {column} TEXT")
+            if "session_id" not in columns:
+                self.conn.execute("ALTER TABLE predictions ADD COLUMN session_id TEXT NOT NULL DEFAULT ''")
+            self.conn.execute("DROP INDEX IF EXISTS idx_predictions_filters")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_predictions_session "
+                "ON predictions (session_id, risk_level, churn_prediction, id)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_predictions_timestamp ON predictions (timestamp)")
+
+    def prune(self) -> int:
+        """
+        Delete rows older than the retention period (every session's)
+
+        Session ids are not reused, so rows of ended sessions are unreachable;
+        this keeps them from accumulating. A retention of 0 keeps everything.
+
+        Returns:
+            Number of rows deleted
+        """
+        if self.retention_days <= 0:
+            return 0
+        cutoff = time.time() - self.retention_days * 86400
+        with self.lock:
+            with self.conn:
+                deleted = self.conn.execute("DELETE FROM predictions WHERE timestamp < ?", (cutoff,)).rowcount
+        if deleted:
+            logger.info(f"🧹 Pruned {deleted:,} prediction history rows older than {self.retention_days:g} days")
+        return deleted
+
+
+class PredictionHistory:
+    """One session's predictions: bounded in-memory columns plus its rows in the SQLite file
+
+    The newest `capacity` rows answer counts and pages from memory; older
+    pages fall through to SQLite. Running aggregates over the session's full
+    history are kept alongside, so the dashboard never reads stored rows back.
+    """
+
+    def __init__(self, database: HistoryDatabase, session_id: str, capacity: int = 10000):
+        self.database = database
+        self.session_id = session_id
+        self.capacity = capacity
+        self._lock = database.lock
+        self._conn = database.conn
+
+        # Ring buffer columns; risk level and prediction are stored as small integer codes
+        self._timestamp = np.zeros(capacity, dtype=np.float64)
+        self._probability = np.zeros(capacity, dtype=np.float64)
+        self._risk = np.zeros(capacity, dtype=np.int8)
+        self._churn = np.zeros(capacity, dtype=np.int8)
+        self._name = np.empty(capacity, dtype=object)
+        self._province = np.empty(capacity, dtype=object)
+        self._provider = np.empty(capacity, dtype=object)
+        self._recommendations = np.empty(capacity, dtype=object)
+        self._next = 0
+        self._size = 0
+
+        database.prune()
+        self.aggregates = RunningAggregates()
+        with self._lock:
+            self._total = self._conn.execute(
+                "SELECT COUNT(*) FROM predictions WHERE session_id = ?", (session_id,)
+            ).fetchone()[0]
+            self._load_recent()
+            self._load_aggregates()
+
+    def __len__(self) -> int:
+        return self._total
+
+    def _load_aggregates(self, chunk_size: int = 100000) -> None:
+        """Rebuild the running aggregates with one streaming pass over the session's rows"""
+        cursor = self._conn.execute(
+            "SELECT churn_probability, risk_level, churn_prediction, province, provider "
+            "FROM predictions WHERE session_id = ?", (self.session_id,)
+        )
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            self.aggregates.update(
+                [
+                    {"churn_probability": r[0], "risk_level": r[1], "churn_prediction": r[2]}
+                    for r in rows
+                ],
+                provinces=[r[3] for r in rows],
+                providers=[r[4] for r in rows]
+            )
+
+    def _load_recent(self) -> None:
+        """Warm the ring buffer from the newest persisted rows"""
+        frame = pd.read_sql_query(
+            f"SELECT {', '.join(COLUMNS)} FROM predictions WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+            self._conn, params=[self.session_id, self.capacity]
+        )
+        if len(frame):
+            self._write_ring(frame.iloc[::-1])
+
+    def _write_ring(self, frame: pd.DataFrame) -> None:
+        """Copy the newest rows of frame into the ring buffer columns"""
+        frame = frame.tail(self.capacity)
+        n = len(frame)
+        slots = (self._next + np.arange(n)) % self.capacity
+        self._timestamp[slots] = frame["timestamp"].to_numpy(dtype=np.float64)
+        self._probability[slots] = frame["churn_probability"].to_numpy(dtype=np.float64)
+        self._risk[slots] = pd.Categorical(frame["risk_level"], categories=RISK_LEVELS).codes
+        self._churn[slots] = pd.Categorical(frame["churn_prediction"], categories=CHURN_PREDICTIONS).codes
+        self._name[slots] = frame["customer_name"].to_numpy(dtype=object)
+        self._province[slots] = frame["province"].to_numpy(dtype=object)
+        self._provider[slots] = frame["provider"].to_numpy(dtype=object)
+        self._recommendations[slots] = frame["recommendations"].to_numpy(dtype=object)
+        self._next = (self._next + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+
+    def append(self, results: List[Dict], provinces: Optional[List[str]] = None,
+               providers: Optional[List[str]] = None) -> None:
+        """
+        Record successful prediction results
+
+        Args:
+            results: Prediction dictionaries as returned by predict/predict_batch
+            provinces: Optional province of each customer
+            providers: Optional provider of each customer
+        """
+        if not results:
+            return
+        now = time.time()
+        frame = pd.DataFrame({
+            "timestamp": now,
+            "customer_name": [r.get("customer_name", "Unknown") for r in results],
+            "churn_prediction": [r.get("churn_prediction") for r in results],
+            "churn_probability": [r.get("churn_probability", 0) for r in results],
+            "risk_level": [r.get("risk_level") for r in results],
+            "province": provinces,
+            "provider": providers,
+            "recommendations": ["\n".join(r.get("recommendations", [])) for r in results],
+            "session_id": self.session_id
+        })
+
+        with self._lock:
+            self._write_ring(frame)
+            with self._conn:
+                self._conn.executemany(
+                    f"INSERT INTO predictions ({', '.join(COLUMNS)}, session_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    frame.itertuples(index=False, name=None)
+                )
+            self._total += len(frame)
+        self.aggregates.update(results, provinces, providers)
+
+    def _buffered(self, risk_levels: List[str], predictions: List[str]) -> np.ndarray:
+        """Ring buffer slots matching the filters, newest first"""
+        slots = (self._next - 1 - np.arange(self._size)) % self.capacity
+        risk_codes = [RISK_LEVELS.index(level) for level in risk_levels if level in RISK_LEVELS]
+        churn_codes = [CHURN_PREDICTIONS.index(p) for p in predictions if p in CHURN_PREDICTIONS]
+        mask = np.isin(self._risk[slots], risk_codes) & np.isin(self._churn[slots], churn_codes)
+        return slots[mask]
+
+    def _buffer_frame(self, slots: np.ndarray) -> pd.DataFrame:
+        """Ring buffer rows at slots, in the column layout of the SQLite queries"""
+        # Code -1 (a value outside the known categories) decodes to None
+        risk_labels = np.array(RISK_LEVELS + [None], dtype=object)
+        churn_labels = np.array(CHURN_PREDICTIONS + [None], dtype=object)
+        return pd.DataFrame({
+            "timestamp": pd.to_datetime(self._timestamp[slots], unit="s"),
+            "customer_name": self._name[slots],
+            "churn_prediction": churn_labels[self._churn[slots]],
+            "churn_probability": self._probability[slots],
+            "risk_level": risk_labels[self._risk[slots]],
+            "province": self._province[slots],
+            "provider": self._provider[slots],
+            "recommendations": self._recommendations[slots]
+        })
+
+    def _where(self, risk_levels: List[str], predictions: List[str]):
+        if not risk_levels or not predictions:
+            return "0", []
+        clause = (
+            f"session_id = ? AND risk_level IN ({','.join('?' * len(risk_levels))}) "
+            f"AND churn_prediction IN ({','.join('?' * len(predictions))})"
+        )
+        return clause, [self.session_id, *risk_levels, *predictions]
+
+    def count(self, risk_levels: List[str], predictions: List[str]) -> int:
+        """Number of stored predictions matching the filters"""
+        clause, params = self._where(risk_levels, predictions)
+        with self._lock:
+            if self._size == self._total:
+                return len(self._buffered(risk_levels, predictions))
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM predictions WHERE {clause}", params
+            ).fetchone()[0]
+
+    def query(self, risk_levels: List[str], predictions: List[str],
+              limit: Optional[int] = None, offset: int = 0) -> pd.DataFrame:
+        """
+        Fetch matching predictions, newest first
+
+        Pages within the ring buffer are served from memory; the buffer holds
+        the newest rows, so its matches are the newest matches overall.
+
+        Args:
+            risk_levels: Risk levels to include
+            predictions: Churn predictions to include
+            limit: Page size (None for all rows)
+            offset: Rows to skip
+        """
+        clause, params = self._where(risk_levels, predictions)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM predictions WHERE {clause} ORDER BY id DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._lock:
+            slots = self._buffered(risk_levels, predictions)
+            if self._size == self._total or (limit is not None and offset + limit <= len(slots)):
+                return self._buffer_frame(slots[offset:None if limit is None else offset + limit])
+            frame = pd.read_sql_query(sql, self._conn, params=params)
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"], unit="s")
+        return frame
+
+    def clear(self) -> None:
+        """Delete every prediction of this session"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM predictions WHERE session_id = ?", (self.session_id,))
+            self._next = self._size = self._total = 0
+        self.aggregates.reset()
@@ -0,0 +1,198 @@
+"""
+Logging Setup
+Queue-based logging driven by the [logging] section of config.ini: callers
+only enqueue records, while a listener thread formats them (plain text or
+JSON) and writes them to the console and log file. Per-request INFO records
+are sampled per endpoint ([log_sampling]) before any message is formatted.
+"""
+
+import os
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+import logging.handlers
+import multiprocessing.util
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    from src.config import load_config
+except ImportError:
+    from config import load_config
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else was passed through extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["DroppingQueueHandler"] = None
+_sample_rates: Dict[str, float] = {}
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens in the listener thread; only freeze the arguments here
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including any structured fields passed via extra="""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(config=None, force: bool = False) -> None:
+    """
+    Route all logging through a bounded queue drained by a listener thread
+
+    Safe to call from every entry point; only the first call (or force=True)
+    takes effect.
+
+    [logging] keys: level, format, file (empty for console only), json
+    (true for JSON lines), queue_size (records buffered before new ones are
+    dropped). [log_sampling] maps endpoints to the share of their per-request
+    INFO records that are logged.
+    """
+    global _listener, _queue_handler
+    if _listener is not None and not force:
+        return
+    stop_logging()
+
+    config = config if config is not None else load_config()
+    section = config["logging"] if config.has_section("logging") else {}
+    level = getattr(logging, str(section.get("level", "INFO")).upper(), logging.INFO)
+    as_json = str(section.get("json", "false")).lower() in ("1", "true", "yes", "on")
+    formatter = JsonFormatter() if as_json else logging.Formatter(section.get("format", DEFAULT_FORMAT))
+
+    handlers = [logging.StreamHandler(sys.stderr)]
+    log_file = section.get("file", "")
+    if log_file:
+        path = Path(log_file) if Path(log_file).is_absolute() else PROJECT_ROOT / log_file
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handlers.append(logging.handlers.RotatingFileHandler(
+                path, maxBytes=int(section.get("max_bytes", 10 * 1024 * 1024)),
+                backupCount=int(section.get("backup_count", 5)), encoding="utf-8"
+            ))
+        except OSError as e:
+            print(f"⚠️ Could not open log file {path}: {e}", file=sys.stderr)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=int(section.get("queue_size", 10000)))
+    _queue_handler = DroppingQueueHandler(log_queue)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+
+    _sample_rates.clear()
+    if config.has_section("log_sampling"):
+        for endpoint, rate in config["log_sampling"].items():
+            _sample_rates[endpoint] = min(max(float(rate), 0.0), 1.0)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def _restart_listener_in_child() -> None:
+    """A forked child inherits the queue handler but not the listener thread"""
+    global _listener
+    if _listener is not None:
+        # The inherited queue still lists the parent's listener as its waiter
+        _queue_handler.queue = queue.Queue(maxsize=_queue_handler.queue.maxsize)
+        _listener = logging.handlers.QueueListener(
+            _queue_handler.queue, *_listener.handlers, respect_handler_level=True
+        )
+        _listener.start()
+        # multiprocessing children leave through os._exit, skipping atexit; their
+        # finalizers are reset after this hook, so register the flush once they are
+        multiprocessing.util.register_after_fork(_listener, _flush_at_process_exit)
+
+
+def _flush_at_process_exit(listener: logging.handlers.QueueListener) -> None:
+    multiprocessing.util.Finalize(None, stop_logging, exitpriority=0)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+
+def logging_stats() -> Dict:
+    """Queue depth and records dropped because the queue was full"""
+    if _queue_handler is None:
+        return {"queued": 0, "dropped": 0, "sample_rates": {}}
+    return {
+        "queued": _queue_handler.queue.qsize(),
+        "dropped": _queue_handler.dropped,
+        "sample_rates": dict(_sample_rates)
+    }
+
+
+class SampledLogger:
+    """
+    Per-request logger for one endpoint
+
+    info() keeps the [log_sampling] share of records for the endpoint and
+    decides before the message is formatted; skipped calls cost one random
+    draw. Keyword arguments become structured fields of the record.
+    """
+
+    def __init__(self, logger: logging.Logger, endpoint: str):
+        self.logger = logger
+        self.endpoint = endpoint
+
+    def info(self, msg: str, *args, **fields) -> None:
+        rate = _sample_rates.get(self.endpoint, 1.0)
+        if rate < 1.0 and random.random() >= rate:
+            return
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        self.logger.info(msg, *args, extra={"endpoint": self.endpoint, "sample_rate": rate, **fields})
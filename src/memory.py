@@ -0,0 +1,365 @@
+"""
+Memory Introspection
+Process RSS, tracemalloc allocations grouped by module, the size of the large
+in-memory structures, and periodic snapshots that make growth visible
+"""
+
+import sys
+import time
+import asyncio
+import logging
+import resource
+import sysconfig
+import tracemalloc
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+_STDLIB = sysconfig.get_paths()["stdlib"]
+_MB = 1024 * 1024
+
+
+def process_memory() -> Dict[str, int]:
+    """Resident set size and its peak, in bytes"""
+    try:
+        with open("/proc/self/status") as f:
+            status = dict(line.split(":", 1) for line in f if ":" in line)
+        # Reported in kB
+        return {
+            "rss_bytes": int(status["VmRSS"].split()[0]) * 1024,
+            "peak_rss_bytes": int(status["VmHWM"].split()[0]) * 1024
+        }
+    except (OSError, KeyError, ValueError):
+        # No procfs (macOS): only the peak is available, in bytes there
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == "darwin" else 1024
+        return {"rss_bytes": peak, "peak_rss_bytes": peak}
+
+
+def nbytes(obj, depth: int = 4, _seen: Optional[set] = None) -> Tuple[int, int]:
+    """
+    Approximate memory held by an object and what it references
+
+    NumPy arrays and pandas objects are measured exactly; containers and
+    plain objects are walked up to depth levels, counting shared objects once.
+
+    Returns:
+        Tuple of (resident bytes, memory-mapped file bytes)
+    """
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0, 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        if _is_mapped(obj):
+            return 0, obj.nbytes
+        if obj.dtype == object:
+            return obj.nbytes + sum(sys.getsizeof(item) for item in obj.ravel().tolist()), 0
+        return obj.nbytes, 0
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage), 0
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None or depth <= 0:
+        return sys.getsizeof(obj), 0
+
+    if isinstance(obj, dict):
+        children = [*obj.keys(), *obj.values()]
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        children = list(obj)
+    elif hasattr(obj, "__dict__"):
+        children = list(vars(obj).values())
+    else:
+        return sys.getsizeof(obj), 0
+
+    resident, mapped = sys.getsizeof(obj), 0
+    for child in children:
+        r, m = nbytes(child, depth - 1, seen)
+        resident += r
+        mapped += m
+    return resident, mapped
+
+
+def _is_mapped(array: np.ndarray) -> bool:
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base if isinstance(array.base, np.ndarray) else None
+    return False
+
+
+def model_weight_bytes(model) -> int:
+    """Bytes held by a Keras model's weights"""
+    if model is None:
+        return 0
+    return int(sum(
+        int(np.prod(weight.shape)) * np.dtype(getattr(weight.dtype, "name", weight.dtype)).itemsize
+        for weight in model.weights
+    ))
+
+
+def _module_of(filename: str) -> str:
+    """Group a source file under its package (site-packages), project path or stdlib module"""
+    path = Path(filename)
+    parts = path.parts
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts:
+            rest = parts[parts.index(marker) + 1:]
+            return _strip_py(rest[0]) if rest else filename
+    try:
+        return str(path.relative_to(PROJECT_ROOT))
+    except ValueError:
+        pass
+    if filename.startswith(_STDLIB):
+        return f"stdlib/{_strip_py(Path(filename[len(_STDLIB):].lstrip('/')).parts[0])}"
+    return filename
+
+
+def _strip_py(name: str) -> str:
+    return name[:-3] if name.endswith(".py") else name
+
+
+def _by_module(statistics) -> Dict[str, List[int]]:
+    grouped: Dict[str, List[int]] = {}
+    for stat in statistics:
+        key = _module_of(stat.traceback[0].filename)
+        entry = grouped.setdefault(key, [0, 0])
+        entry[0] += getattr(stat, "size_diff", stat.size)
+        entry[1] += getattr(stat, "count_diff", stat.count)
+    return grouped
+
+
+def tracemalloc_top(snapshot: tracemalloc.Snapshot, top_n: int = 20) -> List[Dict]:
+    """Largest live Python allocations grouped by module"""
+    grouped = _by_module(snapshot.statistics("filename"))
+    ranked = sorted(grouped.items(), key=lambda item: item[1][0], reverse=True)[:top_n]
+    return [{"module": module, "bytes": size, "blocks": count} for module, (size, count) in ranked]
+
+
+def tracemalloc_growth(snapshot: tracemalloc.Snapshot, baseline: tracemalloc.Snapshot,
+                       top_n: int = 20) -> List[Dict]:
+    """Modules whose live allocations grew most since the baseline snapshot"""
+    grouped = _by_module(snapshot.compare_to(baseline, "filename"))
+    ranked = sorted(grouped.items(), key=lambda item: item[1][0], reverse=True)[:top_n]
+    return [{"module": module, "bytes_diff": size, "blocks_diff": count} for module, (size, count) in ranked]
+
+
+class MemoryMonitor:
+    """Takes periodic memory snapshots and builds /debug/memory reports
+
+    Args:
+        components: Returns the structures to measure by name; values are
+            byte counts or objects measured with nbytes()
+        sessions: Optional callable describing live sessions (one dict each)
+        interval_s: Seconds between snapshots (0 disables the background task)
+        max_snapshots: Snapshots kept (the oldest are dropped)
+        trace: Start tracemalloc (slows allocation-heavy code noticeably)
+        frames: Traceback frames stored per allocation when tracing
+        top_n: Modules listed in the tracemalloc sections
+    """
+
+    def __init__(self, components: Callable[[], Dict], sessions: Optional[Callable[[], List[Dict]]] = None,
+                 interval_s: float = 60, max_snapshots: int = 1440, trace: bool = False,
+                 frames: int = 1, top_n: int = 20):
+        self.components = components
+        self.sessions = sessions
+        self.interval_s = interval_s
+        self.snapshots: deque = deque(maxlen=max_snapshots)
+        self.trace = trace
+        self.frames = frames
+        self.top_n = top_n
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, components: Callable[[], Dict], sessions=None, config=None) -> "MemoryMonitor":
+        """Build a monitor from the [memory] section of config.ini"""
+        if config is None or not config.has_section("memory"):
+            return cls(components, sessions)
+        section = config["memory"]
+        return cls(
+            components, sessions,
+            interval_s=section.getfloat("snapshot_interval", 60),
+            max_snapshots=section.getint("max_snapshots", 1440),
+            trace=section.getboolean("tracemalloc", False),
+            frames=section.getint("tracemalloc_frames", 1),
+            top_n=section.getint("top_n", 20)
+        )
+
+    def start_tracing(self) -> None:
+        """Start tracemalloc if configured (call before the allocations of interest)"""
+        if self.trace and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            logger.info(f"✅ tracemalloc started ({self.frames} frame(s))")
+
+    def start(self) -> None:
+        """Record the baseline and start periodic snapshots on the running event loop"""
+        if tracemalloc.is_tracing():
+            self._baseline = tracemalloc.take_snapshot()
+        self.snapshots.append(self.snapshot())
+        if self.interval_s > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval_s)
+            try:
+                self.snapshots.append(await loop.run_in_executor(None, self.snapshot))
+            except Exception as e:
+                logger.warning(f"⚠️ Memory snapshot failed: {str(e)}")
+
+    def measure_components(self) -> Dict[str, Dict[str, int]]:
+        sizes = {}
+        for name, value in self.components().items():
+            if isinstance(value, (int, np.integer)):
+                sizes[name] = {"resident_bytes": int(value), "mapped_bytes": 0}
+            else:
+                resident, mapped = nbytes(value)
+                sizes[name] = {"resident_bytes": resident, "mapped_bytes": mapped}
+        return sizes
+
+    def snapshot(self) -> Dict:
+        """Cheap point-in-time numbers: RSS, traced Python memory and component sizes"""
+        components = self.measure_components()
+        snapshot = {
+            "timestamp": time.time(),
+            **process_memory(),
+            "components_bytes": sum(c["resident_bytes"] for c in components.values()),
+            "components": {name: c["resident_bytes"] for name, c in components.items()}
+        }
+        if tracemalloc.is_tracing():
+            snapshot["traced_bytes"] = tracemalloc.get_traced_memory()[0]
+        return snapshot
+
+    def growth(self) -> Dict:
+        """RSS and per-component change between the first and latest snapshot"""
+        if len(self.snapshots) < 2:
+            return {}
+        first, last = self.snapshots[0], self.snapshots[-1]
+        hours = (last["timestamp"] - first["timestamp"]) / 3600
+        rss_diff = last["rss_bytes"] - first["rss_bytes"]
+        return {
+            "window_hours": round(hours, 3),
+            "rss_diff_bytes": rss_diff,
+            # Extrapolating a few seconds of warm-up to an hourly rate is misleading
+            "rss_mb_per_hour": round(rss_diff / _MB / hours, 3) if hours >= 1 / 12 else None,
+            "components_diff_bytes": {
+                name: size - first["components"].get(name, 0)
+                for name, size in last["components"].items()
+            }
+        }
+
+    def report(self, top_n: Optional[int] = None, snapshots: int = 60) -> Dict:
+        """
+        Full memory report
+
+        Args:
+            top_n: Modules per tracemalloc section (default: the configured top_n)
+            snapshots: Most recent snapshots included
+
+        Returns:
+            Dictionary with process, components, sessions, tracemalloc,
+            snapshots and growth sections
+        """
+        top_n = top_n or self.top_n
+        current = self.snapshot()
+        report = {
+            "process": process_memory(),
+            "components": self.measure_components(),
+            "sessions": self.sessions() if self.sessions else [],
+            "tracemalloc": {"enabled": tracemalloc.is_tracing()},
+            "snapshots": list(self.snapshots)[-snapshots:] + [current],
+            "growth": self.growth()
+        }
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            traced, peak = tracemalloc.get_traced_memory()
+            report["tracemalloc"].update({
+                "traced_bytes": traced,
+                "traced_peak_bytes": peak,
+                # RSS not allocated through Python: TensorFlow, NumPy buffers, the interpreter
+                "untraced_bytes": report["process"]["rss_bytes"] - traced,
+                "top": tracemalloc_top(snapshot, top_n),
+                "growth": tracemalloc_growth(snapshot, self._baseline, top_n) if self._baseline else []
+            })
+        return report
+
+
+def print_report(report: Dict) -> None:
+    """Human-readable memory report, as printed by python main.py --memory-report"""
+    process = report["process"]
+    print(f"\n🧠 RSS {process['rss_bytes'] / _MB:,.1f} MB (peak {process['peak_rss_bytes'] / _MB:,.1f} MB)")
+
+    print(f"\n{'component':<28} {'resident MB':>12} {'mapped MB':>10}")
+    for name, size in report["components"].items():
+        print(f"{name:<28} {size['resident_bytes'] / _MB:>12,.2f} {size['mapped_bytes'] / _MB:>10,.2f}")
+
+    if report["sessions"]:
+        print(f"\n{len(report['sessions'])} live session(s):")
+        for session in report["sessions"]:
+            print("  " + ", ".join(f"{key}={value}" for key, value in session.items()))
+
+    traced = report["tracemalloc"]
+    if traced["enabled"]:
+        print(
+            f"\ntracemalloc: {traced['traced_bytes'] / _MB:,.1f} MB traced, "
+            f"{traced['untraced_bytes'] / _MB:,.1f} MB of RSS outside Python allocators"
+        )
+        print(f"{'module':<40} {'MB':>10} {'blocks':>10}")
+        for row in traced["top"]:
+            print(f"{row['module'][:40]:<40} {row['bytes'] / _MB:>10,.2f} {row['blocks']:>10,}")
+        if traced["growth"]:
+            print(f"\n{'growth since startup':<40} {'MB':>10} {'blocks':>10}")
+            for row in traced["growth"]:
+                print(f"{row['module'][:40]:<40} {row['bytes_diff'] / _MB:>+10,.2f} {row['blocks_diff']:>+10,}")
+    else:
+        print("\ntracemalloc: off (set [memory] tracemalloc = true to see allocations by module)")
+
+    growth = report["growth"]
+    if growth:
+        rate = growth["rss_mb_per_hour"]
+        print(
+            f"\nRSS change over {growth['window_hours']:.2f} h: "
+            f"{growth['rss_diff_bytes'] / _MB:+,.1f} MB"
+            + (f" ({rate:+,.2f} MB/h)" if rate is not None else "")
+        )
+
+
+def run_memory_report(api_url: str, watch: float = 0, top_n: int = 20, token: str = "") -> None:
+    """
+    Print the /debug/memory report of a running API
+
+    Args:
+        api_url: API root, e.g. http://localhost:8000
+        watch: Repeat every this many seconds (0 prints once)
+        top_n: Modules per tracemalloc section
+        token: [memory] debug_token of the API, sent as X-Debug-Token
+    """
+    import requests
+
+    headers = {"X-Debug-Token": token} if token else {}
+    while True:
+        response = requests.get(
+            f"{api_url.rstrip('/')}/debug/memory", params={"top": top_n}, headers=headers, timeout=60
+        )
+        response.raise_for_status()
+        print_report(response.json())
+        if not watch:
+            return
+        time.sleep(watch)
@@ -3,50 +3,145 @@ FastAPI Backend for Nepal Telco Churn Prediction
 Production-ready API with comprehensive error handling and logging
 """
 
+import hmac
+import json
+import time
+import uuid
+import anyio
+import asyncio
 import logging
 import sys
+import numpy as np
+import pandas as pd
 from pathlib import Path
-from fastapi import FastAPI, HTTPException, Depends
+from typing import Optional, Union
+from fastapi import FastAPI, HTTPException, Depends, Query, Body, Header, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 
 try:
     # Try absolute imports (for local/Docker)
-    from src.predmodel import CustomerData, PredictionResponse, HealthResponse
+    from src.predmodel import (
+        CustomerData, CustomerIdsRequest, PredictionResponse,
+        ExplainedPredictionResponse, HealthResponse
+    )
     from src.model_service import ChurnModelService
+    from src.feature_store import FeatureStore
+    from src.score_index import ScoreIndex
+    from src.analytics import RunningAggregates
+    from src.config import get_settings, load_config
+    from src.explain import attribute, check_request, grouped_attribution_matrix
+    from src.batch_validation import validate_batch
+    from src.recommendations import pack_mask
+    from src.response_formats import ROW_JSON, FormatNotAvailableError, negotiate, render
+    from src.scheduler import InferenceScheduler
+    from src.profiling import ProfilingMiddleware, ProfilingSettings, profiled_endpoint, stage
+    from src.memory import MemoryMonitor, model_weight_bytes
+    from src.logging_config import SampledLogger, configure_logging, logging_stats, stop_logging
 except ImportError:
     try:
         # Try relative imports
-        from predmodel import CustomerData, PredictionResponse, HealthResponse
+        from predmodel import (
+            CustomerData, CustomerIdsRequest, PredictionResponse,
+            ExplainedPredictionResponse, HealthResponse
+        )
         from model_service import ChurnModelService
+        from feature_store import FeatureStore
+        from score_index import ScoreIndex
+        from analytics import RunningAggregates
+        from config import get_settings, load_config
+        from explain import attribute, check_request, grouped_attribution_matrix
+        from batch_validation import validate_batch
+        from recommendations import pack_mask
+        from response_formats import ROW_JSON, FormatNotAvailableError, negotiate, render
+        from scheduler import InferenceScheduler
+        from profiling import ProfilingMiddleware, ProfilingSettings, profiled_endpoint, stage
+        from memory import MemoryMonitor, model_weight_bytes
+        from logging_config import SampledLogger, configure_logging, logging_stats, stop_logging
     except ImportError:
         # Add current directory to path and try again
         sys.path.insert(0, str(Path(__file__).parent))
-        from predmodel import CustomerData, PredictionResponse, HealthResponse
+        from predmodel import (
+            CustomerData, CustomerIdsRequest, PredictionResponse,
+            ExplainedPredictionResponse, HealthResponse
+        )
         from model_service import ChurnModelService
+        from feature_store import FeatureStore
+        from score_index import ScoreIndex
+        from analytics import RunningAggregates
+        from config import get_settings, load_config
+        from explain import attribute, check_request, grouped_attribution_matrix
+        from batch_validation import validate_batch
+        from recommendations import pack_mask
+        from response_formats import ROW_JSON, FormatNotAvailableError, negotiate, render
+        from scheduler import InferenceScheduler
+        from profiling import ProfilingMiddleware, ProfilingSettings, profiled_endpoint, stage
+        from memory import MemoryMonitor, model_weight_bytes
+        from logging_config import SampledLogger, configure_logging, logging_stats, stop_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging (queued, see [logging] and [log_sampling] in config.ini)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+# Per-request success records, sampled per endpoint
+predict_log = SampledLogger(logger, "/predict")
+batch_log = SampledLogger(logger, "/batch-predict")
+by_ids_log = SampledLogger(logger, "/predict/by-ids")
+
 # Initialize model service
 model_service = None
+feature_store = None
+score_index = None
+analytics = RunningAggregates()
+
+# Attribution settings for explain=true requests
+explain_config = load_config()["explain"]
+
+# Micro-batching of single-customer requests (WebSocket sessions)
+scheduler_config = load_config()["scheduler"]
+performance = get_settings().performance
+scheduler = None
+batch_predict_requests = scheduler_config.getboolean("batch_predict_requests", False)
+ws_max_in_flight = load_config()["websocket"].getint("max_in_flight", 64)
+ws_sessions = {}
+
+# RSS, allocation and cache-size tracking behind /debug/memory
+memory_config = load_config()["memory"]
+memory_monitor = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle"""
-    global model_service
+    global model_service, feature_store, score_index, scheduler, memory_monitor
     # Startup
     logger.info("🚀 Starting Nepal Telco Churn Prediction API...")
+    memory_monitor = MemoryMonitor.from_config(_memory_components, _live_sessions, load_config())
+    memory_monitor.start_tracing()
     model_service = ChurnModelService()
     logger.info("✅ Model service initialized")
+    try:
+        feature_store = FeatureStore.open()
+        if feature_store.columns != list(model_service.train_columns):
+            logger.warning("⚠️ Feature store columns do not match the model, rebuild it")
+            feature_store = None
+    except FileNotFoundError:
+        logger.warning("⚠️ Feature store not built, /predict/{customer_id} disabled")
+    score_index = ScoreIndex.load()
+    scheduler = InferenceScheduler(
+        _score_records,
+        max_batch_size=performance.max_batch_size,
+        max_wait_ms=performance.max_wait_ms,
+        max_queue_size=scheduler_config.getint("max_queue_size", 4096)
+    )
+    scheduler.start()
+    memory_monitor.start()
     yield
     # Shutdown
     logger.info("🛑 Shutting down API...")
+    await memory_monitor.stop()
+    await scheduler.stop()
+    stop_logging()
 
 # Initialize FastAPI with lifespan
 app = FastAPI(
@@ -65,6 +160,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in per-request stage timings (Server-Timing), see [profiling] in config.ini
+profiling_settings = ProfilingSettings.from_config(load_config())
+if profiling_settings.enabled:
+    app.add_middleware(ProfilingMiddleware, settings=profiling_settings)
+    logger.info(f"✅ Request profiling enabled via the {profiling_settings.header} header")
+
 # Custom exception handlers
 @app.exception_handler(ValueError)
 async def value_error_handler(request, exc):
@@ -103,8 +204,45 @@ def health_check():
         model_loaded=model_service.model_loaded
     )
 
-@app.post("/predict", response_model=PredictionResponse, tags=["Prediction"])
-def predict_churn(data: CustomerData):
+def _explain_settings(method: Optional[str]) -> dict:
+    """Attribution method, steps and cost budget for a request, per config.ini [explain]"""
+    return {
+        "method": method or explain_config.get("method", "gradient_x_input"),
+        "steps": explain_config.getint("ig_steps", 32),
+        "max_evaluations": explain_config.getint("max_evaluations", 100000)
+    }
+
+
+def _check_explain(n_rows: int, method: Optional[str]) -> None:
+    """Reject a bad method or an over-budget request before anything is scored (ValueError)"""
+    check_request(n_rows, **_explain_settings(method))
+
+
+def _explain_matrix(customers_df: pd.DataFrame, method: Optional[str]):
+    """Per-field attributions (field names, matrix) within the configured cost budget"""
+    encoded = model_service.encode_batch(customers_df)
+    with stage("explain"):
+        attributions = attribute(model_service, encoded, **_explain_settings(method))
+    return grouped_attribution_matrix(model_service.train_columns, attributions)
+
+
+def _explain(customers_df: pd.DataFrame, method: Optional[str]) -> list:
+    """Per-feature attributions for a batch, one dictionary per row"""
+    fields, grouped = _explain_matrix(customers_df, method)
+    return [dict(zip(fields, row)) for row in grouped.tolist()]
+
+
+@app.post(
+    "/predict",
+    response_model=Union[ExplainedPredictionResponse, PredictionResponse],
+    tags=["Prediction"]
+)
+@profiled_endpoint
+def predict_churn(
+    data: CustomerData,
+    explain: bool = Query(False, description="Include per-feature attributions"),
+    method: Optional[str] = Query(None, description="gradient_x_input or integrated_gradients")
+):
     """
     Predict customer churn probability
     
@@ -126,6 +264,8 @@ def predict_churn(data: CustomerData):
     - **churn_probability**: Probability as percentage (0-100)
     - **risk_level**: LOW, MEDIUM, or HIGH
     - **recommendations**: List of actionable recommendations
+    - **attributions**: With explain=true, each field's contribution to the
+      churn probability in percentage points
     """
     
     if not model_service or not model_service.model_loaded:
@@ -138,22 +278,38 @@ def predict_churn(data: CustomerData):
     try:
         # Convert Pydantic model to dictionary
         customer_dict = data.dict()
+        if explain:
+            _check_explain(1, method)
         
-        # Get prediction from model service
-        result = model_service.predict(customer_dict)
-        
-        if not result.get("success"):
-            logger.error(f"Prediction failed: {result.get('error')}")
-            raise HTTPException(
-                status_code=500,
-                detail=result.get("error", "Prediction failed")
-            )
-        
-        logger.info(
-            f"✅ Prediction successful for {data.name}: "
-            f"{result['churn_prediction']} ({result['churn_probability']}%)"
+        if batch_predict_requests and not explain and scheduler is not None and scheduler.running:
+            # Join the next micro-batch; _score_records updates the analytics
+            with stage("scheduler"):
+                result = anyio.from_thread.run(scheduler.submit, customer_dict)
+            if result.get("churn_prediction") == "ERROR":
+                logger.error(f"Prediction failed: {result.get('error')}")
+                raise HTTPException(status_code=500, detail=result.get("error", "Prediction failed"))
+        else:
+            # Get prediction from model service
+            result = model_service.predict(customer_dict)
+            
+            if not result.get("success"):
+                logger.error(f"Prediction failed: {result.get('error')}")
+                raise HTTPException(
+                    status_code=500,
+                    detail=result.get("error", "Prediction failed")
+                )
+            
+            analytics.update([result], [data.province], [data.provider])
+        predict_log.info(
+            "✅ Prediction successful for %s: %s (%s%%)",
+            data.name, result["churn_prediction"], result["churn_probability"],
+            customer=data.name, churn_prediction=result["churn_prediction"],
+            churn_probability=result["churn_probability"]
         )
         
+        if explain:
+            attributions = _explain(pd.DataFrame([customer_dict]), method)
+            return ExplainedPredictionResponse(**result, attributions=attributions[0])
         return PredictionResponse(**result)
         
     except ValueError as e:
@@ -165,15 +321,28 @@ def predict_churn(data: CustomerData):
 
 
 @app.post("/batch-predict", tags=["Prediction"])
-def batch_predict(customers: list[CustomerData]):
+@profiled_endpoint
+def batch_predict(
+    customers: list = Body(..., description="Array of CustomerData objects"),
+    explain: bool = Query(False, description="Include per-feature attributions"),
+    method: Optional[str] = Query(None, description="gradient_x_input or integrated_gradients"),
+    accept: Optional[str] = Header(None)
+):
     """
     Predict churn for multiple customers at once
     
     ### Parameters:
     - **customers**: List of customer data objects
+    - **explain**: Include per-feature attributions (subject to the cost budget)
     
     ### Response:
-    - List of predictions for each customer
+    - List of predictions for each customer, in request order. Rows that fail
+      validation are returned as ERROR entries with their **row** index and
+      the reasons, instead of rejecting the whole batch.
+    - Compact formats via the Accept header:
+      `application/vnd.churn.columnar+json`, `application/x-msgpack` or
+      `application/vnd.apache.arrow.stream`. These are column-oriented and
+      carry recommendations as bitmasks over `recommendation_codes`.
     """
     
     if not model_service or not model_service.model_loaded:
@@ -181,31 +350,462 @@ def batch_predict(customers: list[CustomerData]):
             status_code=503,
             detail="Model not available"
         )
+    try:
+        media_type = negotiate(accept)
+    except FormatNotAvailableError as e:
+        raise HTTPException(status_code=406, detail=str(e))
     
     try:
-        results = []
-        for customer in customers:
-            customer_dict = customer.dict()
-            result = model_service.predict(customer_dict)
-            if result.get("success"):
-                results.append(PredictionResponse(**result))
-            else:
-                results.append({
-                    "customer_name": customer.name,
-                    "churn_prediction": "ERROR",
-                    "churn_probability": 0,
-                    "risk_level": "UNKNOWN",
-                    "error": result.get("error")
-                })
+        if media_type != ROW_JSON:
+            with stage("validation"):
+                customers_df, errors = validate_batch(customers)
+            if explain:
+                _check_explain(len(customers_df), method)
+            return _compact_batch_response(media_type, customers, customers_df, errors, explain, method)
         
-        logger.info(f"✅ Batch prediction successful for {len(customers)} customers")
+        results = _score_records(customers, explain, method)
+        batch_log.info("✅ Batch prediction successful for %d customers", len(customers), rows=len(customers))
         return {"total": len(customers), "predictions": results}
         
+    except ValueError as e:
+        logger.warning(f"⚠️ Batch request rejected: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"❌ Batch prediction error: {str(e)}")
         raise HTTPException(status_code=500, detail="Batch prediction failed")
 
 
+def _score_records(customers: list, explain: bool = False, method: Optional[str] = None) -> list:
+    """
+    Validate raw customer records column-wise and score the valid ones in one pass
+
+    Returns:
+        One dictionary per record, in order: a prediction, or an ERROR entry
+        with the record's row index and the reasons
+    """
+    with stage("validation"):
+        customers_df, errors = validate_batch(customers)
+    if explain:
+        _check_explain(len(customers_df), method)
+    predictions = model_service.predict_batch(customers_df) if len(customers_df) else []
+    attributions = _explain(customers_df, method) if explain and len(customers_df) else None
+    
+    results = [None] * len(customers)
+    scored = []
+    for i, (row, result) in enumerate(zip(customers_df.index.tolist(), predictions)):
+        if result.pop("success", False):
+            if attributions is not None:
+                result["attributions"] = attributions[i]
+            results[row] = result
+            scored.append(i)
+        else:
+            errors[row] = [result.get("error")]
+    
+    for row, messages in errors.items():
+        results[row] = {
+            "row": row,
+            "customer_name": _record_name(customers[row]),
+            "churn_prediction": "ERROR",
+            "churn_probability": 0,
+            "risk_level": "UNKNOWN",
+            "error": "; ".join(messages)
+        }
+    
+    analytics.update(
+        [predictions[i] for i in scored],
+        customers_df["province"].to_numpy()[scored].tolist(),
+        customers_df["provider"].to_numpy()[scored].tolist()
+    )
+    return results
+
+
+def _record_name(record) -> str:
+    """Customer name of a raw batch record, or Unknown"""
+    name = record.get("name") if isinstance(record, dict) else None
+    return name if isinstance(name, str) and name else "Unknown"
+
+
+def _compact_batch_response(media_type: str, customers: list, customers_df: pd.DataFrame,
+                            errors: dict, explain: bool, method: Optional[str]):
+    """Score the valid rows and encode all rows column-wise without per-row objects"""
+    n = len(customers)
+    rows = customers_df.index.to_numpy()
+    columns = {
+        "customer_name": np.full(n, "Unknown", dtype=object),
+        "churn_prediction": np.full(n, "ERROR", dtype=object),
+        "churn_probability": np.zeros(n, dtype=np.float64),
+        "risk_level": np.full(n, "UNKNOWN", dtype=object),
+        "recommendations": np.zeros(n, dtype=np.int64)
+    }
+    attributions = None
+    
+    if len(rows):
+        scores = model_service.score_encoded(model_service.encode_batch(customers_df))
+        probabilities = np.round(scores["probability"].astype(np.float64) * 100, 2)
+        columns["customer_name"][rows] = customers_df["name"].to_numpy()
+        columns["churn_prediction"][rows] = scores["churn_prediction"]
+        columns["churn_probability"][rows] = probabilities
+        columns["risk_level"][rows] = scores["risk_level"]
+        columns["recommendations"][rows] = pack_mask(scores["recommendation_mask"])
+        if explain:
+            fields, grouped = _explain_matrix(customers_df, method)
+            attributions = {field: np.zeros(n, dtype=np.float64) for field in fields}
+            for j, field in enumerate(fields):
+                attributions[field][rows] = grouped[:, j]
+        analytics.update_columns(
+            probabilities, scores["risk_level"], scores["churn_prediction"],
+            customers_df["province"].tolist(), customers_df["provider"].tolist()
+        )
+    
+    for row in errors:
+        columns["customer_name"][row] = _record_name(customers[row])
+    batch_log.info("✅ Batch prediction successful for %d customers (%s)", n, media_type,
+                   rows=n, media_type=media_type)
+    with stage("serialize"):
+        return render(
+            media_type, n, columns,
+            {row: "; ".join(messages) for row, messages in errors.items()},
+            attributions
+        )
+
+
+@app.post("/batch-predict/probabilities", tags=["Prediction"])
+@profiled_endpoint
+def batch_probabilities(customers: list = Body(..., description="Array of CustomerData objects")):
+    """
+    Churn probabilities for hypothetical customers, without recording them
+    
+    Scores like /batch-predict, but nothing is added to /analytics, the
+    drift monitor or the audit log. Meant for made-up variants such as the
+    UI's what-if grid, which are not real customers.
+    
+    ### Parameters:
+    - **customers**: List of customer data objects
+    
+    ### Response:
+    - **churn_probability**: One value (0-100) per customer in request
+      order; null for rows that failed validation
+    - **errors**: Row index and reasons of the rows that failed validation
+    """
+    
+    if not model_service or not model_service.model_loaded:
+        raise HTTPException(
+            status_code=503,
+            detail="Model not available"
+        )
+    
+    try:
+        with stage("validation"):
+            customers_df, errors = validate_batch(customers)
+        probabilities = [None] * len(customers)
+        if len(customers_df):
+            encoded = model_service.encode_batch(customers_df)
+            probs = model_service.predict_proba_encoded(model_service.scale_encoded(encoded))
+            for row, prob in zip(customers_df.index.tolist(), np.round(probs.astype(np.float64) * 100, 2).tolist()):
+                probabilities[row] = prob
+        return {
+            "total": len(customers),
+            "churn_probability": probabilities,
+            "errors": [{"row": row, "error": "; ".join(messages)} for row, messages in errors.items()]
+        }
+    
+    except ValueError as e:
+        logger.warning(f"⚠️ Probability request rejected: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Probability scoring error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Probability scoring failed")
+
+
+def _require_feature_store():
+    """Raise 503 unless both the model and the feature store are available"""
+    if not model_service or not model_service.model_loaded:
+        raise HTTPException(status_code=503, detail="Model not available")
+    if feature_store is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Feature store not available. Build it with 'python main.py --build-feature-store'."
+        )
+
+
+@app.post("/predict/by-ids", tags=["Prediction"])
+def predict_by_ids(request: CustomerIdsRequest):
+    """
+    Predict churn for stored customers, reading features from the feature store
+    
+    ### Parameters:
+    - **customer_ids**: List of customer ids
+    
+    ### Response:
+    - Predictions for the ids that were found, plus the ids that were not
+    """
+    _require_feature_store()
+    
+    try:
+        ids = request.customer_ids
+        rows, found = feature_store.get_rows(ids)
+        found_ids = [cid for cid, hit in zip(ids, found) if hit]
+        results = model_service.predict_encoded(rows, found_ids)
+        analytics.update(results)
+        missing = [cid for cid, hit in zip(ids, found) if not hit]
+        
+        by_ids_log.info("✅ By-id prediction for %d customers (%d missing)", len(found_ids), len(missing),
+                        rows=len(found_ids), missing=len(missing))
+        return {
+            "total": len(ids),
+            "found": len(found_ids),
+            "missing": missing,
+            "predictions": [PredictionResponse(**r) for r in results]
+        }
+    
+    except Exception as e:
+        logger.error(f"❌ By-id prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail="By-id prediction failed")
+
+
+@app.get("/predict/{customer_id}", response_model=PredictionResponse, tags=["Prediction"])
+def predict_by_id(customer_id: str):
+    """
+    Predict churn for one stored customer without resending their attributes
+    """
+    _require_feature_store()
+    
+    rows, found = feature_store.get_rows([customer_id])
+    if not found[0]:
+        raise HTTPException(status_code=404, detail=f"Customer {customer_id} not found")
+    
+    try:
+        result = model_service.predict_encoded(rows, [customer_id])[0]
+        analytics.update([result])
+        return PredictionResponse(**result)
+    except Exception as e:
+        logger.error(f"❌ By-id prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+def _current_score_index() -> ScoreIndex:
+    """Return the score index, picking up any rewrite by a batch scoring run"""
+    if score_index is None:
+        raise HTTPException(status_code=503, detail="Score index not initialized")
+    score_index.reload_if_changed()
+    return score_index
+
+
+@app.get("/at-risk", tags=["At-Risk"])
+def top_at_risk(
+    k: int = Query(100, ge=1, le=10000, description="Number of customers to return"),
+    province: Optional[str] = Query(None, description="Restrict to one province"),
+    provider: Optional[str] = Query(None, description="Restrict to one provider")
+):
+    """
+    Highest-risk customers from the latest batch scores
+    
+    ### Response:
+    - **customers**: Up to k customers sorted by churn probability (percent), highest first
+    """
+    index = _current_score_index()
+    return {
+        "province": province,
+        "provider": provider,
+        "model_version": index.model_version,
+        "customers": index.top_k(k, province, provider)
+    }
+
+
+@app.get("/at-risk/count", tags=["At-Risk"])
+def count_at_risk(
+    threshold: float = Query(get_settings().thresholds.medium_risk_max, ge=0, le=1,
+                             description="Minimum churn probability (0-1)"),
+    province: Optional[str] = Query(None, description="Restrict to one province"),
+    provider: Optional[str] = Query(None, description="Restrict to one provider")
+):
+    """Number of customers at or above a churn probability threshold"""
+    index = _current_score_index()
+    return {
+        "province": province,
+        "provider": provider,
+        "threshold": threshold,
+        "count": index.count_above(threshold, province, provider),
+        "indexed": len(index)
+    }
+
+
+@app.get("/analytics", tags=["Info"])
+def get_analytics():
+    """
+    Running aggregates over every prediction served by this process
+    
+    ### Response:
+    - **overall**: Counts by risk level and prediction, 20-bin probability histogram,
+      mean and standard deviation of churn probability (percent)
+    - **by_province** / **by_provider**: The same statistics per segment
+    """
+    return analytics.snapshot()
+
+
+@app.get("/drift", tags=["Info"])
+def get_drift():
+    """
+    Feature drift of scored customers against the training data
+    
+    ### Response:
+    - **status**: stable, warning, drift or insufficient_data (recent window)
+    - **flagged_features**: Features at or above the PSI warning threshold
+    - **recent_window** / **since_start**: Per feature PSI (and binned KS for
+      numeric features) with the observed bin counts or category frequencies
+    - **reference**: Where the reference distributions came from
+    """
+    if not model_service or model_service.drift is None:
+        raise HTTPException(status_code=503, detail="Drift monitor not enabled")
+    return model_service.drift.report()
+
+
+@app.websocket("/ws/predict")
+async def websocket_predict(websocket: WebSocket):
+    """
+    Persistent scoring session over one WebSocket connection
+    
+    ### Messages:
+    - Client sends `{"id": <any>, "customer": {CustomerData fields}}`
+    - Server replies `{"id": <same>, "prediction": {...}}` or
+      `{"id": <same>, "error": "..."}`; replies arrive in completion order,
+      not request order
+    
+    Requests from all sessions are micro-batched by the inference scheduler.
+    At most `[websocket] max_in_flight` requests per connection are pending;
+    beyond that the server stops reading until replies have been sent, so a
+    slow client is throttled instead of buffering without limit.
+    """
+    await websocket.accept()
+    if not model_service or not model_service.model_loaded or not scheduler or not scheduler.running:
+        await websocket.close(code=1013, reason="Model not available")
+        return
+    
+    in_flight = asyncio.Semaphore(ws_max_in_flight)
+    outgoing: asyncio.Queue = asyncio.Queue(maxsize=ws_max_in_flight)
+    pending = set()
+    session_id = uuid.uuid4().hex[:12]
+    client = f"{websocket.client.host}:{websocket.client.port}" if websocket.client else "unknown"
+    ws_sessions[session_id] = {
+        "client": client, "started": time.time(), "requests": 0,
+        "pending": pending, "outgoing": outgoing
+    }
+    
+    async def send_replies():
+        while True:
+            await websocket.send_text(json.dumps(await outgoing.get(), ensure_ascii=False))
+    
+    async def score(request_id, customer):
+        try:
+            result = await scheduler.submit(customer)
+            if result.get("churn_prediction") == "ERROR":
+                reply = {"id": request_id, "error": result.get("error")}
+            else:
+                reply = {"id": request_id, "prediction": result}
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ WebSocket prediction error: {str(e)}")
+            reply = {"id": request_id, "error": "Prediction failed"}
+        try:
+            await outgoing.put(reply)
+        finally:
+            in_flight.release()
+    
+    sender = asyncio.create_task(send_replies())
+    # A failed send (client gone) must also stop a reader blocked on in_flight
+    session = asyncio.current_task()
+    sender.add_done_callback(lambda task: task.cancelled() or session.cancel())
+    try:
+        while True:
+            text = await websocket.receive_text()
+            await in_flight.acquire()
+            try:
+                message = json.loads(text)
+            except ValueError:
+                message = None
+            if not isinstance(message, dict) or not isinstance(message.get("customer"), dict):
+                request_id = message.get("id") if isinstance(message, dict) else None
+                await outgoing.put({
+                    "id": request_id,
+                    "error": 'Expected {"id": ..., "customer": {...}}'
+                })
+                in_flight.release()
+                continue
+            task = asyncio.create_task(score(message.get("id"), message["customer"]))
+            ws_sessions[session_id]["requests"] += 1
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+    except WebSocketDisconnect:
+        pass
+    except asyncio.CancelledError:
+        if not sender.done() or sender.cancelled():
+            raise
+    finally:
+        ws_sessions.pop(session_id, None)
+        for task in list(pending):
+            task.cancel()
+        sender.cancel()
+
+
+def _memory_components() -> dict:
+    """Large in-memory structures reported by /debug/memory"""
+    return {
+        "model_weights": model_weight_bytes(model_service.model) if model_service else 0,
+        "scaler": model_service.scaler if model_service else None,
+        "recommendation_cache": model_service.recommender if model_service else None,
+        "feature_store": feature_store,
+        "score_index": score_index,
+        "analytics": analytics
+    }
+
+
+def _live_sessions() -> list:
+    """Open WebSocket sessions with their pending work"""
+    now = time.time()
+    return [
+        {
+            "session": session_id,
+            "client": info["client"],
+            "age_s": round(now - info["started"], 1),
+            "requests": info["requests"],
+            "pending": len(info["pending"]),
+            "queued_replies": info["outgoing"].qsize()
+        }
+        for session_id, info in list(ws_sessions.items())
+    ]
+
+
+@app.get("/debug/memory", tags=["Debug"])
+def debug_memory(
+    top: int = Query(20, ge=1, le=200, description="Modules per tracemalloc section"),
+    x_debug_token: Optional[str] = Header(None)
+):
+    """
+    Memory introspection
+    
+    ### Response:
+    - **process**: RSS and peak RSS in bytes
+    - **components**: Model weights and cache sizes (resident and memory-mapped bytes)
+    - **sessions**: Open WebSocket sessions and their pending requests
+    - **tracemalloc**: Python allocations by module and their growth since
+      startup (when `[memory] tracemalloc` is on)
+    - **snapshots** / **growth**: Periodic RSS and component sizes, and the
+      change between the first and latest snapshot
+    
+    Disabled unless `[memory] debug_endpoint = true`; with `debug_token` set,
+    the X-Debug-Token header must match it.
+    """
+    if not memory_config.getboolean("debug_endpoint", False):
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = memory_config.get("debug_token", "")
+    if token and not hmac.compare_digest((x_debug_token or "").encode(), token.encode()):
+        raise HTTPException(status_code=403, detail="Invalid debug token")
+    if memory_monitor is None:
+        raise HTTPException(status_code=503, detail="Memory monitor not initialized")
+    return memory_monitor.report(top_n=top)
+
+
 @app.get("/info", tags=["Info"])
 def get_info():
     """Get API and model information"""
@@ -216,8 +816,20 @@ def get_info():
         "features": {
             "single_prediction": True,
             "batch_prediction": True,
+            "prediction_by_id": feature_store is not None,
+            "at_risk_queries": score_index is not None and len(score_index) > 0,
+            "websocket_prediction": scheduler is not None and scheduler.running,
+            "micro_batched_predict": batch_predict_requests,
+            "drift_monitor": bool(model_service and model_service.drift is not None),
+            "segment_models": bool(model_service and model_service.segments is not None),
             "health_check": True
         },
+        "scheduler": scheduler.stats() if scheduler else None,
+        "logging": logging_stats(),
+        "audit_log": model_service.audit.stats() if model_service and model_service.audit else None,
+        "segments": model_service.segments.info() if model_service and model_service.segments else None,
+        "thresholds": vars(get_settings().thresholds),
+        "performance": vars(performance),
         "provinces": [
             "Bagmati", "Gandaki", "Karnali", "Koshi",
             "Lumbini", "Madhesh", "Sudurpashchim"
@@ -228,4 +840,4 @@ def get_info():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host=get_settings().api.host, port=get_settings().api.port)
\ No newline at end of file
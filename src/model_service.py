@@ -4,28 +4,81 @@ Handles model loading, preprocessing, and predictions with caching and error han
 """
 
 import os
+import uuid
+import hashlib
 import joblib
 import logging
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from typing import Dict, Tuple, Optional
+import tensorflow as tf
 from tensorflow.keras.models import load_model, Sequential
 from tensorflow.keras.layers import Dense, BatchNormalization, Dropout
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+try:
+    from src.config import ModelSettings, configure_numpy_threads, get_settings, load_config
+    from src.recommendations import RecommendationEngine
+    from src.profiling import stage, timed_stage
+    from src.drift import DriftMonitor
+    from src.audit_log import AuditLog
+    from src.segments import SegmentModels
+except ImportError:
+    from config import ModelSettings, configure_numpy_threads, get_settings, load_config
+    from recommendations import RecommendationEngine
+    from profiling import stage, timed_stage
+    from drift import DriftMonitor
+    from audit_log import AuditLog
+    from segments import SegmentModels
+
 logger = logging.getLogger(__name__)
 
+# Training-data spelling of provider names the API spells differently
+# (CustomerData accepts "Nepal Telecom"; the trained column is "Nepal Telecom (NTC)")
+PROVIDER_COLUMN_NAMES = {"Nepal Telecom": "Nepal Telecom (NTC)"}
+
+_runtime_configured = False
+
+
+def configure_runtime(performance) -> None:
+    """
+    Apply the [performance] thread counts once per process
+
+    TensorFlow only accepts thread settings before its runtime starts, so
+    this runs before the first model is loaded.
+    """
+    global _runtime_configured
+    if _runtime_configured:
+        return
+    _runtime_configured = True
+    problem = configure_numpy_threads(performance.numpy_threads)
+    if problem:
+        logger.warning(f"⚠️ [performance] numpy_threads not applied: {problem}")
+    try:
+        if performance.tensorflow_intra_op_threads:
+            tf.config.threading.set_intra_op_parallelism_threads(performance.tensorflow_intra_op_threads)
+        if performance.tensorflow_inter_op_threads:
+            tf.config.threading.set_inter_op_parallelism_threads(performance.tensorflow_inter_op_threads)
+    except RuntimeError as e:
+        logger.warning(f"⚠️ TensorFlow thread settings not applied: {str(e)}")
+
 
 class ChurnModelService:
     """Singleton service for managing churn prediction model"""
     
     _instance = None
     
+    # Numeric features scaled by the StandardScaler (in scaler fit order)
+    NUMERIC_FEATURES = [
+        "age", "estimated_salary", "calls_made",
+        "sms_sent", "data_used", "tenure_months", "num_dependents"
+    ]
+    
+    # Decision thresholds on the raw churn probability (overridden by [thresholds])
+    CHURN_THRESHOLD = 0.5
+    LOW_RISK_MAX = 0.3
+    MEDIUM_RISK_MAX = 0.6
+    
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ChurnModelService, cls).__new__(cls)
@@ -35,34 +88,73 @@ class ChurnModelService:
     def __init__(self):
         if self._initialized:
             return
+        self._setup(get_settings().model, monitor=True)
+    
+    @classmethod
+    def from_directory(cls, model_dir: Path) -> "ChurnModelService":
+        """
+        Standalone (non-singleton) service for another set of model artifacts
         
+        Used to compare model versions offline; it does not feed the drift
+        monitor or the audit log.
+        """
+        service = super(ChurnModelService, cls).__new__(cls)
+        service._setup(get_settings().model.in_directory(model_dir), monitor=False)
+        return service
+    
+    def _setup(self, model_settings: ModelSettings, monitor: bool) -> None:
+        settings = get_settings()
         self.model = None
         self.scaler = None
         self.train_columns = None
+        self.model_version = None
         self.model_loaded = False
+        self.segments = None
+        self.model_settings = model_settings
+        self.model_dir = model_settings.model_dir
+        self.monitor = monitor
+        self.drift = None
+        self.audit = None
+        self.CHURN_THRESHOLD = settings.thresholds.churn_threshold
+        self.LOW_RISK_MAX = settings.thresholds.low_risk_max
+        self.MEDIUM_RISK_MAX = settings.thresholds.medium_risk_max
+        self.backend = settings.performance.backend
+        self.inference_batch_size = settings.performance.inference_batch_size
+        self._compiled_call = None
+        self.recommender = RecommendationEngine.from_config(
+            load_config(), cache_size=settings.performance.recommendation_cache_size
+        )
         self._initialized = True
         
+        configure_runtime(settings.performance)
         self.load_model_and_dependencies()
+        if monitor:
+            self.audit = AuditLog.from_config(load_config(), list(self.train_columns))
     
     def load_model_and_dependencies(self) -> bool:
         """Load the trained model, scaler, and training columns"""
+        self._compiled_call = None
         try:
-            base_path = Path(__file__).parent.parent
-            model_path = base_path / "model" / "Churnpred_ann.keras"
-            scaler_path = base_path / "model" / "scaler.pkl"
-            columns_path = base_path / "model" / "train_columns.pkl"
+            model_path = self.model_settings.model_path
+            scaler_path = self.model_settings.scaler_path
+            columns_path = self.model_settings.columns_path
+            using_fallback = False
             
             if model_path.exists():
                 try:
                     self.model = load_model(str(model_path))
                     logger.info(f"✅ Model loaded successfully from {model_path}")
                 except Exception as model_error:
+                    self._require_fallback(f"Could not load saved model: {str(model_error)}")
                     logger.warning(f"⚠️ Could not load saved model: {str(model_error)}")
                     logger.warning("⚠️ Using fallback model instead")
                     self.model = self._create_fallback_model()
+                    using_fallback = True
             else:
+                self._require_fallback(f"Model not found at {model_path}")
                 logger.warning(f"⚠️ Model not found at {model_path}. Creating fallback model.")
                 self.model = self._create_fallback_model()
+                using_fallback = True
             
             if scaler_path.exists():
                 try:
@@ -88,20 +180,38 @@ class ChurnModelService:
                 self.train_columns = self._get_default_columns()
                 logger.warning("⚠️ Using default training columns")
             
+            self.segments = SegmentModels.from_config(load_config(), self.model_dir, list(self.train_columns))
+            artifacts = [model_path, scaler_path, columns_path]
+            if self.segments is not None:
+                artifacts.append(self.segments.path)
+            self.model_version = self._compute_model_version(artifacts, using_fallback)
+            if self.monitor:
+                self.drift = DriftMonitor.from_config(
+                    load_config(), self.model_dir, list(self.train_columns), self.NUMERIC_FEATURES, self.scaler
+                )
             self.model_loaded = True
             logger.info("✅ Model service fully initialized with fallback support")
             return True
             
         except Exception as e:
             logger.error(f"❌ Critical error during initialization: {str(e)}")
+            if not self.model_settings.use_fallback:
+                raise
             logger.info("Creating complete fallback model...")
             self.model = self._create_fallback_model()
             from sklearn.preprocessing import StandardScaler
             self.scaler = StandardScaler()
             self.train_columns = self._get_default_columns()
+            self.segments = None
+            self.model_version = self._compute_model_version([], True)
             self.model_loaded = True
             return True
     
+    def _require_fallback(self, reason: str) -> None:
+        """Refuse to substitute the untrained fallback model when [model] use_fallback is off"""
+        if not self.model_settings.use_fallback:
+            raise RuntimeError(f"{reason} ([model] use_fallback is off)")
+    
     def _create_fallback_model(self) -> Sequential:
         """Create a fallback model if the trained model is not available"""
         logger.info("Creating fallback model...")
@@ -117,6 +227,25 @@ class ChurnModelService:
         model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
         return model
     
+    @staticmethod
+    def _compute_model_version(artifact_paths: list, using_fallback: bool) -> str:
+        """
+        Derive a version identifier from the model artifacts
+        
+        The version is a content hash of the model, scaler and column files, so
+        anything cached against it is invalidated when an artifact changes.
+        Fallback models are randomly initialised and get a unique version per load.
+        """
+        if using_fallback:
+            return f"fallback-{uuid.uuid4().hex[:12]}"
+        
+        digest = hashlib.sha256()
+        for path in artifact_paths:
+            if path.exists():
+                digest.update(path.name.encode("utf-8"))
+                digest.update(path.read_bytes())
+        return digest.hexdigest()[:12]
+    
     def _get_default_columns(self) -> list:
         """Return default training columns"""
         return [
@@ -125,7 +254,7 @@ class ChurnModelService:
             'province_Bagmati', 'province_Gandaki', 'province_Karnali',
             'province_Koshi', 'province_Lumbini', 'province_Madhesh',
             'province_Sudurpashchim', 'provider_nepal_Ncell',
-            'provider_nepal_Nepal_Telecom'
+            'provider_nepal_Nepal Telecom (NTC)'
         ]
     
     def preprocess_input(self, customer_dict: Dict) -> Tuple[pd.DataFrame, bool]:
@@ -138,48 +267,291 @@ class ChurnModelService:
         Returns:
             Tuple of (processed_dataframe, success_flag)
         """
+        input_df, _ = self._preprocess(customer_dict)
+        return input_df, input_df is not None
+    
+    def _preprocess(self, customer_dict: Dict) -> Tuple[Optional[pd.DataFrame], Optional[np.ndarray]]:
+        """preprocess_input, also returning the encoded row before scaling (None, None on failure)"""
         try:
-            input_df = pd.DataFrame(0, index=[0], columns=self.train_columns)
+            with stage("encode"):
+                input_df = pd.DataFrame(0, index=[0], columns=self.train_columns)
+                
+                # Map basic fields
+                input_df["gender"] = 1 if customer_dict.get('gender', '').upper() in ['MALE', 'M'] else 0
+                input_df["age"] = customer_dict.get('age', 0)
+                input_df["num_dependents"] = customer_dict.get('num_dependents', 0)
+                input_df["estimated_salary"] = customer_dict.get('estimated_salary', 0)
+                input_df["calls_made"] = customer_dict.get('calls_made', 0)
+                input_df["sms_sent"] = customer_dict.get('sms_sent', 0)
+                input_df["data_used"] = customer_dict.get('data_used', 0)
+                input_df["tenure_months"] = customer_dict.get('tenure_months', 0)
+                
+                # Handle one-hot encoding for province
+                province = customer_dict.get('province', '')
+                province_col = f"province_{province}"
+                if province_col in input_df.columns:
+                    input_df[province_col] = 1
+                
+                # Handle one-hot encoding for provider
+                provider = customer_dict.get('provider', '')
+                provider_col = f"provider_nepal_{provider}" if provider else None
+                if provider_col and provider_col not in input_df.columns:
+                    provider_col = f"provider_nepal_{PROVIDER_COLUMN_NAMES.get(provider, provider)}"
+                if provider_col and provider_col in input_df.columns:
+                    input_df[provider_col] = 1
             
-            # Map basic fields
-            input_df["gender"] = 1 if customer_dict.get('gender', '').upper() in ['MALE', 'M'] else 0
-            input_df["age"] = customer_dict.get('age', 0)
-            input_df["num_dependents"] = customer_dict.get('num_dependents', 0)
-            input_df["estimated_salary"] = customer_dict.get('estimated_salary', 0)
-            input_df["calls_made"] = customer_dict.get('calls_made', 0)
-            input_df["sms_sent"] = customer_dict.get('sms_sent', 0)
-            input_df["data_used"] = customer_dict.get('data_used', 0)
-            input_df["tenure_months"] = customer_dict.get('tenure_months', 0)
-            
-            # Handle one-hot encoding for province
-            province = customer_dict.get('province', '')
-            province_col = f"province_{province}"
-            if province_col in input_df.columns:
-                input_df[province_col] = 1
-            
-            # Handle one-hot encoding for provider
-            provider = customer_dict.get('provider', '')
-            provider_col = f"provider_nepal_{provider}" if provider else None
-            if provider_col and provider_col in input_df.columns:
-                input_df[provider_col] = 1
+            encoded = input_df.to_numpy(dtype=np.float32)
             
             # Scale numeric features
-            cols_to_scale = [
-                "age", "estimated_salary", "calls_made",
-                "sms_sent", "data_used", "tenure_months", "num_dependents"
-            ]
+            cols_to_scale = self.NUMERIC_FEATURES
             
             if self.scaler:
                 try:
-                    input_df[cols_to_scale] = self.scaler.transform(input_df[cols_to_scale])
+                    with stage("scale"):
+                        input_df[cols_to_scale] = self.scaler.transform(input_df[cols_to_scale])
                 except Exception as e:
                     logger.warning(f"⚠️ Could not scale features: {str(e)}")
             
-            return input_df, True
+            return input_df, encoded
             
         except Exception as e:
             logger.error(f"❌ Error preprocessing input: {str(e)}")
-            return None, False
+            return None, None
+    
+    @timed_stage("encode")
+    def encode_batch(self, customers: pd.DataFrame) -> np.ndarray:
+        """
+        Vectorized equivalent of preprocess_input for many customers, without scaling
+        
+        Rows are expected to be validated already (validate_batch); numeric
+        cells that do not parse are encoded as 0.
+        
+        Args:
+            customers: DataFrame with one row per customer and CustomerData columns
+            
+        Returns:
+            float32 array of shape (n_customers, n_train_columns)
+        """
+        column_index = {col: i for i, col in enumerate(self.train_columns)}
+        encoded = np.zeros((len(customers), len(self.train_columns)), dtype=np.float32)
+        
+        if "gender" in column_index and "gender" in customers:
+            gender = customers["gender"].fillna("").astype(str).str.upper()
+            encoded[:, column_index["gender"]] = gender.isin(["MALE", "M"]).to_numpy()
+        
+        for col in self.NUMERIC_FEATURES:
+            if col in column_index and col in customers:
+                encoded[:, column_index[col]] = (
+                    pd.to_numeric(customers[col], errors="coerce").fillna(0).to_numpy()
+                )
+        
+        self._one_hot_encode(encoded, customers.get("province"), "province_", column_index)
+        self._one_hot_encode(encoded, customers.get("provider"), "provider_nepal_", column_index,
+                             aliases=PROVIDER_COLUMN_NAMES)
+        return encoded
+    
+    def _one_hot_encode(self, encoded: np.ndarray, values: Optional[pd.Series],
+                        prefix: str, column_index: Dict, aliases: Optional[Dict] = None) -> None:
+        """Set one-hot columns in place for a categorical column (aliases: value -> column suffix)"""
+        if values is None:
+            return
+        codes, uniques = pd.factorize(values)
+        for code, value in enumerate(uniques):
+            col = column_index.get(f"{prefix}{value}")
+            if col is None and aliases:
+                col = column_index.get(f"{prefix}{aliases.get(value, value)}")
+            if col is not None:
+                encoded[codes == code, col] = 1
+    
+    def _scaling_params(self) -> Optional[Tuple[list, np.ndarray, np.ndarray]]:
+        """Return (column positions, mean, scale) of the fitted scaler, or None"""
+        if self.scaler is None or not hasattr(self.scaler, "mean_"):
+            return None
+        
+        feature_names = list(getattr(self.scaler, "feature_names_in_", self.NUMERIC_FEATURES))
+        positions = [self.train_columns.index(col) for col in feature_names]
+        mean = self.scaler.mean_ if self.scaler.with_mean else np.zeros(len(positions))
+        scale = self.scaler.scale_ if self.scaler.scale_ is not None else np.ones(len(positions))
+        return positions, mean.astype(np.float32), scale.astype(np.float32)
+    
+    @timed_stage("scale")
+    def scale_encoded(self, encoded: np.ndarray) -> np.ndarray:
+        """Apply the fitted scaler to the numeric columns of encoded rows"""
+        try:
+            params = self._scaling_params()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not scale features: {str(e)}")
+            params = None
+        if params is None:
+            return encoded
+        
+        positions, mean, scale = params
+        scaled = encoded.copy()
+        scaled[:, positions] = (scaled[:, positions] - mean) / scale
+        return scaled
+    
+    @timed_stage("infer")
+    def predict_proba_encoded(self, scaled: np.ndarray, batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Run the network on already encoded and scaled rows
+        
+        With [segments] enabled, rows are grouped by segment and each group is
+        scored by its own network in one pass; rows of segments without one
+        go to the global network.
+        
+        Returns:
+            float32 array of churn probabilities (0-1), one per row
+        """
+        if self.segments is None:
+            return self.predict_proba_global(scaled, batch_size)
+        scaled = np.asarray(scaled, dtype=np.float32)
+        codes = self.segments.segment_codes(scaled)
+        probs = self.segments.predict_proba(scaled, codes)
+        unrouted = codes < 0
+        if unrouted.any():
+            probs[unrouted] = self.predict_proba_global(scaled[unrouted], batch_size)
+        return probs
+    
+    def predict_proba_global(self, scaled: np.ndarray, batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Run the global network on already encoded and scaled rows
+        
+        The [performance] backend picks the execution: compiled (one traced
+        graph for every batch size), eager (a direct call, model.predict past
+        batch_size rows) or predict (always model.predict).
+        
+        Returns:
+            float32 array of churn probabilities (0-1), one per row
+        """
+        batch_size = batch_size or self.inference_batch_size
+        if len(scaled) == 0:
+            return np.empty(0, dtype=np.float32)
+        scaled = np.asarray(scaled, dtype=np.float32)
+        if self.backend == "compiled":
+            call = self._compiled()
+            probs = np.concatenate([
+                call(scaled[start:start + batch_size]).numpy().reshape(-1)
+                for start in range(0, len(scaled), batch_size)
+            ])
+        elif self.backend == "eager" and len(scaled) <= batch_size:
+            # A direct call skips the per-call data pipeline setup of model.predict
+            probs = self.model(scaled, training=False)
+        else:
+            probs = self.model.predict(scaled, batch_size=batch_size, verbose=0)
+        return np.asarray(probs, dtype=np.float32).reshape(-1)
+    
+    def _compiled(self):
+        """The model's inference call as a tf.function, traced once for any batch size"""
+        if self._compiled_call is None:
+            model = self.model
+            self._compiled_call = tf.function(
+                lambda rows: model(rows, training=False),
+                input_signature=[tf.TensorSpec([None, len(self.train_columns)], tf.float32)],
+                reduce_retracing=True
+            )
+        return self._compiled_call
+    
+    def classify(self, probs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized churn status and risk level for an array of probabilities"""
+        probs = np.asarray(probs)
+        status = np.where(probs > self.CHURN_THRESHOLD, "CHURN", "RETAIN")
+        risk = np.select(
+            [probs < self.LOW_RISK_MAX, probs < self.MEDIUM_RISK_MAX],
+            ["LOW", "MEDIUM"],
+            default="HIGH"
+        )
+        return status, risk
+    
+    def predict_encoded(self, encoded: np.ndarray, names: list) -> list:
+        """
+        Make predictions for rows that are already encoded (but not scaled)
+
+        Args:
+            encoded: float32 array from encode_batch or the feature store
+            names: Customer name (or id) for each row
+
+        Returns:
+            List of prediction result dictionaries, same shape as predict()
+        """
+        scores = self.score_encoded(encoded)
+        with stage("recommend"):
+            recommendations = self.recommender.texts(scores["recommendation_mask"])
+
+        return [
+            {
+                "success": True,
+                "customer_name": str(name),
+                "churn_prediction": str(s),
+                "churn_probability": round(prob * 100, 2),
+                "risk_level": str(r),
+                "recommendations": recs
+            }
+            for name, s, prob, r, recs in zip(
+                names, scores["churn_prediction"].tolist(), scores["probability"].tolist(),
+                scores["risk_level"].tolist(), recommendations
+            )
+        ]
+
+    def score_encoded(self, encoded: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Columnar predictions for encoded (unscaled) rows, without per-row objects
+
+        Returns:
+            Dictionary of arrays: probability (0-1), churn_prediction,
+            risk_level and recommendation_mask (n_rows, n_codes)
+        """
+        self.observe_drift(encoded)
+        probs = self.predict_proba_encoded(self.scale_encoded(encoded))
+        status, risk = self.classify(probs)
+        self.record_audit(encoded, probs, risk)
+        return {
+            "probability": probs,
+            "churn_prediction": status,
+            "risk_level": risk,
+            "recommendation_mask": self.recommendation_mask(encoded, probs, risk)
+        }
+
+    def observe_drift(self, encoded: np.ndarray) -> None:
+        """Fold scored rows (encoded, unscaled) into the drift monitor, if enabled"""
+        if self.drift is not None:
+            with stage("drift"):
+                self.drift.observe(encoded)
+
+    def record_audit(self, encoded: np.ndarray, probs: np.ndarray, risk: np.ndarray) -> None:
+        """Append scored rows to the prediction audit log, if enabled"""
+        if self.audit is not None:
+            with stage("audit"):
+                self.audit.append(encoded, probs, risk, self.model_version)
+
+    @timed_stage("recommend")
+    def recommendation_mask(self, encoded: np.ndarray, probs: np.ndarray, risk: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the recommendation rules for encoded rows
+
+        Returns:
+            Boolean matrix (n_rows, n_codes); see RecommendationEngine.codes/texts
+        """
+        features = {
+            col: encoded[:, self.train_columns.index(col)]
+            for col in self.NUMERIC_FEATURES if col in self.train_columns
+        }
+        return self.recommender.evaluate(probs, risk, features)
+
+    def predict_batch(self, customers: pd.DataFrame) -> list:
+        """
+        Make predictions for many customers in one vectorized pass
+        
+        Args:
+            customers: DataFrame with one row per customer and CustomerData columns
+            
+        Returns:
+            List of prediction result dictionaries, same shape as predict()
+        """
+        if not self.model_loaded:
+            return [{"success": False, "error": "Model not loaded. Please check server logs."}] * len(customers)
+        
+        names = customers["name"].fillna("Unknown").tolist() if "name" in customers else ["Unknown"] * len(customers)
+        return self.predict_encoded(self.encode_batch(customers), names)
     
     def predict(self, customer_dict: Dict) -> Dict:
         """
@@ -198,29 +570,33 @@ class ChurnModelService:
             }
         
         try:
-            input_df, success = self.preprocess_input(customer_dict)
-            if not success:
+            input_df, encoded = self._preprocess(customer_dict)
+            if input_df is None:
                 return {
                     "success": False,
                     "error": "Failed to preprocess input data"
                 }
             
             # Make prediction
-            prediction_prob = float(self.model.predict(input_df.values, verbose=0)[0][0])
+            prediction_prob = float(self.predict_proba_encoded(input_df.to_numpy(dtype=np.float32))[0])
             
             # Determine status and risk level
-            status = "CHURN" if prediction_prob > 0.5 else "RETAIN"
-            if prediction_prob < 0.3:
+            status = "CHURN" if prediction_prob > self.CHURN_THRESHOLD else "RETAIN"
+            if prediction_prob < self.LOW_RISK_MAX:
                 risk = "LOW"
-            elif prediction_prob < 0.6:
+            elif prediction_prob < self.MEDIUM_RISK_MAX:
                 risk = "MEDIUM"
             else:
                 risk = "HIGH"
             
+            self.observe_drift(encoded)
+            self.record_audit(encoded, np.array([prediction_prob]), np.array([risk]))
+            
             # Generate recommendations
-            recommendations = self._generate_recommendations(
-                prediction_prob, customer_dict, risk
-            )
+            with stage("recommend"):
+                recommendations = self._generate_recommendations(
+                    prediction_prob, customer_dict, risk
+                )
             
             return {
                 "success": True,
@@ -240,23 +616,9 @@ class ChurnModelService:
     
     def _generate_recommendations(self, prob: float, customer: Dict, risk: str) -> list:
         """Generate actionable recommendations based on prediction"""
-        recommendations = []
-        
-        if prob > 0.5:
-            recommendations.append("🚨 Priority: High-risk customer - Consider immediate retention strategy")
-            recommendations.append("💬 Offer: Provide personalized discount or loyalty rewards")
-            recommendations.append("📞 Action: Assign dedicated customer support representative")
-        
-        if customer.get('tenure_months', 0) < 12:
-            recommendations.append("🆕 Customer is relatively new - Focus on onboarding & relationship building")
-        
-        if customer.get('calls_made', 0) < 20:
-            recommendations.append("📉 Low engagement detected - Encourage service usage")
-        
-        if customer.get('estimated_salary', 0) < 30000:
-            recommendations.append("💰 Consider affordable plans to reduce churn")
-        
-        if risk in ["MEDIUM", "HIGH"] and customer.get('data_used', 0) < 500:
-            recommendations.append("📊 Data usage is low - Offer attractive data bundles")
-        
-        return recommendations
+        features = {
+            col: [float(customer.get(col, 0) or 0)]
+            for col in self.NUMERIC_FEATURES
+        }
+        mask = self.recommender.evaluate(np.array([prob]), np.array([risk]), features)
+        return self.recommender.texts(mask)[0]
@@ -1,5 +1,13 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import Optional, Union
+
+# Allowed categorical values (shared with the columnar batch validator)
+VALID_GENDERS = ['MALE', 'FEMALE', 'M', 'F']
+VALID_PROVINCES = [
+    "Bagmati", "Gandaki", "Karnali", "Koshi",
+    "Lumbini", "Madhesh", "Sudurpashchim"
+]
+VALID_PROVIDERS = ["Ncell", "Nepal Telecom"]
 
 
 class CustomerData(BaseModel):
@@ -18,28 +26,30 @@ class CustomerData(BaseModel):
     
     @validator('gender')
     def validate_gender(cls, v):
-        if v.upper() not in ['MALE', 'FEMALE', 'M', 'F']:
+        if v.upper() not in VALID_GENDERS:
             raise ValueError('Gender must be Male, Female, M, or F')
         return v.upper()
     
     @validator('province')
     def validate_province(cls, v):
-        valid_provinces = [
-            "Bagmati", "Gandaki", "Karnali", "Koshi", 
-            "Lumbini", "Madhesh", "Sudurpashchim"
-        ]
-        if v not in valid_provinces:
-            raise ValueError(f'Province must be one of {valid_provinces}')
+        if v not in VALID_PROVINCES:
+            raise ValueError(f'Province must be one of {VALID_PROVINCES}')
         return v
     
     @validator('provider')
     def validate_provider(cls, v):
-        valid_providers = ["Ncell", "Nepal Telecom"]
-        if v not in valid_providers:
-            raise ValueError(f'Provider must be one of {valid_providers}')
+        if v not in VALID_PROVIDERS:
+            raise ValueError(f'Provider must be one of {VALID_PROVIDERS}')
         return v
 
 
+class CustomerIdsRequest(BaseModel):
+    """Request model for scoring stored customers by id"""
+    customer_ids: list[Union[int, str]] = Field(
+        ..., min_length=1, max_length=100000, description="Customer ids in the feature store"
+    )
+
+
 class PredictionResponse(BaseModel):
     """Response model for predictions"""
     customer_name: str
@@ -47,6 +57,11 @@ class PredictionResponse(BaseModel):
     churn_probability: float
     risk_level: str
     recommendations: list = []
+
+
+class ExplainedPredictionResponse(PredictionResponse):
+    """Prediction response with per-feature attributions (percentage points)"""
+    attributions: dict
     
     
 class HealthResponse(BaseModel):
@@ -0,0 +1,203 @@
+"""
+Per-Request Profiling
+Opt-in stage timings for single requests, returned in a Server-Timing header,
+with an optional sampled cProfile dump. Enabled by the [profiling] section of
+config.ini and requested per call with a header; when a request is not being
+profiled each instrumented stage costs one context variable lookup.
+"""
+
+import hmac
+import random
+import logging
+import cProfile
+import functools
+import contextvars
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Profile of the request being handled in this context, if any
+_current: contextvars.ContextVar = contextvars.ContextVar("churn_request_profile", default=None)
+_NOT_PROFILED = nullcontext()
+
+
+class RequestProfile:
+    """Stage durations of one profiled request
+
+    Args:
+        cprofile_dir: Where to write a cProfile dump of the handler, or None
+            to skip cProfile for this request
+    """
+
+    def __init__(self, cprofile_dir: Optional[Path] = None):
+        self.started = perf_counter()
+        self.handler_done: Optional[float] = None
+        self.stages: Dict[str, float] = {}
+        self.cprofile_dir = cprofile_dir
+        self.dump_path: Optional[Path] = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - start)
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: every stage and the total, in milliseconds"""
+        now = perf_counter()
+        if self.handler_done is not None:
+            # Response model validation and JSON encoding happen after the handler
+            self.add("serialize", now - self.handler_done)
+            self.handler_done = None
+        parts = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.stages.items()]
+        parts.append(f"total;dur={(now - self.started) * 1000:.3f}")
+        return ", ".join(parts)
+
+
+def stage(name: str):
+    """Context manager timing a stage of the current profiled request (no-op otherwise)"""
+    profile = _current.get()
+    return _NOT_PROFILED if profile is None else profile.stage(name)
+
+
+def timed_stage(name: str):
+    """Decorator timing every call of a function as a stage of the current profiled request"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            profile = _current.get()
+            if profile is None:
+                return fn(*args, **kwargs)
+            with profile.stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def profiled_endpoint(fn):
+    """
+    Decorator for sync endpoints taking part in request profiling
+
+    Time before the handler runs is recorded as the "parse" stage (body
+    decoding and request model validation); time after it as "serialize".
+    Sampled requests run the handler under cProfile.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return fn(*args, **kwargs)
+        profile.add("parse", perf_counter() - profile.started)
+        profiler = cProfile.Profile() if profile.cprofile_dir is not None else None
+        if profiler is not None:
+            profiler.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profile.dump_path = _dump(profiler, profile.cprofile_dir, fn.__name__)
+            profile.handler_done = perf_counter()
+    return wrapper
+
+
+class ProfilingSettings:
+    """[profiling] section of config.ini"""
+
+    def __init__(self, enabled: bool = False, header: str = "X-Profile", token: str = "",
+                 paths: Optional[List[str]] = None, cprofile_sample_rate: float = 0.0,
+                 cprofile_dir: str = "data/profiles"):
+        self.enabled = enabled
+        self.header = header
+        self.token = token
+        self.paths = set(paths or ["/predict", "/batch-predict"])
+        self.cprofile_sample_rate = cprofile_sample_rate
+        self.cprofile_dir = Path(cprofile_dir)
+        if not self.cprofile_dir.is_absolute():
+            self.cprofile_dir = PROJECT_ROOT / self.cprofile_dir
+
+    @classmethod
+    def from_config(cls, config=None) -> "ProfilingSettings":
+        if config is None or not config.has_section("profiling"):
+            return cls()
+        section = config["profiling"]
+        return cls(
+            enabled=section.getboolean("enabled", False),
+            header=section.get("header", "X-Profile"),
+            token=section.get("token", ""),
+            paths=[p.strip() for p in section.get("paths", "/predict, /batch-predict").split(",") if p.strip()],
+            cprofile_sample_rate=section.getfloat("cprofile_sample_rate", 0.0),
+            cprofile_dir=section.get("cprofile_dir", "data/profiles")
+        )
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware starting a RequestProfile for requests that ask for one
+
+    A request is profiled when its path is in settings.paths and it carries
+    the settings.header header (whose value must equal settings.token when
+    a token is configured). The response gets a Server-Timing header and,
+    when a cProfile dump was written, X-Profile-Dump with its file name.
+    """
+
+    def __init__(self, app, settings: ProfilingSettings):
+        self.app = app
+        self.settings = settings
+        self._header = settings.header.lower().encode("latin-1")
+
+    def _requested(self, scope) -> bool:
+        if scope["type"] != "http" or scope["path"] not in self.settings.paths:
+            return False
+        for key, value in scope["headers"]:
+            if key == self._header:
+                return not self.settings.token or hmac.compare_digest(value, self.settings.token.encode("latin-1"))
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        sampled = random.random() < self.settings.cprofile_sample_rate
+        profile = RequestProfile(self.settings.cprofile_dir if sampled else None)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode("latin-1")))
+                if profile.dump_path is not None:
+                    headers.append((b"x-profile-dump", profile.dump_path.name.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current.set(profile)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+
+
+def _dump(profiler: cProfile.Profile, directory: Path, endpoint: str) -> Optional[Path]:
+    """Write a cProfile dump (readable with pstats or snakeviz)"""
+    path = directory / f"{datetime.now():%Y%m%d-%H%M%S}-{endpoint}-{uuid4().hex[:8]}.prof"
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(path)
+        logger.info(f"✅ cProfile dump written to {path}")
+        return path
+    except OSError as e:
+        logger.warning(f"⚠️ Could not write cProfile dump: {str(e)}")
+        return None
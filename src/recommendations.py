@@ -0,0 +1,143 @@
+"""
+Recommendation Rule Engine
+Retention recommendations defined as a declarative rule table, evaluated as
+NumPy masks over a whole batch; rows carry compact codes and the display text
+is attached only when a response is built
+"""
+
+import numpy as np
+from typing import Dict, List, Optional
+
+# Recommendation codes in output order, with their display text
+RECOMMENDATION_TEXT = {
+    "PRIORITY": "🚨 Priority: High-risk customer - Consider immediate retention strategy",
+    "OFFER": "💬 Offer: Provide personalized discount or loyalty rewards",
+    "SUPPORT": "📞 Action: Assign dedicated customer support representative",
+    "NEW_CUSTOMER": "🆕 Customer is relatively new - Focus on onboarding & relationship building",
+    "LOW_ENGAGEMENT": "📉 Low engagement detected - Encourage service usage",
+    "AFFORDABLE_PLAN": "💰 Consider affordable plans to reduce churn",
+    "DATA_BUNDLE": "📊 Data usage is low - Offer attractive data bundles"
+}
+RECOMMENDATION_CODES = list(RECOMMENDATION_TEXT)
+
+# Default thresholds, overridden by the [recommendations] section of config.ini
+DEFAULT_THRESHOLDS = {
+    "priority_probability": 0.5,
+    "new_customer_tenure": 12,
+    "low_calls": 20,
+    "low_salary": 30000,
+    "low_data": 500,
+    "data_bundle_risk_levels": "MEDIUM, HIGH"
+}
+
+# Rule table: (codes emitted, conditions). Every condition must hold.
+# A condition is (input, operator, threshold key); "probability" and "risk"
+# are prediction outputs, anything else is a customer feature.
+RULES = [
+    (("PRIORITY", "OFFER", "SUPPORT"), [("probability", ">", "priority_probability")]),
+    (("NEW_CUSTOMER",), [("tenure_months", "<", "new_customer_tenure")]),
+    (("LOW_ENGAGEMENT",), [("calls_made", "<", "low_calls")]),
+    (("AFFORDABLE_PLAN",), [("estimated_salary", "<", "low_salary")]),
+    (("DATA_BUNDLE",), [("risk", "in", "data_bundle_risk_levels"), ("data_used", "<", "low_data")])
+]
+
+_OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "in": lambda values, allowed: np.isin(values, allowed)
+}
+
+
+class RecommendationEngine:
+    """Evaluates RULES for a batch of predictions"""
+
+    def __init__(self, thresholds: Optional[Dict] = None, cache_size: int = 4096):
+        self.thresholds = dict(DEFAULT_THRESHOLDS)
+        if thresholds:
+            self.thresholds.update(thresholds)
+        self._code_index = {code: i for i, code in enumerate(RECOMMENDATION_CODES)}
+        self._text_cache: Dict[int, List[str]] = {}
+        self.cache_size = cache_size
+
+    @classmethod
+    def from_config(cls, config=None, cache_size: int = 4096) -> "RecommendationEngine":
+        """Build an engine with thresholds from the [recommendations] section"""
+        if config is None or not config.has_section("recommendations"):
+            return cls(cache_size=cache_size)
+        section = config["recommendations"]
+        thresholds = {}
+        for key, default in DEFAULT_THRESHOLDS.items():
+            if key not in section:
+                continue
+            thresholds[key] = section[key] if isinstance(default, str) else float(section[key])
+        return cls(thresholds, cache_size)
+
+    def _threshold(self, key: str):
+        value = self.thresholds[key]
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return value
+
+    def evaluate(self, probs: np.ndarray, risk: np.ndarray, features: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Evaluate every rule across the batch
+
+        Args:
+            probs: Churn probabilities (0-1)
+            risk: Risk level per row
+            features: Customer feature columns by name (missing features count as 0)
+
+        Returns:
+            Boolean matrix of shape (n_rows, len(RECOMMENDATION_CODES))
+        """
+        probs = np.asarray(probs)
+        n = len(probs)
+        inputs = {"probability": probs, "risk": np.asarray(risk)}
+        mask = np.zeros((n, len(RECOMMENDATION_CODES)), dtype=bool)
+
+        for codes, conditions in RULES:
+            fired = np.ones(n, dtype=bool)
+            for name, op, key in conditions:
+                values = inputs.get(name)
+                if values is None:
+                    values = np.asarray(features.get(name, np.zeros(n)), dtype=np.float64)
+                fired &= _OPERATORS[op](values, self._threshold(key))
+            for code in codes:
+                mask[:, self._code_index[code]] |= fired
+        return mask
+
+    def codes(self, mask: np.ndarray) -> List[List[str]]:
+        """Compact recommendation codes for each row of an evaluate() mask"""
+        return [[RECOMMENDATION_CODES[i] for i in row] for row in _row_indices(mask)]
+
+    def texts(self, mask: np.ndarray) -> List[List[str]]:
+        """Display text for each row of an evaluate() mask"""
+        # Rows share few distinct rule patterns; build each text list once
+        texts = []
+        for pattern in pack_mask(mask).tolist():
+            cached = self._text_cache.get(pattern)
+            if cached is None:
+                cached = [
+                    RECOMMENDATION_TEXT[code] for i, code in enumerate(RECOMMENDATION_CODES)
+                    if pattern >> i & 1
+                ]
+                if len(self._text_cache) < self.cache_size:
+                    self._text_cache[pattern] = cached
+            texts.append(list(cached))
+        return texts
+
+
+def pack_mask(mask: np.ndarray) -> np.ndarray:
+    """One integer per row with bit i set when RECOMMENDATION_CODES[i] applies"""
+    weights = 1 << np.arange(mask.shape[1], dtype=np.int64)
+    return mask.astype(np.int64) @ weights
+
+
+def _row_indices(mask: np.ndarray) -> List[List[int]]:
+    if len(mask) == 0:
+        return []
+    rows, cols = np.nonzero(mask)
+    splits = np.searchsorted(rows, np.arange(1, len(mask)))
+    return [part.tolist() for part in np.split(cols, splits)]
@@ -0,0 +1,339 @@
+"""
+Incremental Rescoring for Batch Churn Scoring
+Keeps an on-disk index of customer feature hashes so that nightly runs only
+score customers that are new or whose features changed since the last run
+"""
+
+import os
+import logging
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from src.batch_validation import CATEGORICAL_FIELDS, NUMERIC_FIELDS, validate_batch
+except ImportError:
+    from batch_validation import CATEGORICAL_FIELDS, NUMERIC_FIELDS, validate_batch
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = Path(__file__).parent.parent / "data" / "rescore_index.npz"
+
+# CustomerData fields every input row must have (name falls back to the customer id)
+REQUIRED_FIELDS = [*[field for field, spec in NUMERIC_FIELDS.items() if spec[0]], *CATEGORICAL_FIELDS]
+
+# Read as text so names like "1001" and categorical cells validate as strings
+TEXT_COLUMNS = {"name": str, **{field: str for field in CATEGORICAL_FIELDS}}
+
+# 64-bit FNV-1a constants, applied column-wise over the float32 bit patterns
+_FNV_OFFSET = np.uint64(0xcbf29ce484222325)
+_FNV_PRIME = np.uint64(0x100000001b3)
+
+
+def hash_rows(encoded: np.ndarray) -> np.ndarray:
+    """
+    Hash every encoded row in bulk
+
+    Args:
+        encoded: 2-D array of encoded (unscaled) feature rows
+
+    Returns:
+        uint64 array with one hash per row
+    """
+    words = np.ascontiguousarray(encoded, dtype=np.float32).view(np.uint32)
+    hashes = np.full(len(words), _FNV_OFFSET, dtype=np.uint64)
+    for col in range(words.shape[1]):
+        hashes ^= words[:, col].astype(np.uint64)
+        hashes *= _FNV_PRIME
+    return hashes
+
+
+def normalize_ids(ids) -> np.ndarray:
+    """Convert customer ids to int64 when numeric, otherwise to a unicode array"""
+    ids = np.asarray(ids)
+    if ids.dtype.kind in "iu":
+        return ids.astype(np.int64)
+    return ids.astype(str)
+
+
+class RescoreIndex:
+    """Sorted customer_id -> (feature hash, last probability) index stored as .npz"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else DEFAULT_INDEX_PATH
+        self.model_version = ""
+        self.customer_ids = np.empty(0, dtype=np.int64)
+        self.feature_hashes = np.empty(0, dtype=np.uint64)
+        self.scores = np.empty(0, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.customer_ids)
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "RescoreIndex":
+        """Load an index from disk, or return an empty one if it does not exist"""
+        index = cls(path)
+        if not index.path.exists():
+            return index
+        try:
+            with np.load(index.path, allow_pickle=False) as data:
+                index.model_version = str(data["model_version"])
+                index.customer_ids = data["customer_ids"]
+                index.feature_hashes = data["feature_hashes"]
+                index.scores = data["scores"]
+            logger.info(f"✅ Rescore index loaded: {len(index)} customers")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load rescore index, starting empty: {str(e)}")
+            index = cls(path)
+        return index
+
+    def save(self) -> None:
+        """Atomically write the index to disk"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as fh:
+            np.savez(
+                fh,
+                model_version=np.array(self.model_version),
+                customer_ids=self.customer_ids,
+                feature_hashes=self.feature_hashes,
+                scores=self.scores
+            )
+        os.replace(tmp_path, self.path)
+
+    def invalidate(self, model_version: str) -> None:
+        """Drop every entry and bind the index to a new model version"""
+        self.model_version = model_version
+        self.customer_ids = np.empty(0, dtype=self.customer_ids.dtype)
+        self.feature_hashes = np.empty(0, dtype=np.uint64)
+        self.scores = np.empty(0, dtype=np.float32)
+
+    def lookup(self, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Locate customer ids in the index
+
+        Returns:
+            Tuple of (positions, found_mask); positions are only valid where found
+        """
+        if len(self) == 0:
+            return np.zeros(len(ids), dtype=np.intp), np.zeros(len(ids), dtype=bool)
+        positions = np.searchsorted(self.customer_ids, ids)
+        positions = np.minimum(positions, len(self) - 1)
+        found = self.customer_ids[positions] == ids
+        return positions, found
+
+    def upsert(self, ids: np.ndarray, hashes: np.ndarray, scores: np.ndarray) -> None:
+        """Insert or update entries; the last occurrence of a duplicate id wins"""
+        if len(ids) == 0:
+            return
+
+        # Deduplicate keeping the last occurrence
+        _, last = np.unique(ids[::-1], return_index=True)
+        keep = len(ids) - 1 - last
+        ids, hashes, scores = ids[keep], hashes[keep], scores[keep]
+
+        positions, found = self.lookup(ids)
+        self.feature_hashes[positions[found]] = hashes[found]
+        self.scores[positions[found]] = scores[found]
+
+        new = ~found
+        if new.any():
+            if self.customer_ids.dtype.kind == "U":
+                self.customer_ids = self.customer_ids.astype(
+                    np.result_type(self.customer_ids, ids[new])
+                )
+            insert_at = np.searchsorted(self.customer_ids, ids[new])
+            self.customer_ids = np.insert(self.customer_ids, insert_at, ids[new])
+            self.feature_hashes = np.insert(self.feature_hashes, insert_at, hashes[new])
+            self.scores = np.insert(self.scores, insert_at, scores[new])
+
+
+def missing_columns(customers: pd.DataFrame, id_column: str = "customer_id") -> List[str]:
+    """Required columns (the id and the required CustomerData fields) absent from customers"""
+    return [column for column in [id_column, *REQUIRED_FIELDS] if column not in customers]
+
+
+def validate_customers(customers: pd.DataFrame,
+                       id_column: str = "customer_id") -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Split an input frame into rows that pass the CustomerData rules and rejected rows
+
+    Rows without a customer id are rejected too. A missing name column is
+    filled with the customer id, since scoring output is keyed by id.
+
+    Returns:
+        Tuple of (valid rows with the id column and validated CustomerData
+        columns, rejected rows as row/customer_id/error where row is the
+        1-based data row of the input)
+    """
+    ids = customers[id_column]
+    if ids.dtype.kind == "f" and (ids.dropna() % 1 == 0).all():
+        # A blank id cell makes pandas read whole-number ids as float
+        ids = ids.astype("Int64")
+    records = customers.drop(columns=[id_column]).astype(object)
+    records = records.where(records.notna(), None)
+    if "name" not in records:
+        records["name"] = ids.astype(str).where(ids.notna(), None)
+    valid, errors = validate_batch(records.to_dict("records"))
+
+    for row in np.flatnonzero(ids.isna().to_numpy()).tolist():
+        errors.setdefault(row, []).insert(0, f"{id_column}: field required")
+    valid = valid.drop(index=[row for row in errors if row in valid.index])
+
+    valid_ids = ids.iloc[valid.index]
+    valid.insert(0, id_column, valid_ids.to_numpy(dtype=np.int64) if ids.dtype == "Int64" else valid_ids.to_numpy())
+
+    rejected = pd.DataFrame(
+        [
+            {"row": row + 1, id_column: ids.iloc[row], "error": "; ".join(messages)}
+            for row, messages in sorted(errors.items())
+        ],
+        columns=["row", id_column, "error"]
+    )
+    return valid.reset_index(drop=True), rejected
+
+
+def score_incremental(model_service, customers: pd.DataFrame, index: RescoreIndex,
+                      id_column: str = "customer_id",
+                      score_index=None) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Score a batch of customers, reusing stored scores for unchanged rows
+
+    Args:
+        model_service: Loaded ChurnModelService
+        customers: DataFrame with an id column and CustomerData columns
+        index: RescoreIndex updated in place with the fresh scores
+        id_column: Name of the customer id column
+        score_index: Optional ScoreIndex that receives the rescored customers
+
+    Returns:
+        Tuple of (results DataFrame, run statistics)
+
+    Raises:
+        ValueError: A required column is missing
+    """
+    missing = missing_columns(customers, id_column)
+    if missing:
+        raise ValueError(f"Input is missing required columns: {', '.join(missing)}")
+
+    if index.model_version != model_service.model_version:
+        logger.info(
+            f"🔄 Model version changed ({index.model_version or 'none'} -> "
+            f"{model_service.model_version}), invalidating rescore index"
+        )
+        index.invalidate(model_service.model_version)
+
+    ids = normalize_ids(customers[id_column].to_numpy())
+    if len(index) and index.customer_ids.dtype.kind != ids.dtype.kind:
+        logger.warning("⚠️ Customer id type changed, invalidating rescore index")
+        index.invalidate(model_service.model_version)
+    if len(index) == 0:
+        index.customer_ids = index.customer_ids.astype(ids.dtype)
+
+    encoded = model_service.encode_batch(customers)
+    hashes = hash_rows(encoded)
+
+    positions, found = index.lookup(ids)
+    unchanged = found & (index.feature_hashes[positions] == hashes) if len(index) else found
+    stale = ~unchanged
+
+    probs = np.empty(len(customers), dtype=np.float32)
+    probs[unchanged] = index.scores[positions[unchanged]]
+    if stale.any():
+        # Only rescored rows are new predictions; carried-forward rows were audited when scored
+        fresh = encoded[stale]
+        model_service.observe_drift(fresh)
+        probs[stale] = model_service.predict_proba_encoded(model_service.scale_encoded(fresh))
+        model_service.record_audit(fresh, probs[stale], model_service.classify(probs[stale])[1])
+    index.upsert(ids[stale], hashes[stale], probs[stale])
+
+    if score_index is not None:
+        # A fresh or outdated score index needs every customer, not just the rescored ones
+        if score_index.model_version != model_service.model_version or len(score_index) == 0:
+            score_index.clear(model_service.model_version)
+            update_rows = np.ones(len(customers), dtype=bool)
+        else:
+            update_rows = stale
+        _, last = np.unique(ids[update_rows][::-1], return_index=True)
+        keep = np.flatnonzero(update_rows)[update_rows.sum() - 1 - last]
+        score_index.update(
+            ids[keep], probs[keep],
+            customers["province"].to_numpy()[keep], customers["provider"].to_numpy()[keep]
+        )
+
+    status, risk = model_service.classify(probs)
+    results = pd.DataFrame({
+        id_column: customers[id_column].to_numpy(),
+        "churn_prediction": status,
+        "churn_probability": np.round(probs.astype(np.float64) * 100, 2),
+        "risk_level": risk,
+        "rescored": stale
+    })
+    stats = {
+        "total": len(customers),
+        "rescored": int(stale.sum()),
+        "carried_forward": int(unchanged.sum()),
+        "model_version": model_service.model_version
+    }
+    return results, stats
+
+
+def run_batch_scoring(input_path: Path, output_path: Path,
+                      index_path: Optional[Path] = None) -> Dict:
+    """
+    Score a customer CSV incrementally and write the results to CSV
+
+    Rows are validated with the CustomerData rules first. Rejected rows are
+    not scored; they are written with their reasons beside the output
+    (predictions.rejected.csv for predictions.csv).
+
+    Args:
+        input_path: CSV with customer_id and CustomerData columns
+        output_path: Destination CSV for the predictions
+        index_path: Location of the rescore index (defaults to data/rescore_index.npz)
+
+    Returns:
+        Run statistics
+
+    Raises:
+        ValueError: The CSV lacks a required column
+    """
+    customers = pd.read_csv(input_path, dtype=TEXT_COLUMNS)
+    if "provider" not in customers and "provider_nepal" in customers:
+        customers = customers.rename(columns={"provider_nepal": "provider"})
+    # Checked before the model is loaded, so a wrong file fails fast
+    missing = missing_columns(customers)
+    if missing:
+        raise ValueError(f"{input_path} is missing required columns: {', '.join(missing)}")
+
+    try:
+        from src.model_service import ChurnModelService
+        from src.score_index import ScoreIndex
+    except ImportError:
+        from model_service import ChurnModelService
+        from score_index import ScoreIndex
+
+    valid, rejected = validate_customers(customers)
+    rejected_path = output_path.with_name(f"{output_path.stem}.rejected{output_path.suffix or '.csv'}")
+    if len(rejected):
+        rejected.to_csv(rejected_path, index=False)
+        logger.warning(f"⚠️ {len(rejected)} rows failed validation and were not scored, see {rejected_path}")
+    elif rejected_path.exists():
+        rejected_path.unlink()
+
+    model_service = ChurnModelService()
+    index = RescoreIndex.load(index_path)
+    score_index = ScoreIndex.load()
+    results, stats = score_incremental(model_service, valid, index, score_index=score_index)
+    stats["rejected"] = len(rejected)
+
+    results.to_csv(output_path, index=False)
+    index.save()
+    score_index.save()
+    logger.info(
+        f"✅ Batch scoring complete: {stats['rescored']} rescored, "
+        f"{stats['carried_forward']} carried forward, {stats['rejected']} rejected "
+        f"({stats['total'] + stats['rejected']} total)"
+    )
+    return stats
@@ -0,0 +1,165 @@
+"""
+Compact Batch Response Formats
+Column-oriented encodings of /batch-predict results, negotiated through the
+Accept header. Recommendations are sent as a bitmask over the recommendation
+codes, with the code and text legend sent once per response.
+"""
+
+import json
+import numpy as np
+from typing import Dict, List, Optional
+
+from fastapi.responses import Response
+
+try:
+    from src.recommendations import RECOMMENDATION_CODES, RECOMMENDATION_TEXT
+except ImportError:
+    from recommendations import RECOMMENDATION_CODES, RECOMMENDATION_TEXT
+
+# Optional encoders: the format is only offered when its library is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+ROW_JSON = "application/json"
+COLUMNAR_JSON = "application/vnd.churn.columnar+json"
+MSGPACK = "application/x-msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+MEDIA_TYPE_ALIASES = {"application/msgpack": MSGPACK, "application/vnd.msgpack": MSGPACK}
+
+
+class FormatNotAvailableError(Exception):
+    """Raised when the requested format's encoder library is not installed"""
+
+
+def available_formats() -> List[str]:
+    """Media types this process can produce"""
+    formats = [ROW_JSON, COLUMNAR_JSON]
+    if msgpack is not None:
+        formats.append(MSGPACK)
+    if pa is not None:
+        formats.append(ARROW)
+    return formats
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Pick the response media type from an Accept header
+
+    The highest q-value among the producible types wins; */* or no header
+    selects the row-oriented JSON. FormatNotAvailableError is raised when
+    only compact formats whose encoder is not installed were accepted.
+    """
+    if not accept:
+        return ROW_JSON
+    choices = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, _, params = part.strip().partition(";")
+        media_type = MEDIA_TYPE_ALIASES.get(media_type.strip().lower(), media_type.strip().lower())
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            choices.append((-q, position, media_type))
+
+    missing = None
+    for _, _, media_type in sorted(choices):
+        if media_type in (ROW_JSON, "application/*", "*/*"):
+            return ROW_JSON
+        if media_type == COLUMNAR_JSON:
+            return COLUMNAR_JSON
+        if media_type == MSGPACK:
+            if msgpack is not None:
+                return MSGPACK
+            missing = missing or "MessagePack responses need the 'msgpack' package"
+        if media_type == ARROW:
+            if pa is not None:
+                return ARROW
+            missing = missing or "Arrow responses need the 'pyarrow' package"
+    if missing:
+        raise FormatNotAvailableError(missing)
+    return ROW_JSON
+
+
+def columnar_payload(total: int, columns: Dict[str, np.ndarray],
+                     errors: Dict[int, str],
+                     attributions: Optional[Dict[str, np.ndarray]] = None) -> Dict:
+    """
+    Plain-Python column-oriented payload (for JSON and MessagePack)
+
+    Args:
+        total: Number of rows in the request
+        columns: customer_name, churn_prediction, churn_probability,
+            risk_level and recommendations (bitmask) arrays, one entry per row
+        errors: Error message by row index
+        attributions: Optional attribution column per field
+    """
+    payload = {
+        "total": total,
+        "format": "columnar",
+        "recommendation_codes": RECOMMENDATION_CODES,
+        "recommendation_text": RECOMMENDATION_TEXT,
+        "columns": {name: values.tolist() for name, values in columns.items()},
+        "errors": [{"row": row, "error": message} for row, message in sorted(errors.items())]
+    }
+    if attributions is not None:
+        payload["attributions"] = {name: values.tolist() for name, values in attributions.items()}
+    return payload
+
+
+def render(media_type: str, total: int, columns: Dict[str, np.ndarray],
+           errors: Dict[int, str],
+           attributions: Optional[Dict[str, np.ndarray]] = None) -> Response:
+    """Encode columnar results as the negotiated compact media type"""
+    if media_type == ARROW:
+        return Response(_arrow_stream(columns, errors, attributions), media_type=ARROW)
+
+    payload = columnar_payload(total, columns, errors, attributions)
+    if media_type == MSGPACK:
+        return Response(msgpack.packb(payload), media_type=MSGPACK)
+    if orjson is not None:
+        body = orjson.dumps(payload)
+    else:
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return Response(body, media_type=COLUMNAR_JSON)
+
+
+def _arrow_stream(columns: Dict[str, np.ndarray], errors: Dict[int, str],
+                  attributions: Optional[Dict[str, np.ndarray]]) -> bytes:
+    """Arrow IPC stream: one record batch, legend and errors in the schema metadata"""
+    arrays = {
+        "customer_name": pa.array(columns["customer_name"], type=pa.string()),
+        "churn_prediction": pa.array(columns["churn_prediction"], type=pa.string()).dictionary_encode(),
+        "churn_probability": pa.array(columns["churn_probability"], type=pa.float64()),
+        "risk_level": pa.array(columns["risk_level"], type=pa.string()).dictionary_encode(),
+        "recommendations": pa.array(columns["recommendations"], type=pa.uint16())
+    }
+    for name, values in (attributions or {}).items():
+        arrays[f"attribution_{name}"] = pa.array(values, type=pa.float64())
+
+    metadata = {
+        "recommendation_codes": json.dumps(RECOMMENDATION_CODES),
+        "recommendation_text": json.dumps(RECOMMENDATION_TEXT, ensure_ascii=False),
+        "errors": json.dumps([{"row": r, "error": m} for r, m in sorted(errors.items())])
+    }
+    table = pa.table(arrays).replace_schema_metadata(metadata)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
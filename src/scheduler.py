@@ -0,0 +1,114 @@
+"""
+Inference Scheduler
+Micro-batches single-customer requests from concurrent callers into one
+vectorized scoring call, so per-event traffic (WebSocket sessions) gets
+batch throughput without per-request model invocations
+"""
+
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceScheduler:
+    """Bounded request queue drained in micro-batches by one background task
+
+    Args:
+        handler: Synchronous function scoring a list of records and returning
+            one result per record, in order; it runs in a worker thread
+        max_batch_size: Most records scored in one handler call
+        max_wait_ms: How long a partial batch waits for more records
+        max_queue_size: Queued records before submit() blocks (backpressure)
+    """
+
+    def __init__(self, handler: Callable[[List], List], max_batch_size: int = 256,
+                 max_wait_ms: float = 2.0, max_queue_size: int = 4096):
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.submitted = 0
+        self.batches = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the batching loop on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"✅ Inference scheduler started (batch {self.max_batch_size}, "
+            f"wait {self.max_wait * 1000:g}ms, queue {self.max_queue_size})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the loop; requests still queued fail with CancelledError"""
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.cancel()
+        logger.info(f"🛑 Inference scheduler stopped ({self.submitted} requests, {self.batches} batches)")
+
+    async def submit(self, record) -> Dict:
+        """Queue one record and wait for its result (blocks while the queue is full)"""
+        if not self.running:
+            raise RuntimeError("Inference scheduler is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future))
+        self.submitted += 1
+        return await future
+
+    def stats(self) -> Dict:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "submitted": self.submitted,
+            "batches": self.batches,
+            "mean_batch_size": round(self.submitted / self.batches, 2) if self.batches else 0.0
+        }
+
+    def _drain(self, batch: List) -> None:
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            self._drain(batch)
+            if len(batch) < self.max_batch_size and self.max_wait > 0:
+                # Give concurrent callers a moment to join this batch
+                await asyncio.sleep(self.max_wait)
+                self._drain(batch)
+
+            self.batches += 1
+            try:
+                results = await loop.run_in_executor(None, self.handler, [r for r, _ in batch])
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+            except Exception as e:
+                logger.error(f"❌ Scheduled batch of {len(batch)} failed: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
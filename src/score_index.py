@@ -0,0 +1,233 @@
+"""
+Segmented Score Index for At-Risk Customer Queries
+Latest churn probabilities kept sorted per (province, provider) segment so that
+top-K and threshold-count queries never touch the full customer base
+"""
+
+import os
+import logging
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = Path(__file__).parent.parent / "data" / "score_index.npz"
+
+# Provider spellings in the cleaned data that map to the API provider names
+PROVIDER_ALIASES = {"Nepal Telecom (NTC)": "Nepal Telecom"}
+
+
+class ScoreIndex:
+    """
+    Per-segment arrays of (probability ascending, customer id)
+
+    A global sorted id -> segment code lookup lets rescored customers be removed
+    from their old segment before they are merged into the new one.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else DEFAULT_INDEX_PATH
+        self.model_version = ""
+        self._segment_keys: List[Tuple[str, str]] = []
+        self._segments: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._ids = np.empty(0, dtype=np.int64)
+        self._codes = np.empty(0, dtype=np.int16)
+        self._mtime = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # ==================== Persistence ====================
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "ScoreIndex":
+        """Load an index from disk, or return an empty one if it does not exist"""
+        index = cls(path)
+        index.reload_if_changed()
+        return index
+
+    def reload_if_changed(self) -> bool:
+        """Reload from disk when the file was rewritten (e.g. by a nightly batch run)"""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return False
+        if mtime == self._mtime:
+            return False
+
+        with self._lock:
+            with np.load(self.path, allow_pickle=False) as data:
+                keys = [tuple(key.split("|", 1)) for key in data["segment_keys"].tolist()]
+                ids, probs, codes = data["customer_ids"], data["probabilities"], data["codes"]
+                model_version = str(data["model_version"])
+
+            self.clear(model_version)
+            self._segment_keys = keys
+            order = np.lexsort((probs, codes))
+            ids, probs, codes = ids[order], probs[order], codes[order]
+            bounds = np.searchsorted(codes, np.arange(len(keys) + 1))
+            for code in range(len(keys)):
+                lo, hi = bounds[code], bounds[code + 1]
+                self._segments[code] = (probs[lo:hi].copy(), ids[lo:hi].copy())
+
+            by_id = np.argsort(ids, kind="stable")
+            self._ids, self._codes = ids[by_id], codes[by_id]
+            self._mtime = mtime
+        logger.info(f"✅ Score index loaded: {len(self)} customers in {len(keys)} segments")
+        return True
+
+    def save(self) -> None:
+        """Atomically write the index to disk"""
+        with self._lock:
+            codes = [np.full(len(ids), code, dtype=np.int16)
+                     for code, (_, ids) in self._segments.items()]
+            segments = list(self._segments.values())
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as fh:
+                np.savez(
+                    fh,
+                    model_version=np.array(self.model_version),
+                    segment_keys=np.array(["|".join(key) for key in self._segment_keys]),
+                    customer_ids=np.concatenate([ids for _, ids in segments] or [self._ids]),
+                    probabilities=np.concatenate(
+                        [probs for probs, _ in segments] or [np.empty(0, dtype=np.float32)]
+                    ),
+                    codes=np.concatenate(codes or [np.empty(0, dtype=np.int16)])
+                )
+            os.replace(tmp_path, self.path)
+            self._mtime = os.stat(self.path).st_mtime
+
+    def clear(self, model_version: str = "") -> None:
+        """Drop every entry"""
+        with self._lock:
+            self.model_version = model_version
+            self._segment_keys = []
+            self._segments = {}
+            self._ids = np.empty(0, dtype=self._ids.dtype)
+            self._codes = np.empty(0, dtype=np.int16)
+
+    # ==================== Updates ====================
+
+    def _segment_code(self, key: Tuple[str, str]) -> int:
+        if key not in self._segment_keys:
+            self._segment_keys.append(key)
+            self._segments[len(self._segment_keys) - 1] = (
+                np.empty(0, dtype=np.float32), np.empty(0, dtype=self._ids.dtype)
+            )
+        return self._segment_keys.index(key)
+
+    def update(self, ids: np.ndarray, probs: np.ndarray,
+               provinces: np.ndarray, providers: np.ndarray) -> None:
+        """
+        Insert or replace the scores of rescored customers
+
+        Args:
+            ids: Customer ids (int64 or str), unique
+            probs: Churn probabilities (0-1)
+            provinces: Province of each customer
+            providers: Provider of each customer
+        """
+        if len(ids) == 0:
+            return
+        probs = np.asarray(probs, dtype=np.float32)
+        providers = np.array([PROVIDER_ALIASES.get(p, p) for p in np.asarray(providers, dtype=str)])
+        provinces = np.asarray(provinces, dtype=str)
+
+        with self._lock:
+            if len(self) == 0 or self._ids.dtype.kind == "U":
+                self._ids = self._ids.astype(np.result_type(self._ids, ids))
+
+            # Remove rescored customers from their current segments
+            positions = np.minimum(np.searchsorted(self._ids, ids), max(len(self) - 1, 0))
+            found = (self._ids[positions] == ids) if len(self) else np.zeros(len(ids), dtype=bool)
+            old_codes = self._codes[positions[found]]
+            for code in np.unique(old_codes):
+                seg_probs, seg_ids = self._segments[code]
+                keep = ~np.isin(seg_ids, ids[found][old_codes == code])
+                self._segments[code] = (seg_probs[keep], seg_ids[keep])
+
+            # Merge the new scores into their segments
+            new_codes = np.empty(len(ids), dtype=np.int16)
+            segment_pairs, inverse = np.unique(
+                np.stack([provinces, providers], axis=1), axis=0, return_inverse=True
+            )
+            for pair_idx, (province, provider) in enumerate(segment_pairs):
+                code = self._segment_code((str(province), str(provider)))
+                rows = np.flatnonzero(inverse.reshape(-1) == pair_idx)
+                rows = rows[np.argsort(probs[rows], kind="stable")]
+                seg_probs, seg_ids = self._segments[code]
+                seg_ids = seg_ids.astype(self._ids.dtype, copy=False)
+                insert_at = np.searchsorted(seg_probs, probs[rows])
+                self._segments[code] = (
+                    np.insert(seg_probs, insert_at, probs[rows]),
+                    np.insert(seg_ids, insert_at, ids[rows])
+                )
+                new_codes[rows] = code
+
+            # Refresh the id -> segment lookup
+            self._codes[positions[found]] = new_codes[found]
+            new = ~found
+            if new.any():
+                order = np.argsort(ids[new], kind="stable")
+                new_ids, codes = ids[new][order], new_codes[new][order]
+                insert_at = np.searchsorted(self._ids, new_ids)
+                self._ids = np.insert(self._ids, insert_at, new_ids)
+                self._codes = np.insert(self._codes, insert_at, codes)
+
+    # ==================== Queries ====================
+
+    def _matching_codes(self, province: Optional[str], provider: Optional[str]) -> List[int]:
+        provider = PROVIDER_ALIASES.get(provider, provider)
+        return [
+            code for code, (seg_province, seg_provider) in enumerate(self._segment_keys)
+            if (province is None or seg_province == province)
+            and (provider is None or seg_provider == provider)
+        ]
+
+    def top_k(self, k: int, province: Optional[str] = None,
+              provider: Optional[str] = None) -> List[Dict]:
+        """Return the k highest-probability customers, optionally within a segment"""
+        with self._lock:
+            candidates = []
+            for code in self._matching_codes(province, provider):
+                seg_probs, seg_ids = self._segments[code]
+                tail = slice(max(len(seg_probs) - k, 0), len(seg_probs))
+                candidates.append((seg_probs[tail], seg_ids[tail], code))
+        if not candidates:
+            return []
+
+        probs = np.concatenate([c[0] for c in candidates])
+        ids = np.concatenate([c[1] for c in candidates])
+        codes = np.concatenate([np.full(len(c[0]), c[2]) for c in candidates])
+        order = np.argsort(-probs, kind="stable")[:k]
+        return [
+            {
+                "customer_id": ids[i].item(),
+                "churn_probability": round(float(probs[i]) * 100, 2),
+                "province": self._segment_keys[codes[i]][0],
+                "provider": self._segment_keys[codes[i]][1]
+            }
+            for i in order
+        ]
+
+    def count_above(self, threshold: float, province: Optional[str] = None,
+                    provider: Optional[str] = None) -> int:
+        """Count customers with probability >= threshold, optionally within a segment"""
+        with self._lock:
+            return int(sum(
+                len(seg_probs) - np.searchsorted(seg_probs, threshold, side="left")
+                for seg_probs, _ in (self._segments[code]
+                                     for code in self._matching_codes(province, provider))
+            ))
+
+    def segment_sizes(self) -> Dict[str, int]:
+        """Number of indexed customers per segment"""
+        with self._lock:
+            return {
+                f"{province}|{provider}": len(self._segments[code][0])
+                for code, (province, provider) in enumerate(self._segment_keys)
+            }
@@ -0,0 +1,372 @@
+"""
+Per-Segment Models
+Small networks for each provider (or province), trained on the shared encoder
+and scaler of the global model. Their weights are stacked into one array per
+layer (segment, inputs, outputs) so every segment is loaded at once; a batch
+is grouped by segment and each group is scored in one vectorized pass. Rows
+whose segment has no network of its own are left to the global model.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+try:
+    from src.drift import CATEGORICAL_PREFIXES
+except ImportError:
+    from drift import CATEGORICAL_PREFIXES
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = "segment_models.npz"
+
+# Label column of the cleaned training data
+TARGET_COLUMN = "churn"
+
+
+def _section(config=None):
+    """The [segments] section (of load_config() by default), or an empty mapping"""
+    if config is None:
+        try:
+            from src.config import load_config
+        except ImportError:
+            from config import load_config
+        config = load_config()
+    return config["segments"] if config.has_section("segments") else {}
+
+
+def model_file(model_dir: Path, config=None) -> Path:
+    """Where [segments] model_file lives for a model directory"""
+    return Path(model_dir) / _section(config).get("model_file", MODEL_FILE)
+
+
+def _enabled(section) -> bool:
+    return str(section.get("enabled", "false")).lower() in ("1", "true", "yes", "on")
+
+
+def _hidden_units(section) -> List[int]:
+    return [int(units) for units in str(section.get("hidden_units", "16,8")).split(",") if units.strip()]
+
+
+class SegmentModels:
+    """
+    Stacked per-segment networks (ReLU hidden layers, sigmoid output)
+
+    Args:
+        segment_by: Categorical feature the segments come from (province or provider)
+        segments: Segment values that have a network, in stacking order
+        train_columns: Encoded columns the networks take, in order
+        kernels: One (n_segments, n_inputs, n_outputs) float32 array per layer
+        biases: One (n_segments, n_outputs) float32 array per layer
+    """
+
+    def __init__(self, segment_by: str, segments: Sequence[str], train_columns: List[str],
+                 kernels: List[np.ndarray], biases: List[np.ndarray], path: Optional[Path] = None):
+        if segment_by not in CATEGORICAL_PREFIXES:
+            raise ValueError(f"segment_by must be one of {', '.join(CATEGORICAL_PREFIXES)}, got {segment_by!r}")
+        prefix = CATEGORICAL_PREFIXES[segment_by]
+        missing = [name for name in segments if f"{prefix}{name}" not in train_columns]
+        if missing:
+            raise ValueError(f"No encoded column for {segment_by} {missing}")
+        self.segment_by = segment_by
+        self.segments = list(segments)
+        self.train_columns = list(train_columns)
+        self.kernels = [np.ascontiguousarray(kernel, dtype=np.float32) for kernel in kernels]
+        self.biases = [np.ascontiguousarray(bias, dtype=np.float32) for bias in biases]
+        self.path = path
+        # One-hot column of each segment in the shared encoding
+        self.positions = [self.train_columns.index(f"{prefix}{name}") for name in self.segments]
+
+    @classmethod
+    def from_config(cls, config, model_dir: Path, train_columns: List[str]) -> Optional["SegmentModels"]:
+        """Models configured by the [segments] section, or None when disabled or not trained"""
+        section = _section(config)
+        if not _enabled(section):
+            return None
+        path = model_file(model_dir, config)
+        if not path.exists():
+            logger.warning(f"⚠️ Segment models not found at {path} (python main.py --train-segment-models), "
+                           f"using the global model only")
+            return None
+        try:
+            models = cls.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️ Could not load segment models: {str(e)}")
+            return None
+        if models.train_columns != list(train_columns):
+            logger.warning("⚠️ Segment models were trained on different columns, using the global model only")
+            return None
+        logger.info(f"✅ Segment models loaded: {len(models.segments)} {models.segment_by} networks")
+        return models
+
+    def save(self, path: Path) -> Path:
+        """Write the stacked weights to an .npz file (no pickled objects)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "segment_by": np.array(self.segment_by),
+            "segments": np.array(self.segments),
+            "train_columns": np.array(self.train_columns)
+        }
+        for layer, (kernel, bias) in enumerate(zip(self.kernels, self.biases)):
+            arrays[f"kernel_{layer}"] = kernel
+            arrays[f"bias_{layer}"] = bias
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+        self.path = path
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "SegmentModels":
+        with np.load(path, allow_pickle=False) as data:
+            layers = sum(1 for name in data.files if name.startswith("kernel_"))
+            return cls(
+                str(data["segment_by"]), data["segments"].tolist(), data["train_columns"].tolist(),
+                [data[f"kernel_{layer}"] for layer in range(layers)],
+                [data[f"bias_{layer}"] for layer in range(layers)],
+                path=Path(path)
+            )
+
+    def segment_codes(self, encoded: np.ndarray) -> np.ndarray:
+        """Index into segments of each row's segment, -1 when it has no network"""
+        return _onehot_codes(encoded, self.positions)
+
+    def _forward(self, segment: int, rows: np.ndarray) -> np.ndarray:
+        hidden = rows
+        for kernel, bias in zip(self.kernels[:-1], self.biases[:-1]):
+            hidden = np.maximum(hidden @ kernel[segment] + bias[segment], 0)
+        logits = (hidden @ self.kernels[-1][segment] + self.biases[-1][segment]).reshape(-1)
+        # Sigmoid without overflow for large negative logits
+        return 0.5 * (1 + np.tanh(0.5 * logits))
+
+    def predict_proba(self, scaled: np.ndarray, codes: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Churn probabilities from each row's segment network, one pass per segment
+
+        Args:
+            scaled: Encoded and scaled rows
+            codes: Precomputed segment_codes(scaled)
+
+        Returns:
+            float32 probabilities (0-1); NaN for rows without a segment network
+        """
+        scaled = np.asarray(scaled, dtype=np.float32)
+        codes = self.segment_codes(scaled) if codes is None else codes
+        probs = np.full(len(scaled), np.nan, dtype=np.float32)
+        # Sort once, then each segment's rows are one contiguous run of the order
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(self.segments) + 1))
+        for segment in range(len(self.segments)):
+            rows = order[bounds[segment]:bounds[segment + 1]]
+            if len(rows):
+                probs[rows] = self._forward(segment, scaled[rows])
+        return probs
+
+    def _backward(self, segment: int, rows: np.ndarray) -> np.ndarray:
+        """d(probability)/d(input) of one segment network, by backpropagation"""
+        hidden, masks = rows, []
+        for kernel, bias in zip(self.kernels[:-1], self.biases[:-1]):
+            pre = hidden @ kernel[segment] + bias[segment]
+            masks.append(pre > 0)
+            hidden = np.maximum(pre, 0)
+        logits = (hidden @ self.kernels[-1][segment] + self.biases[-1][segment]).reshape(-1)
+        probs = 0.5 * (1 + np.tanh(0.5 * logits))
+        grads = (probs * (1 - probs))[:, None] * self.kernels[-1][segment].T
+        for kernel, mask in zip(reversed(self.kernels[:-1]), reversed(masks)):
+            grads = (grads * mask) @ kernel[segment].T
+        return grads
+
+    def input_gradients(self, scaled: np.ndarray, codes: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Gradient of each row's segment network output with respect to its input
+
+        Args:
+            scaled: Encoded and scaled rows
+            codes: Precomputed segment_codes(scaled)
+
+        Returns:
+            float32 gradients, shape of scaled; NaN rows for rows without a segment network
+        """
+        scaled = np.asarray(scaled, dtype=np.float32)
+        codes = self.segment_codes(scaled) if codes is None else codes
+        grads = np.full(scaled.shape, np.nan, dtype=np.float32)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(self.segments) + 1))
+        for segment in range(len(self.segments)):
+            rows = order[bounds[segment]:bounds[segment + 1]]
+            if len(rows):
+                grads[rows] = self._backward(segment, scaled[rows])
+        return grads
+
+    def info(self) -> Dict:
+        return {
+            "segment_by": self.segment_by,
+            "segments": self.segments,
+            "hidden_units": [kernel.shape[2] for kernel in self.kernels[:-1]],
+            "file": self.path.name if self.path else None
+        }
+
+
+def _onehot_codes(encoded: np.ndarray, positions: List[int]) -> np.ndarray:
+    """Which of the one-hot columns at positions is set in each row, -1 for none"""
+    codes = np.full(len(encoded), -1, dtype=np.int64)
+    if positions and len(encoded):
+        onehot = encoded[:, positions]
+        matched = onehot.max(axis=1) > 0
+        codes[matched] = onehot[matched].argmax(axis=1)
+    return codes
+
+
+# ==================== Training and evaluation ====================
+
+def _split(n_rows: int, test_size: float, seed: int):
+    """Train/test row indices; the same split the training notebook uses (random_state=42)"""
+    from sklearn.model_selection import train_test_split
+    return train_test_split(np.arange(n_rows), test_size=test_size, random_state=seed)
+
+
+def _labelled_data(model_service, csv_path: Optional[Path]):
+    try:
+        from src.feature_store import DEFAULT_SOURCE_CSV, load_customer_frame
+    except ImportError:
+        from feature_store import DEFAULT_SOURCE_CSV, load_customer_frame
+
+    csv_path = Path(csv_path) if csv_path else DEFAULT_SOURCE_CSV
+    customers = load_customer_frame(csv_path)
+    if TARGET_COLUMN not in customers:
+        raise ValueError(f"{csv_path} has no {TARGET_COLUMN!r} column")
+    scaled = model_service.scale_encoded(model_service.encode_batch(customers))
+    return scaled, customers[TARGET_COLUMN].to_numpy(dtype=np.float32)
+
+
+def train_segment_models(model_service, csv_path: Optional[Path] = None, config=None) -> Path:
+    """
+    Train one small network per segment and save them stacked beside the model
+
+    Rows are encoded and scaled by model_service, so the segment networks
+    share the global model's encoder. [segments] sets the segment feature,
+    hidden_units, epochs, batch_size, test_size (held out for the report)
+    and min_rows (smaller segments keep using the global model).
+
+    Args:
+        model_service: Loaded ChurnModelService
+        csv_path: Cleaned data CSV with a churn column (defaults to data/cleaned_churn_data.csv)
+        config: Parsed config.ini (defaults to load_config())
+
+    Returns:
+        Path of the saved segment models
+    """
+    from tensorflow import keras
+
+    section = _section(config)
+    segment_by = section.get("segment_by", "provider")
+    hidden_units = _hidden_units(section)
+    epochs = int(section.get("epochs", 30))
+    batch_size = int(section.get("batch_size", 64))
+    min_rows = int(section.get("min_rows", 500))
+    seed = int(section.get("seed", 42))
+
+    if segment_by not in CATEGORICAL_PREFIXES:
+        raise ValueError(f"[segments] segment_by must be one of {', '.join(CATEGORICAL_PREFIXES)}, got {segment_by!r}")
+
+    train_columns = list(model_service.train_columns)
+    prefix = CATEGORICAL_PREFIXES[segment_by]
+    candidates = [(i, col[len(prefix):]) for i, col in enumerate(train_columns) if col.startswith(prefix)]
+    scaled, labels = _labelled_data(model_service, csv_path)
+    train_rows, _ = _split(len(scaled), float(section.get("test_size", 0.2)), seed)
+    all_codes = _onehot_codes(scaled[train_rows], [i for i, _ in candidates])
+
+    keras.utils.set_random_seed(seed)
+    segments, layer_weights = [], []
+    for code, (_, name) in enumerate(candidates):
+        rows = train_rows[all_codes == code]
+        if len(rows) < min_rows:
+            logger.warning(f"⚠️ {segment_by} {name}: {len(rows)} training rows (< {min_rows}), left to the global model")
+            continue
+        network = keras.Sequential(
+            [keras.Input(shape=(len(train_columns),))]
+            + [keras.layers.Dense(units, activation="relu") for units in hidden_units]
+            + [keras.layers.Dense(1, activation="sigmoid")]
+        )
+        network.compile(optimizer="adam", loss="binary_crossentropy", metrics=["accuracy"])
+        network.fit(scaled[rows], labels[rows], epochs=epochs, batch_size=batch_size, verbose=0)
+        segments.append(name)
+        layer_weights.append([layer.get_weights() for layer in network.layers])
+        logger.info(f"✅ Trained {segment_by} {name} on {len(rows)} rows")
+
+    if not segments:
+        raise ValueError(f"No {segment_by} has {min_rows} training rows")
+    kernels = [np.stack([weights[layer][0] for weights in layer_weights]) for layer in range(len(hidden_units) + 1)]
+    biases = [np.stack([weights[layer][1] for weights in layer_weights]) for layer in range(len(hidden_units) + 1)]
+    path = SegmentModels(segment_by, segments, train_columns, kernels, biases).save(
+        model_file(model_service.model_dir, config)
+    )
+    logger.info(f"✅ Segment models written to {path}")
+    return path
+
+
+def _auc(labels: np.ndarray, probs: np.ndarray) -> Optional[float]:
+    if len(np.unique(labels)) < 2:
+        return None
+    from sklearn.metrics import roc_auc_score
+    return float(roc_auc_score(labels, probs))
+
+
+def segment_report(model_service, segment_models: SegmentModels, csv_path: Optional[Path] = None,
+                   config=None) -> pd.DataFrame:
+    """
+    Held-out accuracy and AUC of the global and segment networks, per segment
+
+    Scores the rows the training split held out ([segments] test_size and
+    seed) with both the global network and each row's segment network (the
+    global one where it has none).
+
+    Returns:
+        One row per segment plus "All": rows, churn rate and global/segment
+        accuracy and AUC
+    """
+    section = _section(config)
+    scaled, labels = _labelled_data(model_service, csv_path)
+    _, test_rows = _split(len(scaled), float(section.get("test_size", 0.2)), int(section.get("seed", 42)))
+    scaled, labels = scaled[test_rows], labels[test_rows]
+
+    global_probs = model_service.predict_proba_global(scaled)
+    codes = segment_models.segment_codes(scaled)
+    segment_probs = segment_models.predict_proba(scaled, codes)
+    segment_probs = np.where(codes >= 0, segment_probs, global_probs)
+
+    threshold = model_service.CHURN_THRESHOLD
+    groups = [(name, codes == code) for code, name in enumerate(segment_models.segments)]
+    groups.append(("All", np.ones(len(labels), dtype=bool)))
+    report = []
+    for name, rows in groups:
+        if not rows.any():
+            continue
+        report.append({
+            "segment": name,
+            "rows": int(rows.sum()),
+            "churn_rate": float(labels[rows].mean()),
+            "global_accuracy": float(((global_probs[rows] > threshold) == labels[rows]).mean()),
+            "segment_accuracy": float(((segment_probs[rows] > threshold) == labels[rows]).mean()),
+            "global_auc": _auc(labels[rows], global_probs[rows]),
+            "segment_auc": _auc(labels[rows], segment_probs[rows])
+        })
+    return pd.DataFrame(report)
+
+
+def print_segment_report(report: pd.DataFrame, segment_by: str) -> None:
+    """Human-readable segment_report"""
+    def pct(value):
+        return f"{value * 100:>11.2f}%"
+
+    def auc(value):
+        return f"{value:>12.3f}" if value is not None and not pd.isna(value) else f"{'-':>12}"
+
+    print(f"\nHeld-out accuracy by {segment_by} (global network vs segment networks)")
+    print(f"  {'segment':<22}{'rows':>8}{'churn':>12}{'global acc':>12}{'segment acc':>12}"
+          f"{'global auc':>12}{'segment auc':>12}")
+    for row in report.itertuples(index=False):
+        print(f"  {row.segment:<22}{row.rows:>8}{pct(row.churn_rate)}{pct(row.global_accuracy)}"
+              f"{pct(row.segment_accuracy)}{auc(row.global_auc)}{auc(row.segment_auc)}")
@@ -0,0 +1,20 @@
+"""
+Streamlit UI Pages
+One module per page of the sidebar navigation, imported the first time the
+page is shown; each exposes render()
+"""
+
+import importlib
+
+# Sidebar label -> module in this package
+PAGES = {
+    "Single Prediction": "single_prediction",
+    "Batch Prediction": "batch_prediction",
+    "Analytics Dashboard": "analytics",
+    "Prediction History": "history"
+}
+
+
+def load_page(name: str):
+    """Import (once per process) and return the module that renders a page"""
+    return importlib.import_module(f"{__name__}.{PAGES[name]}")
@@ -0,0 +1,63 @@
+"""
+Analytics Dashboard Page
+Segment metrics and distributions from the history's running aggregates
+"""
+
+import streamlit as st
+
+from .common import fragment, get_history_store
+from .charts import churn_distribution_chart, probability_histogram_chart, risk_distribution_chart
+
+
+def render():
+    st.markdown("### 📊 Analytics Dashboard")
+
+    if len(get_history_store()):
+        segment_dashboard()
+    else:
+        st.info("📊 No predictions yet. Make some predictions to see analytics!")
+
+
+@fragment
+def segment_dashboard():
+    """Segment picker, metrics and charts; changing the segment reruns only this section"""
+    # Running aggregates: constant work per rerun regardless of history size
+    analytics = get_history_store().aggregates.snapshot()
+    segment_options = ["All Customers"] + [
+        f"Province: {name}" for name in sorted(analytics["by_province"])
+    ] + [
+        f"Provider: {name}" for name in sorted(analytics["by_provider"])
+    ]
+    segment = st.selectbox("Segment", segment_options)
+    if segment.startswith("Province: "):
+        stats = analytics["by_province"][segment[len("Province: "):]]
+    elif segment.startswith("Provider: "):
+        stats = analytics["by_provider"][segment[len("Provider: "):]]
+    else:
+        stats = analytics["overall"]
+
+    # Key Metrics
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Predictions", stats["count"])
+    with col2:
+        st.metric("Churn Rate", f"{stats['churn_rate']:.1f}%")
+    with col3:
+        st.metric("Avg Risk", f"{stats['mean_probability']:.1f}%")
+    with col4:
+        st.metric("High Risk Count", stats["risk_counts"]["HIGH"])
+
+    st.divider()
+
+    # Charts (cached on the counts, so an unchanged segment is not rebuilt)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(risk_distribution_chart(stats["risk_counts"]), use_container_width=True)
+    with col2:
+        st.plotly_chart(churn_distribution_chart(stats["churn_counts"]), use_container_width=True)
+
+    # Probability Distribution (fixed 20-bin histogram)
+    st.plotly_chart(
+        probability_histogram_chart(stats["histogram"]["edges"], stats["histogram"]["counts"]),
+        use_container_width=True
+    )
@@ -0,0 +1,123 @@
+"""
+Batch Prediction Page
+Scores an uploaded CSV in chunks and shows summary statistics and results
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from .common import get_model_service, save_predictions, validate_batch
+from .charts import create_comparison_chart
+
+# Rows read from an uploaded CSV and scored per vectorized batch
+BATCH_CHUNK_SIZE = 5000
+
+# Read as text so names like "1001" and categorical cells validate as strings
+TEXT_COLUMNS = {"name": str, "gender": str, "province": str, "provider": str}
+
+
+def render():
+    model_service = get_model_service()
+
+    st.markdown("### 📦 Batch Customer Prediction")
+    st.markdown("Upload a CSV file with multiple customers to predict churn for all at once.")
+
+    uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
+
+    if uploaded_file:
+        try:
+            st.write(f"📄 Loaded {uploaded_file.name} ({uploaded_file.size / 1024:,.0f} KB)")
+
+            # Display sample
+            with st.expander("View Sample Data"):
+                uploaded_file.seek(0)
+                st.dataframe(pd.read_csv(uploaded_file, nrows=5), use_container_width=True)
+
+            if st.button("🔮 Predict All Customers", type="primary", use_container_width=True):
+                with st.spinner("🔄 Processing batch predictions..."):
+                    predictions = []
+                    rejected = []
+                    progress_text = st.empty()
+                    processed = 0
+
+                    uploaded_file.seek(0)
+                    for chunk in pd.read_csv(uploaded_file, chunksize=BATCH_CHUNK_SIZE, dtype=TEXT_COLUMNS):
+                        try:
+                            valid, errors = validate_batch(chunk_records(chunk))
+                            results = model_service.predict_batch(valid) if len(valid) else []
+                            predictions.extend(results)
+                            save_predictions(results, valid)
+                            names = chunk["name"].tolist() if "name" in chunk else [None] * len(chunk)
+                            rejected.extend(
+                                {"row": processed + row + 1, "customer_name": names[row],
+                                 "error": "; ".join(messages)}
+                                for row, messages in sorted(errors.items())
+                            )
+                        except Exception as e:
+                            st.warning(f"Skipped rows {processed + 1}-{processed + len(chunk)}: {str(e)}")
+
+                        processed += len(chunk)
+                        progress_text.caption(f"Processed {processed:,} rows")
+
+                    st.success(f"✅ Processed {len(predictions)} customers")
+                    if rejected:
+                        st.warning(f"⚠️ {len(rejected)} rows were not scored because of invalid values")
+                        with st.expander("View Rejected Rows"):
+                            st.dataframe(pd.DataFrame(rejected), use_container_width=True)
+                    if predictions:
+                        render_results(pd.DataFrame(predictions))
+        except Exception as e:
+            st.error(f"❌ Error reading file: {str(e)}")
+
+
+def chunk_records(chunk: pd.DataFrame) -> list:
+    """CSV rows as records for validate_batch, with empty cells as missing values"""
+    return chunk.astype(object).where(chunk.notna(), None).to_dict("records")
+
+
+def render_results(results_df: pd.DataFrame):
+    """Statistics, table, comparison chart and download of a scored batch"""
+    # Statistics
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        churn_count = (results_df["churn_prediction"] == "CHURN").sum()
+        st.metric("Churn Risk", f"{churn_count}/{len(results_df)}")
+    with col2:
+        high_risk = (results_df["risk_level"] == "HIGH").sum()
+        st.metric("High Risk", f"{high_risk}/{len(results_df)}")
+    with col3:
+        avg_prob = results_df["churn_probability"].mean()
+        st.metric("Avg Risk %", f"{avg_prob:.1f}%")
+    with col4:
+        medium_risk = (results_df["risk_level"] == "MEDIUM").sum()
+        st.metric("Medium Risk", f"{medium_risk}/{len(results_df)}")
+
+    st.divider()
+
+    # Results Table
+    st.subheader("📋 Prediction Results")
+    st.dataframe(results_df, use_container_width=True)
+
+    # Comparison Chart
+    comparison_data = results_df.head(15).to_dict('records')
+    if comparison_data:
+        comparison_data = [
+            {
+                "name": d.get("customer_name", "Unknown"),
+                "probability": d.get("churn_probability", 0) / 100
+            }
+            for d in comparison_data
+        ]
+        st.plotly_chart(create_comparison_chart(comparison_data), use_container_width=True)
+
+    # Download Results
+    csv_download = results_df.to_csv(index=False).encode('utf-8')
+    st.download_button(
+        label="📥 Download Results as CSV",
+        data=csv_download,
+        file_name=f"churn_predictions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+        mime="text/csv",
+        use_container_width=True
+    )
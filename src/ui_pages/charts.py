@@ -0,0 +1,141 @@
+"""
+UI Charts
+Plotly figures for the UI pages. Plotly is imported on the first chart drawn,
+so pages without charts never load it; figures built only from aggregate
+counts are cached across reruns.
+"""
+
+from typing import TYPE_CHECKING, Dict, Sequence
+
+import numpy as np
+import streamlit as st
+
+from .common import RISK_COLORS, risk_color, thresholds
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+
+def create_risk_gauge(probability: float) -> "go.Figure":
+    """Create a gauge chart for risk visualization"""
+    import plotly.graph_objects as go
+
+    low, medium = thresholds.low_risk_max * 100, thresholds.medium_risk_max * 100
+
+    fig = go.Figure(data=[go.Indicator(
+        mode="gauge+number+delta",
+        value=probability * 100,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Churn Risk %"},
+        delta={'reference': thresholds.churn_threshold * 100, 'suffix': " vs baseline"},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': risk_color(probability)},
+            'steps': [
+                {'range': [0, low], 'color': "rgba(48, 207, 208, 0.2)"},
+                {'range': [low, medium], 'color': "rgba(250, 112, 154, 0.2)"},
+                {'range': [medium, 100], 'color': "rgba(245, 87, 108, 0.2)"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 90
+            }
+        }
+    )])
+    fig.update_layout(height=400, margin=dict(l=20, r=20, t=70, b=20))
+    return fig
+
+
+def create_comparison_chart(customers_data: list) -> "go.Figure":
+    """Create comparison chart for multiple customers"""
+    import plotly.graph_objects as go
+
+    names = [c['name'] for c in customers_data]
+    probs = [c['probability'] for c in customers_data]
+
+    fig = go.Figure(data=[
+        go.Bar(x=names, y=[p*100 for p in probs], marker_color=[risk_color(p) for p in probs])
+    ])
+    fig.update_layout(
+        title="Customer Churn Risk Comparison",
+        yaxis_title="Churn Probability (%)",
+        xaxis_title="Customer Name",
+        height=400,
+        hovermode='x unified'
+    )
+    return fig
+
+
+def create_whatif_heatmap(probs: np.ndarray, x_feature: str, x_values: np.ndarray,
+                          y_feature: str, y_values: np.ndarray, current: dict) -> "go.Figure":
+    """Create a churn probability heatmap over two adjustable features"""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[go.Heatmap(
+        x=x_values, y=y_values, z=probs * 100,
+        zmin=0, zmax=100,
+        colorscale=[[0, "#30cfd0"], [0.45, "#fa709a"], [1, "#f5576c"]],
+        colorbar={"title": "Churn %"}
+    )])
+    fig.add_trace(go.Scatter(
+        x=[current[x_feature]], y=[current[y_feature]], mode="markers",
+        marker={"symbol": "x", "size": 14, "color": "black"}, name="Current"
+    ))
+    fig.update_layout(
+        title="What-If Churn Probability",
+        xaxis_title=x_feature, yaxis_title=y_feature,
+        height=450
+    )
+    return fig
+
+
+def create_whatif_line(probs: np.ndarray, x_feature: str, x_values: np.ndarray) -> "go.Figure":
+    """Create a churn probability curve over one adjustable feature"""
+    import plotly.express as px
+
+    return px.line(
+        x=x_values, y=probs[0] * 100, markers=True,
+        title="What-If Churn Probability",
+        labels={"x": x_feature, "y": "Churn Probability (%)"}
+    )
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def risk_distribution_chart(risk_counts: Dict[str, int]) -> "go.Figure":
+    """Pie chart of predictions per risk level"""
+    import plotly.express as px
+
+    return px.pie(
+        values=list(risk_counts.values()), names=list(risk_counts.keys()),
+        title="Risk Level Distribution",
+        color=list(risk_counts.keys()),
+        color_discrete_map=RISK_COLORS
+    )
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def churn_distribution_chart(churn_counts: Dict[str, int]) -> "go.Figure":
+    """Bar chart of predictions per churn outcome"""
+    import plotly.express as px
+
+    return px.bar(
+        x=list(churn_counts.keys()), y=list(churn_counts.values()),
+        title="Churn Prediction Distribution",
+        labels={"x": "Prediction", "y": "Count"}
+    )
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def probability_histogram_chart(edges: Sequence[float], counts: Sequence[int]) -> "go.Figure":
+    """Bar chart of a fixed-bin probability histogram"""
+    import plotly.express as px
+
+    edges = np.asarray(edges)
+    fig = px.bar(
+        x=(edges[:-1] + edges[1:]) / 2, y=counts,
+        title="Churn Probability Distribution",
+        labels={"x": "Churn Probability (%)", "y": "count"}
+    )
+    fig.update_traces(width=edges[1] - edges[0])
+    return fig
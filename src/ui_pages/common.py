@@ -0,0 +1,124 @@
+"""
+Shared UI State
+Process-wide services (history database, inference service), the risk
+thresholds and history helpers used by more than one page
+"""
+
+import gc
+import sys
+import uuid
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+# Handle imports for different deployment environments.
+# ChurnModelService (and with it TensorFlow) is only imported in local inference mode.
+try:
+    # Try absolute imports (for local/Docker)
+    from src.config import PROJECT_ROOT, get_settings, load_config
+    from src.api_client import ChurnApiClient
+    from src.history_store import HistoryDatabase, PredictionHistory
+    from src.batch_validation import validate_batch
+except ImportError:
+    try:
+        # Try relative imports (for Streamlit Cloud with src in path)
+        from config import PROJECT_ROOT, get_settings, load_config
+        from api_client import ChurnApiClient
+        from history_store import HistoryDatabase, PredictionHistory
+        from batch_validation import validate_batch
+    except ImportError:
+        # Add src directory to path and try again
+        sys.path.insert(0, str(Path(__file__).parent.parent))
+        from config import PROJECT_ROOT, get_settings, load_config
+        from api_client import ChurnApiClient
+        from history_store import HistoryDatabase, PredictionHistory
+        from batch_validation import validate_batch
+
+# Risk bands shared with the model service ([thresholds] in config.ini)
+thresholds = get_settings().thresholds
+
+RISK_COLORS = {"LOW": "#30cfd0", "MEDIUM": "#fa709a", "HIGH": "#f5576c"}
+
+# Widgets inside a fragment rerun only the fragment (st.fragment from Streamlit 1.37,
+# st.experimental_fragment from 1.33); older versions rerun the whole page
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+
+def risk_color(probability: float) -> str:
+    """Colour of the risk band a probability (0-1) falls in"""
+    if probability < thresholds.low_risk_max:
+        return RISK_COLORS["LOW"]
+    return RISK_COLORS["MEDIUM"] if probability < thresholds.medium_risk_max else RISK_COLORS["HIGH"]
+
+
+@st.cache_resource
+def get_history_database() -> HistoryDatabase:
+    """Process-wide connection to the prediction history file"""
+    ui_config = load_config()["ui"]
+    history_path = ui_config.get("history_path")
+    return HistoryDatabase(
+        PROJECT_ROOT / history_path if history_path else None,
+        retention_days=ui_config.getfloat("history_retention_days", 30)
+    )
+
+
+def get_history_store() -> PredictionHistory:
+    """This browser session's prediction history (bounded in memory, spilled to SQLite)"""
+    if "prediction_history" not in st.session_state:
+        session_id = st.session_state.setdefault("history_session_id", uuid.uuid4().hex)
+        st.session_state.prediction_history = PredictionHistory(
+            get_history_database(), session_id,
+            capacity=load_config()["ui"].getint("history_memory_rows", 10000)
+        )
+    return st.session_state.prediction_history
+
+
+@st.cache_resource
+def create_inference_service():
+    """Create the local model service or a pooled API client, per config.ini [ui]"""
+    ui_config = load_config()["ui"]
+    if ui_config.get("inference_mode", "local").strip().lower() == "remote":
+        return ChurnApiClient(
+            ui_config.get("api_url", "http://localhost:8000"),
+            timeout=ui_config.getfloat("api_timeout", 30.0),
+            pool_size=ui_config.getint("api_pool_size", 10),
+            batch_size=ui_config.getint("api_batch_size", 1000)
+        )
+
+    try:
+        from src.model_service import ChurnModelService
+    except ImportError:
+        from model_service import ChurnModelService
+    service = ChurnModelService()
+    if ui_config.getboolean("freeze_gc_after_load", False):
+        # Opt-in ([ui] freeze_gc_after_load): the cycle collector stops scanning every
+        # object alive now in the whole Streamlit server process, for good
+        gc.freeze()
+    return service
+
+
+def get_model_service():
+    """This session's inference service; stops the script if it cannot be created"""
+    if "model_service" not in st.session_state:
+        try:
+            st.session_state.model_service = create_inference_service()
+        except Exception as e:
+            st.error(f"❌ Failed to initialize model service: {str(e)}")
+            st.stop()
+    return st.session_state.model_service
+
+
+def save_prediction(prediction_result: dict, province: str = None, provider: str = None):
+    """Save prediction to history"""
+    get_history_store().append([prediction_result], [province], [provider])
+
+
+def save_predictions(prediction_results: list, customers: pd.DataFrame):
+    """Save the successful predictions of a batch to history with a shared timestamp"""
+    ok = [i for i, result in enumerate(prediction_results) if result.get("success")]
+    get_history_store().append(
+        [prediction_results[i] for i in ok],
+        customers["province"].iloc[ok].tolist() if "province" in customers else None,
+        customers["provider"].iloc[ok].tolist() if "provider" in customers else None
+    )
@@ -0,0 +1,79 @@
+"""
+Prediction History Page
+Filtered, paginated view of stored predictions with CSV export
+"""
+
+from datetime import datetime
+
+import streamlit as st
+
+from .common import fragment, get_history_store
+
+# Rows per page on the Prediction History page
+HISTORY_PAGE_SIZE = 100
+
+
+def render():
+    st.markdown("### 📜 Prediction History")
+
+    if len(get_history_store()):
+        history_table()
+    else:
+        st.info("📜 No prediction history yet.")
+
+
+def export_predictions(risk_levels: list, predictions: list):
+    """Export matching prediction history as CSV"""
+    history = get_history_store()
+    if len(history):
+        return history.query(risk_levels, predictions).to_csv(index=False).encode('utf-8')
+    return None
+
+
+@fragment
+def history_table():
+    """Filters, pagination and export; paging or filtering reruns only this section"""
+    history = get_history_store()
+
+    # Filters
+    col1, col2 = st.columns(2)
+    with col1:
+        risk_filter = st.multiselect(
+            "Filter by Risk Level",
+            ["LOW", "MEDIUM", "HIGH"],
+            default=["LOW", "MEDIUM", "HIGH"]
+        )
+    with col2:
+        churn_filter = st.multiselect(
+            "Filter by Prediction",
+            ["CHURN", "RETAIN"],
+            default=["CHURN", "RETAIN"]
+        )
+
+    # Paginate with indexed queries instead of loading the full history
+    matching = history.count(risk_filter, churn_filter)
+    total_pages = max((matching + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE, 1)
+    page_number = st.number_input(
+        f"Page (of {total_pages})", min_value=1, max_value=total_pages, value=1
+    )
+    page_df = history.query(
+        risk_filter, churn_filter,
+        limit=HISTORY_PAGE_SIZE, offset=(page_number - 1) * HISTORY_PAGE_SIZE
+    )
+    st.caption(f"{matching:,} matching predictions")
+    st.dataframe(page_df, use_container_width=True)
+
+    # Export (built on demand so reruns don't materialize every row)
+    if st.button("📦 Prepare CSV Export", use_container_width=True):
+        st.download_button(
+            label="📥 Download History",
+            data=export_predictions(risk_filter, churn_filter),
+            file_name=f"prediction_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+
+    # Clear History (a full rerun, so the page shows its empty state)
+    if st.button("🗑️ Clear History", type="secondary", use_container_width=True):
+        history.clear()
+        st.rerun()
@@ -0,0 +1,215 @@
+"""
+Single Prediction Page
+Customer form, prediction result and the What-If Explorer
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+try:
+    from src.whatif import WHATIF_FEATURES, feature_values, score_grid, cheapest_change
+except ImportError:
+    try:
+        from whatif import WHATIF_FEATURES, feature_values, score_grid, cheapest_change
+    except ImportError:
+        sys.path.insert(0, str(Path(__file__).parent.parent))
+        from whatif import WHATIF_FEATURES, feature_values, score_grid, cheapest_change
+
+from .common import fragment, get_model_service, save_prediction, thresholds
+from .charts import create_risk_gauge, create_whatif_heatmap, create_whatif_line
+
+
+def render():
+    model_service = get_model_service()
+
+    st.markdown("### 📋 Single Customer Prediction")
+    st.markdown("Enter customer details below to predict churn risk and get personalized retention recommendations.")
+
+    # Create two-column layout for inputs
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("👤 Demographics")
+        name = st.text_input("Customer Name", placeholder="e.g., Ram Kumar")
+        gender = st.selectbox("Gender", ["Male", "Female"])
+        age = st.number_input("Age", min_value=18, max_value=100, value=35)
+        num_dependents = st.number_input("Number of Dependents", min_value=0, max_value=10, value=2)
+
+        st.subheader("💰 Financial")
+        estimated_salary = st.number_input(
+            "Estimated Monthly Salary (NPR)",
+            min_value=0, value=50000, step=5000
+        )
+
+    with col2:
+        st.subheader("📱 Service Usage")
+        tenure_months = st.slider("Tenure (Months)", 0, 72, 24)
+        calls_made = st.number_input("Monthly Calls Made", min_value=0, value=45, step=5)
+        sms_sent = st.number_input("Monthly SMS Sent", min_value=0, value=30, step=5)
+        data_used = st.number_input("Monthly Data Used (MB)", min_value=0, value=1500, step=100)
+
+        st.subheader("🏢 Service Provider")
+        province = st.selectbox(
+            "Province",
+            ["Bagmati", "Gandaki", "Karnali", "Koshi", "Lumbini", "Madhesh", "Sudurpashchim"]
+        )
+        provider = st.selectbox("Provider", ["Ncell", "Nepal Telecom"])
+
+    customer_dict = {
+        "name": name,
+        "gender": gender,
+        "age": age,
+        "num_dependents": num_dependents,
+        "estimated_salary": estimated_salary,
+        "calls_made": calls_made,
+        "sms_sent": sms_sent,
+        "data_used": data_used,
+        "tenure_months": tenure_months,
+        "province": province,
+        "provider": provider
+    }
+
+    # Prediction Button
+    st.divider()
+    if st.button("🔮 Predict Churn Risk", use_container_width=True, type="primary"):
+        if not name:
+            st.warning("⚠️ Please enter customer name")
+        else:
+            with st.spinner("🔄 Analyzing customer data..."):
+                try:
+                    result = model_service.predict(customer_dict)
+
+                    if result.get("success"):
+                        # Save to history
+                        save_prediction(result, province, provider)
+                        render_result(result, customer_dict)
+                    else:
+                        st.error(f"❌ Prediction failed: {result.get('error', 'Unknown error')}")
+
+                except Exception as e:
+                    st.error(f"❌ Error: {str(e)}")
+
+    # What-If Explorer: score a grid of variants of this customer in one pass
+    st.divider()
+    whatif_explorer(model_service, {**customer_dict, "name": name or "What-If"})
+
+
+def render_result(result: dict, customer: dict):
+    """Prediction summary, risk gauge, recommendations and profile of one customer"""
+    st.success("✅ Prediction Complete!")
+    st.divider()
+
+    # Main Results
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        probability = result["churn_probability"] / 100
+        st.metric(
+            "Churn Prediction",
+            result["churn_prediction"],
+            f"{result['churn_probability']:.1f}%"
+        )
+
+    with col2:
+        risk_colors = {
+            "LOW": "🟢",
+            "MEDIUM": "🟡",
+            "HIGH": "🔴"
+        }
+        st.metric(
+            "Risk Level",
+            f"{risk_colors.get(result['risk_level'], '')} {result['risk_level']}"
+        )
+
+    with col3:
+        st.metric(
+            "Tenure",
+            f"{customer['tenure_months']} months",
+            f"Provider: {customer['provider']}"
+        )
+
+    st.divider()
+
+    # Gauge Chart
+    st.plotly_chart(create_risk_gauge(probability), use_container_width=True)
+
+    # Recommendations
+    st.subheader("💡 Retention Recommendations")
+    if result["recommendations"]:
+        for i, rec in enumerate(result["recommendations"], 1):
+            st.info(f"**{i}.** {rec}")
+    else:
+        st.success("No specific recommendations needed. Customer is stable.")
+
+    # Customer Profile Summary
+    with st.expander("📊 Customer Profile Summary"):
+        profile_data = {
+            "Metric": [
+                "Name", "Gender", "Age", "Province", "Provider",
+                "Salary", "Tenure", "Calls", "SMS", "Data Usage"
+            ],
+            "Value": [
+                customer["name"], customer["gender"], customer["age"], customer["province"],
+                customer["provider"], f"₹{customer['estimated_salary']:,.0f}",
+                f"{customer['tenure_months']}m", customer["calls_made"], customer["sms_sent"],
+                f"{customer['data_used']}MB"
+            ]
+        }
+        st.dataframe(pd.DataFrame(profile_data), use_container_width=True)
+
+
+@fragment
+def whatif_explorer(model_service, current: dict):
+    """Toggle, axis choices and grid of the What-If Explorer; its widgets rerun only this section"""
+    if not st.toggle("🧪 What-If Explorer", help="Explore how changing usage or tenure moves the churn risk"):
+        return
+
+    features = list(WHATIF_FEATURES)
+    col1, col2 = st.columns(2)
+    with col1:
+        x_feature = st.selectbox("X axis", features, index=features.index("tenure_months"))
+    with col2:
+        y_options = ["None"] + [f for f in features if f != x_feature]
+        y_feature = st.selectbox("Y axis", y_options, index=y_options.index("data_used") if "data_used" in y_options else 0)
+    y_feature = None if y_feature == "None" else y_feature
+
+    # Include the current values so "no change" is part of the grid
+    x_values = np.union1d(feature_values(x_feature), [current[x_feature]])
+    y_values = np.union1d(feature_values(y_feature), [current[y_feature]]) if y_feature else None
+    started = datetime.now()
+    probs = score_grid(model_service, current, x_feature, x_values, y_feature, y_values)
+    elapsed_ms = (datetime.now() - started).total_seconds() * 1000
+    st.caption(f"Scored {probs.size:,} variants in {elapsed_ms:.0f} ms")
+    failed = int(np.isnan(probs).sum())
+    if failed == probs.size:
+        st.error("❌ None of the variants could be scored")
+        return
+    if failed:
+        st.warning(f"⚠️ {failed:,} variants could not be scored and are left blank")
+
+    if y_feature:
+        fig = create_whatif_heatmap(probs, x_feature, x_values, y_feature, y_values, current)
+    else:
+        fig = create_whatif_line(probs, x_feature, x_values)
+    st.plotly_chart(fig, use_container_width=True)
+
+    best = cheapest_change(current, probs, x_feature, x_values, y_feature, y_values,
+                           max_probability=thresholds.medium_risk_max)
+    if best is None:
+        st.warning("⚠️ No variant in this grid moves the customer below HIGH risk")
+    elif best["cost"] == 0:
+        st.info(f"Customer is already below HIGH risk ({best['churn_probability']:.1f}%)")
+    else:
+        changes = ", ".join(
+            f"{feature}: {current[feature]:,.0f} → {value:,.0f}"
+            for feature, value in best["changes"].items()
+        )
+        st.success(
+            f"💡 Cheapest change below HIGH risk: {changes} "
+            f"(churn probability {best['churn_probability']:.1f}%)"
+        )
@@ -0,0 +1,105 @@
+"""
+What-If Sensitivity Explorer
+Scores a grid of variants of one customer in a single batched forward pass and
+finds the cheapest change that takes the customer out of the HIGH risk band
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+# Adjustable features with (min, max, default grid steps)
+WHATIF_FEATURES = {
+    "tenure_months": (0, 72, 37),
+    "data_used": (0, 10000, 41),
+    "estimated_salary": (0, 200000, 41),
+    "calls_made": (0, 200, 41),
+    "sms_sent": (0, 200, 41)
+}
+
+
+def feature_values(feature: str, steps: Optional[int] = None) -> np.ndarray:
+    """Evenly spaced values across a feature's what-if range"""
+    low, high, default_steps = WHATIF_FEATURES[feature]
+    return np.linspace(low, high, steps or default_steps)
+
+
+def score_grid(model_service, customer: Dict, x_feature: str, x_values: np.ndarray,
+               y_feature: Optional[str] = None,
+               y_values: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Score every combination of x_values (and optionally y_values) for one customer
+
+    Args:
+        model_service: ChurnModelService, or ChurnApiClient (predict_proba_batch)
+        customer: Customer dictionary (CustomerData fields)
+        x_feature: Feature varied along the x axis
+        x_values: Values for x_feature
+        y_feature: Optional feature varied along the y axis
+        y_values: Values for y_feature
+
+    Returns:
+        Churn probabilities (0-1) of shape (len(y_values), len(x_values)),
+        or (1, len(x_values)) for a one-dimensional sweep; NaN where a
+        variant could not be scored
+    """
+    if y_feature is None:
+        y_values = None
+    xs, ys = np.meshgrid(x_values, y_values if y_values is not None else [np.nan])
+    shape = xs.shape
+
+    if hasattr(model_service, "encode_batch"):
+        # Local model: encode the customer once and vary the encoded columns
+        base = model_service.encode_batch(pd.DataFrame([customer]))
+        grid = np.repeat(base, xs.size, axis=0)
+        grid[:, model_service.train_columns.index(x_feature)] = xs.ravel()
+        if y_values is not None:
+            grid[:, model_service.train_columns.index(y_feature)] = ys.ravel()
+        probs = model_service.predict_proba_encoded(
+            model_service.scale_encoded(grid), batch_size=len(grid)
+        )
+    else:
+        # Remote client: the variants are made up, so score them through the API's
+        # probability endpoint, which keeps them out of analytics, drift and audit
+        variants = pd.DataFrame([customer] * xs.size)
+        variants[x_feature] = xs.ravel()
+        if y_values is not None:
+            variants[y_feature] = ys.ravel()
+        probs = model_service.predict_proba_batch(variants)
+
+    return np.asarray(probs, dtype=np.float64).reshape(shape)
+
+
+def cheapest_change(customer: Dict, probs: np.ndarray, x_feature: str, x_values: np.ndarray,
+                    y_feature: Optional[str] = None, y_values: Optional[np.ndarray] = None,
+                    max_probability: float = 0.6) -> Optional[Dict]:
+    """
+    Find the grid variant below max_probability closest to the customer
+
+    Cost is the total change across the varied features, each measured as a
+    fraction of that feature's what-if range. Variants without a probability
+    (NaN) are never chosen.
+
+    Returns:
+        Dictionary with the new feature values, probability and cost, or None
+    """
+    xs, ys = np.meshgrid(x_values, y_values if y_values is not None else [np.nan])
+    x_low, x_high, _ = WHATIF_FEATURES[x_feature]
+    cost = np.abs(xs - customer.get(x_feature, 0)) / (x_high - x_low)
+    if y_values is not None:
+        y_low, y_high, _ = WHATIF_FEATURES[y_feature]
+        cost = cost + np.abs(ys - customer.get(y_feature, 0)) / (y_high - y_low)
+
+    cost = np.where(~np.isnan(probs) & (probs < max_probability), cost, np.inf)
+    best = np.unravel_index(np.argmin(cost), cost.shape)
+    if not np.isfinite(cost[best]):
+        return None
+
+    change = {x_feature: float(xs[best])}
+    if y_values is not None:
+        change[y_feature] = float(ys[best])
+    return {
+        "changes": change,
+        "churn_probability": round(float(probs[best]) * 100, 2),
+        "cost": round(float(cost[best]), 4)
+    }
@@ -12,5 +12,8 @@ src_path = Path(__file__).parent / "src"
 if str(src_path) not in sys.path:
     sys.path.insert(0, str(src_path))
 
-# Now import and run the UI
-from ui import *  # noqa: F401, F403
+# Now import and run the UI. The import is cached after the first run, so
+# main() is called explicitly to redraw the app on every rerun.
+from ui import main
+
+main()
@@ -0,0 +1,6 @@
+"""Make the project importable as in the application (src.*, benchmarks.*)"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
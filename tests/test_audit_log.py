@@ -0,0 +1,99 @@
+"""
+AuditLog round trip: records appended across segment rotations read back intact
+"""
+
+import numpy as np
+import pytest
+
+from src.audit_log import (
+    HEADER_SIZE, MODEL_VERSION_BYTES, RISK_LEVELS, AuditLog, iter_records, read_segment,
+    record_dtype, segment_paths
+)
+
+COLUMNS = ["gender", "age", "calls_made", "province_Bagmati", "provider_nepal_Ncell"]
+RECORDS_PER_SEGMENT = 50
+
+
+@pytest.fixture
+def audit_log(tmp_path):
+    # Background syncs only when forced, so tests control what is committed
+    segment_bytes = HEADER_SIZE + RECORDS_PER_SEGMENT * record_dtype(len(COLUMNS)).itemsize
+    log = AuditLog(tmp_path, COLUMNS, segment_bytes=segment_bytes, fsync_interval=3600, fsync_records=10 ** 9)
+    yield log
+    log.close()
+
+
+def _batch(rng, n):
+    encoded = rng.normal(size=(n, len(COLUMNS))).astype(np.float32)
+    probs = rng.random(n).astype(np.float32)
+    risk = np.array(RISK_LEVELS)[rng.integers(0, len(RISK_LEVELS), n)]
+    return encoded, probs, risk
+
+
+def _read_all(directory):
+    chunks = [records for _, records in iter_records(directory)]
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=record_dtype(len(COLUMNS)))
+
+
+def test_round_trip_across_rotations(audit_log, tmp_path):
+    rng = np.random.default_rng(0)
+    batches = [_batch(rng, n) for n in (1, 49, 120, 0, 30)]
+    for i, (encoded, probs, risk) in enumerate(batches):
+        audit_log.append(encoded, probs, risk, f"v{i}", timestamp=1000.0 + i)
+    audit_log.close()
+
+    records = _read_all(tmp_path)
+    encoded = np.concatenate([b[0] for b in batches])
+    assert len(records) == len(encoded) == 200
+    np.testing.assert_array_equal(records["features"], encoded)
+    np.testing.assert_array_equal(records["probability"], np.concatenate([b[1] for b in batches]))
+    np.testing.assert_array_equal(
+        np.array(RISK_LEVELS)[records["risk"]], np.concatenate([b[2] for b in batches])
+    )
+    versions = np.repeat([f"v{i}".encode() for i in range(len(batches))], [len(b[0]) for b in batches])
+    np.testing.assert_array_equal(records["model_version"], versions)
+    np.testing.assert_array_equal(
+        records["timestamp"], np.repeat(1000.0 + np.arange(len(batches)), [len(b[0]) for b in batches])
+    )
+
+    # 200 records at 50 per segment; closed segments are truncated to their records
+    paths = segment_paths(tmp_path)
+    assert len(paths) == 4
+    for path in paths:
+        metadata, segment = read_segment(path)
+        assert metadata["train_columns"] == COLUMNS
+        assert path.stat().st_size == HEADER_SIZE + len(segment) * segment.dtype.itemsize
+
+
+def test_only_committed_records_are_visible(audit_log):
+    encoded, probs, risk = _batch(np.random.default_rng(1), 10)
+    audit_log.append(encoded, probs, risk, "v1")
+    assert len(read_segment(audit_log.path)[1]) == 0
+
+    audit_log.flush()
+    _, records = read_segment(audit_log.path)
+    np.testing.assert_array_equal(records["features"], encoded)
+
+
+def test_long_model_versions_are_truncated(audit_log, tmp_path):
+    encoded, probs, risk = _batch(np.random.default_rng(2), 3)
+    version = "x" * (MODEL_VERSION_BYTES + 10)
+    audit_log.append(encoded, probs, risk, version)
+    audit_log.close()
+    assert set(_read_all(tmp_path)["model_version"]) == {version[:MODEL_VERSION_BYTES].encode()}
+
+
+def test_appends_after_close_are_ignored(audit_log, tmp_path):
+    encoded, probs, risk = _batch(np.random.default_rng(3), 5)
+    audit_log.append(encoded, probs, risk, "v1")
+    audit_log.close()
+    audit_log.append(encoded, probs, risk, "v1")
+    assert len(_read_all(tmp_path)) == 5
+    assert audit_log.stats()["records_written"] == 5
+
+
+def test_read_segment_rejects_other_files(tmp_path):
+    path = tmp_path / "not-a-segment.seg"
+    path.write_bytes(b"\0" * HEADER_SIZE)
+    with pytest.raises(ValueError):
+        read_segment(path)
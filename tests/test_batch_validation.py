@@ -0,0 +1,101 @@
+"""
+Equivalence of the columnar batch validator with CustomerData
+Every record is validated both ways; accepted rows must carry the same values
+"""
+
+import numpy as np
+import pytest
+
+from src.batch_validation import NUMERIC_FIELDS, OUTPUT_COLUMNS, validate_batch
+from src.predmodel import CustomerData
+
+BASE = {
+    "name": "Sita Sharma", "gender": "Female", "age": 30, "num_dependents": 1,
+    "estimated_salary": 50000.0, "calls_made": 10, "sms_sent": 5, "data_used": 100.5,
+    "tenure_months": 3, "province": "Bagmati", "provider": "Ncell"
+}
+
+EDGE_CASES = [
+    {},
+    {"gender": "m"}, {"gender": "female"}, {"gender": "x"}, {"gender": 1},
+    {"age": 18}, {"age": 17}, {"age": 100}, {"age": 101},
+    {"age": 18.0}, {"age": 18.5}, {"age": 30.0000001}, {"age": "30"}, {"age": "3x"},
+    {"age": True}, {"age": None}, {"age": [30]}, {"age": {"value": 30}},
+    {"num_dependents": 10}, {"num_dependents": 11}, {"num_dependents": -1},
+    {"estimated_salary": 0}, {"estimated_salary": -0.01}, {"estimated_salary": "1e3"},
+    {"calls_made": 0}, {"calls_made": -1}, {"calls_made": 1e20}, {"calls_made": -1e20},
+    {"sms_sent": "5"}, {"sms_sent": 5.5},
+    {"data_used": 0.25}, {"data_used": -1}, {"data_used": float("inf")},
+    {"tenure_months": 0}, {"tenure_months": 72}, {"tenure_months": 73},
+    {"name": ""}, {"name": 123}, {"name": None},
+    {"province": "bagmati"}, {"province": "Sudurpashchim"}, {"province": None},
+    {"provider": "Nepal Telecom"}, {"provider": "NTC"}, {"provider": None},
+    {"extra_field": "ignored"}
+]
+
+
+def _without(field):
+    return {k: v for k, v in BASE.items() if k != field}
+
+
+# Each edge case, then the base record with each field left out
+RECORDS = [{**BASE, **case} for case in EDGE_CASES] + [_without(field) for field in OUTPUT_COLUMNS]
+
+
+def _pydantic(record):
+    """CustomerData's values for a record, or None when it is rejected"""
+    try:
+        return CustomerData(**record).model_dump()
+    except Exception:
+        return None
+
+
+@pytest.fixture(scope="module")
+def validated():
+    return validate_batch(RECORDS)
+
+
+@pytest.mark.parametrize("index", range(len(RECORDS)))
+def test_matches_customer_data(validated, index):
+    valid, errors = validated
+    expected = _pydantic(RECORDS[index])
+
+    assert (index not in errors) == (expected is not None), errors.get(index)
+    if expected is not None:
+        row = valid.loc[index]
+        for field in OUTPUT_COLUMNS:
+            assert row[field] == expected[field], field
+
+
+def test_null_optional_fields_take_defaults():
+    # Documented difference: CustomerData rejects null for optional fields
+    valid, errors = validate_batch([{**BASE, "num_dependents": None, "calls_made": None}])
+    assert errors == {}
+    assert valid.loc[0, "num_dependents"] == 0 and valid.loc[0, "calls_made"] == 0
+
+
+def test_integer_fields_are_int64_and_never_wrap():
+    valid, errors = validate_batch([BASE, {**BASE, "calls_made": 1e20}, {**BASE, "sms_sent": 2.0 ** 63}])
+    assert list(valid.index) == [0]
+    assert errors[1] == ["calls_made: must be a 64-bit integer"]
+    assert errors[2] == ["sms_sent: must be a 64-bit integer"]
+    for field, (_, _, _, _, integer) in NUMERIC_FIELDS.items():
+        if integer:
+            assert valid[field].dtype == np.int64
+
+
+def test_errors_keep_request_positions():
+    records = [BASE, "not an object", {**BASE, "age": 5}, None, BASE]
+    valid, errors = validate_batch(records)
+    assert list(valid.index) == [0, 4]
+    assert errors == {
+        1: ["row must be a JSON object"],
+        2: ["age: must be >= 18"],
+        3: ["row must be a JSON object"]
+    }
+
+
+def test_empty_batch():
+    valid, errors = validate_batch([])
+    assert len(valid) == 0 and errors == {}
+    assert list(valid.columns) == OUTPUT_COLUMNS
@@ -0,0 +1,119 @@
+"""
+PredictionHistory: ring buffer wraparound, SQLite fallthrough, retention and
+running aggregates
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.history_store import HistoryDatabase, PredictionHistory
+
+CAPACITY = 8
+RISK = ["LOW", "MEDIUM", "HIGH"]
+PROVINCES = ["Bagmati", "Koshi", "Lumbini"]
+PROVIDERS = ["Ncell", "Nepal Telecom"]
+
+
+def _results(start, n):
+    rows = []
+    for i in range(start, start + n):
+        probability = (i * 37) % 100 + 0.5
+        rows.append({
+            "customer_name": f"customer {i}",
+            "churn_probability": probability,
+            "risk_level": RISK[i % 3],
+            "churn_prediction": "CHURN" if probability >= 50 else "RETAIN",
+            "recommendations": [f"tip {i}", "call"]
+        })
+    return rows
+
+
+def _append(history, start, n):
+    results = _results(start, n)
+    provinces = [PROVINCES[i % 3] for i in range(start, start + n)]
+    providers = [PROVIDERS[i % 2] for i in range(start, start + n)]
+    history.append(results, provinces, providers)
+    return results
+
+
+@pytest.fixture
+def database(tmp_path):
+    return HistoryDatabase(tmp_path / "history.db")
+
+
+def _names(frame):
+    return frame["customer_name"].tolist()
+
+
+def test_wraparound_keeps_newest_rows_in_order(database):
+    history = PredictionHistory(database, "a", capacity=CAPACITY)
+    # Batches larger and smaller than the buffer, crossing the wrap point several times
+    for start, n in ((0, 3), (3, 5), (8, 11), (19, 2)):
+        _append(history, start, n)
+
+    assert len(history) == 21
+    newest = [f"customer {i}" for i in range(20, -1, -1)]
+    # First page lies within the buffer, later pages fall through to SQLite
+    assert _names(history.query(RISK, ["CHURN", "RETAIN"], limit=CAPACITY)) == newest[:CAPACITY]
+    assert _names(history.query(RISK, ["CHURN", "RETAIN"], limit=5, offset=6)) == newest[6:11]
+    assert _names(history.query(RISK, ["CHURN", "RETAIN"])) == newest
+    assert history.count(RISK, ["CHURN", "RETAIN"]) == 21
+
+
+def test_buffer_pages_match_sqlite(database):
+    history = PredictionHistory(database, "a", capacity=CAPACITY)
+    _append(history, 0, 6)
+    # Everything is buffered: memory answers; compare with a store reading only SQLite
+    from_memory = history.query(["HIGH", "LOW"], ["CHURN", "RETAIN"])
+    reopened = PredictionHistory(database, "a", capacity=1)
+    _append(reopened, 101, 1)
+    from_sqlite = reopened.query(["HIGH", "LOW"], ["CHURN", "RETAIN"]).iloc[1:].reset_index(drop=True)
+
+    assert history.count(["HIGH", "LOW"], ["CHURN", "RETAIN"]) == len(from_memory) == 4
+    pd.testing.assert_frame_equal(from_memory, from_sqlite, check_dtype=False)
+
+
+def test_reopen_warms_buffer_and_aggregates(database):
+    history = PredictionHistory(database, "a", capacity=CAPACITY)
+    results = _append(history, 0, 20)
+    reopened = PredictionHistory(database, "a", capacity=CAPACITY)
+
+    assert len(reopened) == 20
+    assert _names(reopened.query(RISK, ["CHURN"], limit=3)) == _names(history.query(RISK, ["CHURN"], limit=3))
+    assert reopened.aggregates.snapshot() == history.aggregates.snapshot()
+
+    snapshot = history.aggregates.snapshot()
+    probabilities = np.array([r["churn_probability"] for r in results])
+    assert snapshot["overall"]["count"] == 20
+    assert snapshot["overall"]["mean_probability"] == round(probabilities.mean(), 4)
+    assert snapshot["overall"]["std_probability"] == round(probabilities.std(), 4)
+    assert snapshot["overall"]["churn_counts"]["CHURN"] == int((probabilities >= 50).sum())
+    assert snapshot["overall"]["risk_counts"] == {"LOW": 7, "MEDIUM": 7, "HIGH": 6}
+    assert sum(s["count"] for s in snapshot["by_province"].values()) == 20
+    assert snapshot["by_provider"]["Ncell"]["count"] == 10
+
+
+def test_sessions_are_isolated_and_clear_is_scoped(database):
+    a = PredictionHistory(database, "a", capacity=CAPACITY)
+    b = PredictionHistory(database, "b", capacity=CAPACITY)
+    _append(a, 0, 12)
+    _append(b, 50, 2)
+    a.clear()
+
+    assert len(a) == 0 and a.count(RISK, ["CHURN", "RETAIN"]) == 0
+    assert a.aggregates.snapshot()["overall"]["count"] == 0
+    assert _names(PredictionHistory(database, "b").query(RISK, ["CHURN", "RETAIN"])) == ["customer 51", "customer 50"]
+
+
+def test_retention_prunes_old_rows_on_open(tmp_path):
+    database = HistoryDatabase(tmp_path / "history.db", retention_days=1)
+    _append(PredictionHistory(database, "old"), 0, 3)
+    with database.conn:
+        database.conn.execute("UPDATE predictions SET timestamp = ?", (time.time() - 2 * 86400,))
+    _append(PredictionHistory(database, "new"), 10, 2)
+
+    assert len(PredictionHistory(database, "old")) == 0
+    assert database.conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] == 2
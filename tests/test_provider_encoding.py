@@ -0,0 +1,52 @@
+"""
+Provider encoding: the API spelling "Nepal Telecom" sets the trained
+"Nepal Telecom (NTC)" column in both encoders and the fallback columns
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("tensorflow")
+
+from src.model_service import ChurnModelService
+
+CUSTOMER = {
+    "name": "Sita", "gender": "Female", "age": 34, "married": 1, "num_dependents": 1,
+    "estimated_salary": 45000, "calls_made": 40, "sms_sent": 12, "data_used": 3000,
+    "tenure_months": 20, "province": "Koshi", "provider": "Nepal Telecom"
+}
+NTC_COLUMN = "provider_nepal_Nepal Telecom (NTC)"
+
+
+@pytest.fixture(scope="module", params=["trained", "fallback"])
+def service(request, monkeypatch_module):
+    monkeypatch_module.setenv("CHURN_AUDIT__ENABLED", "false")
+    monkeypatch_module.setenv("CHURN_DRIFT__ENABLED", "false")
+    service = ChurnModelService()
+    if request.param == "fallback":
+        service.train_columns = service._get_default_columns()
+    return service
+
+
+@pytest.fixture(scope="module")
+def monkeypatch_module():
+    with pytest.MonkeyPatch.context() as patch:
+        yield patch
+
+
+@pytest.mark.parametrize("provider, column", [
+    ("Nepal Telecom", NTC_COLUMN),
+    ("Nepal Telecom (NTC)", NTC_COLUMN),
+    ("Ncell", "provider_nepal_Ncell")
+])
+def test_provider_sets_its_column(service, provider, column):
+    assert column in service.train_columns
+    customer = dict(CUSTOMER, provider=provider)
+    provider_columns = [c for c in service.train_columns if c.startswith("provider_nepal_")]
+    expected = [float(c == column) for c in provider_columns]
+
+    batch = service.encode_batch(pd.DataFrame([customer]))[0]
+    _, single = service._preprocess(customer)
+    for encoded in (batch, np.asarray(single).reshape(-1)):
+        assert [encoded[service.train_columns.index(c)] for c in provider_columns] == expected
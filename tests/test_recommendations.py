@@ -0,0 +1,91 @@
+"""
+Equivalence of the vectorized RecommendationEngine with the original rules
+The reference below is the if/else implementation the rule table replaced
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from src.config import load_config
+from src.recommendations import RECOMMENDATION_CODES, RecommendationEngine, pack_mask
+
+
+def legacy_recommendations(prob: float, customer: dict, risk: str) -> list:
+    """ChurnModelService._generate_recommendations before the rule engine"""
+    recommendations = []
+
+    if prob > 0.5:
+        recommendations.append("🚨 Priority: High-risk customer - Consider immediate retention strategy")
+        recommendations.append("💬 Offer: Provide personalized discount or loyalty rewards")
+        recommendations.append("📞 Action: Assign dedicated customer support representative")
+
+    if customer.get('tenure_months', 0) < 12:
+        recommendations.append("🆕 Customer is relatively new - Focus on onboarding & relationship building")
+
+    if customer.get('calls_made', 0) < 20:
+        recommendations.append("📉 Low engagement detected - Encourage service usage")
+
+    if customer.get('estimated_salary', 0) < 30000:
+        recommendations.append("💰 Consider affordable plans to reduce churn")
+
+    if risk in ["MEDIUM", "HIGH"] and customer.get('data_used', 0) < 500:
+        recommendations.append("📊 Data usage is low - Offer attractive data bundles")
+
+    return recommendations
+
+
+# Values on, just below and just above every threshold
+GRID = {
+    "probability": [0.0, 0.4999, 0.5, 0.5001, 1.0],
+    "risk": ["LOW", "MEDIUM", "HIGH"],
+    "tenure_months": [0, 11, 12, 13],
+    "calls_made": [0, 19, 20, 21],
+    "estimated_salary": [0.0, 29999.99, 30000.0, 30000.01],
+    "data_used": [0.0, 499.9, 500.0, 500.1]
+}
+FEATURES = ["tenure_months", "calls_made", "estimated_salary", "data_used"]
+
+
+@pytest.fixture(scope="module")
+def grid():
+    rows = list(itertools.product(*GRID.values()))
+    columns = {name: np.array([row[i] for row in rows]) for i, name in enumerate(GRID)}
+    return rows, columns
+
+
+@pytest.mark.parametrize("from_config", [False, True], ids=["defaults", "config.ini"])
+def test_texts_match_legacy_rules(grid, from_config):
+    rows, columns = grid
+    engine = RecommendationEngine.from_config(load_config()) if from_config else RecommendationEngine()
+    mask = engine.evaluate(columns["probability"], columns["risk"], {f: columns[f] for f in FEATURES})
+    texts = engine.texts(mask)
+
+    for row, actual in zip(rows, texts):
+        prob, risk, *values = row
+        assert actual == legacy_recommendations(prob, dict(zip(FEATURES, values)), risk), row
+
+
+def test_missing_features_count_as_zero():
+    engine = RecommendationEngine()
+    mask = engine.evaluate(np.array([0.7, 0.2]), np.array(["HIGH", "LOW"]), {})
+    expected = [legacy_recommendations(0.7, {}, "HIGH"), legacy_recommendations(0.2, {}, "LOW")]
+    assert engine.texts(mask) == expected
+
+
+def test_codes_and_packed_mask_agree_with_texts(grid):
+    _, columns = grid
+    engine = RecommendationEngine()
+    mask = engine.evaluate(columns["probability"], columns["risk"], {f: columns[f] for f in FEATURES})
+    packed = pack_mask(mask)
+
+    for codes, bits in zip(engine.codes(mask), packed.tolist()):
+        assert codes == [code for i, code in enumerate(RECOMMENDATION_CODES) if bits >> i & 1]
+
+
+def test_empty_batch():
+    engine = RecommendationEngine()
+    mask = engine.evaluate(np.array([]), np.array([]), {})
+    assert mask.shape == (0, len(RECOMMENDATION_CODES))
+    assert engine.texts(mask) == [] and engine.codes(mask) == []
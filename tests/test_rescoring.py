@@ -0,0 +1,61 @@
+"""
+Input checks of incremental batch scoring (main.py --score)
+"""
+
+import io
+
+import pandas as pd
+import pytest
+
+from src.rescoring import (
+    TEXT_COLUMNS, RescoreIndex, missing_columns, score_incremental, validate_customers
+)
+
+CSV = """customer_id,name,gender,age,estimated_salary,calls_made,tenure_months,province,provider
+1,Ram,Male,40,50000,10,12,Bagmati,Ncell
+2,Sita,Female,,40000,10,12,Koshi,Nepal Telecom
+3,"Hari
+Bahadur",M,30,30000,abc,12,Koshi,Nepal Telecom
+,NoId,Male,30,30000,1,12,Koshi,Ncell
+5,1001,F,25,20000,1,7,Lumbini,Nepal Telecom
+"""
+
+
+def _read(text):
+    return pd.read_csv(io.StringIO(text), dtype=TEXT_COLUMNS)
+
+
+def test_validate_customers_splits_valid_and_rejected_rows():
+    valid, rejected = validate_customers(_read(CSV))
+
+    assert valid["customer_id"].tolist() == [1, 5]
+    assert valid["customer_id"].dtype == "int64"
+    assert valid["name"].tolist() == ["Ram", "1001"]
+    assert valid["gender"].tolist() == ["MALE", "F"]
+    # Optional fields absent from the CSV take their CustomerData default
+    assert valid["num_dependents"].tolist() == [0, 0]
+
+    assert rejected["row"].tolist() == [2, 3, 4]
+    assert rejected["customer_id"].astype("Int64").tolist()[:2] == [2, 3]
+    assert rejected["error"].iloc[0] == "age: field required"
+    assert "calls_made" in rejected["error"].iloc[1]
+    assert rejected["error"].iloc[2] == "customer_id: field required"
+
+
+def test_name_defaults_to_customer_id():
+    customers = _read(CSV).drop(columns=["name"])
+    customers["customer_id"] = ["a", "b", "c", None, "e"]
+    valid, rejected = validate_customers(customers)
+
+    assert valid["name"].tolist() == ["a", "e"]
+    assert valid["customer_id"].tolist() == ["a", "e"]
+    assert len(rejected) == 3
+
+
+def test_missing_columns_fail_before_scoring(tmp_path):
+    customers = _read(CSV).drop(columns=["province", "provider"])
+
+    assert missing_columns(customers) == ["province", "provider"]
+    assert missing_columns(customers.drop(columns=["customer_id"]), "customer_id")[0] == "customer_id"
+    with pytest.raises(ValueError, match="province, provider"):
+        score_incremental(None, customers, RescoreIndex(tmp_path / "index.npz"))
@@ -0,0 +1,74 @@
+"""
+Attributions with segment models: routed rows are explained by the segment
+network that scored them, the rest by the global network
+"""
+
+import types
+
+import numpy as np
+import pytest
+
+pytest.importorskip("tensorflow")
+from tensorflow import keras
+
+from src.explain import GRADIENT_X_INPUT, INTEGRATED_GRADIENTS, attribute
+from src.segments import SegmentModels
+
+COLUMNS = ["age", "tenure_months", "data_used", "provider_nepal_Ncell", "provider_nepal_Nepal Telecom (NTC)"]
+
+
+@pytest.fixture(scope="module")
+def service():
+    rng = np.random.default_rng(0)
+    sizes = [len(COLUMNS), 6, 4, 1]
+    segments = SegmentModels(
+        "provider", ["Ncell"], COLUMNS,
+        [rng.normal(0, 0.8, (1, n_in, n_out)) for n_in, n_out in zip(sizes, sizes[1:])],
+        [rng.normal(0, 0.2, (1, n_out)) for n_out in sizes[1:]]
+    )
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential([
+        keras.Input(shape=(len(COLUMNS),)), keras.layers.Dense(5, activation="relu"),
+        keras.layers.Dense(1, activation="sigmoid")
+    ])
+    # Identity scaling: encoded rows are already "scaled"
+    return types.SimpleNamespace(model=model, segments=segments, scale_encoded=lambda encoded: encoded)
+
+
+def _rows(rng, n, provider_column):
+    rows = rng.normal(size=(n, len(COLUMNS))).astype(np.float32)
+    rows[:, 3:] = -1
+    if provider_column is not None:
+        rows[:, provider_column] = 1
+    return rows
+
+
+def test_input_gradients_match_finite_differences(service):
+    rows = _rows(np.random.default_rng(1), 16, 3).astype(np.float64)
+    grads = service.segments.input_gradients(rows)
+    eps = 1e-3
+    for col in range(len(COLUMNS)):
+        step = np.zeros(len(COLUMNS))
+        step[col] = eps
+        numeric = (service.segments._forward(0, rows + step) - service.segments._forward(0, rows - step)) / (2 * eps)
+        np.testing.assert_allclose(grads[:, col], numeric, atol=2e-4)
+
+
+def test_integrated_gradients_explain_the_scoring_network(service):
+    rng = np.random.default_rng(2)
+    routed, unrouted = _rows(rng, 8, 3), _rows(rng, 8, 4)
+    rows = np.concatenate([routed, unrouted])
+    attributions = attribute(service, rows, INTEGRATED_GRADIENTS, steps=256)
+
+    # Completeness: attributions sum to the prediction minus the baseline's, for the network that scored it
+    zero = np.zeros((1, len(COLUMNS)), dtype=np.float32)
+    segment_delta = service.segments._forward(0, routed) - service.segments._forward(0, zero)
+    global_delta = (service.model(unrouted).numpy() - service.model(zero).numpy()).reshape(-1)
+    np.testing.assert_allclose(attributions[:8].sum(axis=1), segment_delta, atol=5e-3)
+    np.testing.assert_allclose(attributions[8:].sum(axis=1), global_delta, atol=5e-3)
+
+
+def test_gradient_x_input_uses_segment_gradients(service):
+    rows = _rows(np.random.default_rng(3), 4, 3)
+    expected = service.segments.input_gradients(rows) * rows
+    np.testing.assert_allclose(attribute(service, rows, GRADIENT_X_INPUT), expected, rtol=1e-6)